@@ -106,35 +106,203 @@ if not hasattr(subprocess, 'Popen'):
     subprocess.Popen = _fake_Popen
 
 ###########################################################
-# TOP-LEVEL MODULES
+# TOP-LEVEL MODULES AND PACKAGES
 ###########################################################
 
-# Import top-level functionality into top-level namespace
+# The top-level namespace contains everything that is exported by the
+# following modules, as if by ``from module import *`` (later modules
+# take precedence).  These names, and nltk's submodules, are imported
+# on first access, so ``import nltk`` stays fast.  The table of names
+# is generated with ``tools/import_benchmark.py --exports``.
 
-from nltk.collocations import *
-from nltk.decorators import decorator, memoize
-from nltk.featstruct import *
-from nltk.grammar import *
-from nltk.probability import *
-from nltk.text import *
-from nltk.tree import *
-from nltk.util import *
-from nltk.jsontags import *
+_STAR_IMPORTS = [
+    'nltk.collocations', 'nltk.featstruct', 'nltk.grammar',
+    'nltk.probability', 'nltk.text', 'nltk.tree', 'nltk.util',
+    'nltk.jsontags', 'nltk.chunk', 'nltk.classify', 'nltk.inference',
+    'nltk.metrics', 'nltk.parse', 'nltk.tag', 'nltk.tokenize',
+    'nltk.translate', 'nltk.sem', 'nltk.stem',
+]
 
-###########################################################
-# PACKAGES
-###########################################################
+_LAZY_EXPORTS = {
+    'nltk.collocations': [
+        'BigramCollocationFinder', 'QuadgramCollocationFinder',
+        'TrigramCollocationFinder'
+    ],
+    'nltk.featstruct': [
+        'FeatDict', 'FeatList', 'FeatStruct', 'FeatStructReader', 'Feature',
+        'RangeFeature', 'SLASH', 'SlashFeature', 'TYPE', 'conflicts',
+        'subsumes', 'unify'
+    ],
+    'nltk.grammar': [
+        'CFG', 'DependencyGrammar', 'DependencyProduction', 'Nonterminal',
+        'PCFG', 'ProbabilisticDependencyGrammar', 'ProbabilisticProduction',
+        'Production', 'induce_pcfg', 'nonterminals', 'read_grammar'
+    ],
+    'nltk.probability': [
+        'CompactConditionalFreqDist', 'CompactFreqDist', 'ConditionalFreqDist',
+        'ConditionalProbDist', 'ConditionalProbDistI',
+        'CrossValidationProbDist', 'DictionaryConditionalProbDist',
+        'DictionaryProbDist', 'ELEProbDist', 'FreqDist', 'HeldoutProbDist',
+        'ImmutableProbabilisticMixIn', 'IncrementalFreqDist',
+        'KneserNeyProbDist', 'LaplaceProbDist', 'LidstoneProbDist',
+        'MLEProbDist', 'MutableProbDist', 'ProbDistI', 'SampleIndex',
+        'SimpleGoodTuringProbDist', 'UniformProbDist', 'WittenBellProbDist',
+        'add_logs', 'count_ngrams', 'entropy', 'merge_counts', 'sum_logs'
+    ],
+    'nltk.text': [
+        'ConcordanceIndex', 'ContextIndex', 'Text', 'TextCollection',
+        'TokenSearcher'
+    ],
+    'nltk.tree': [
+        'ImmutableMultiParentedTree', 'ImmutableParentedTree',
+        'ImmutableProbabilisticTree', 'ImmutableTree', 'MultiParentedTree',
+        'ParentedTree', 'ProbabilisticMixIn', 'ProbabilisticTree', 'Tree',
+        'bracket_parse', 'sinica_parse'
+    ],
+    'nltk.util': [
+        'AbstractLazySequence', 'CompactStringTable', 'CompactTrie',
+        'HTTPPasswordMgrWithDefaultRealm', 'Index', 'LazyConcatenation',
+        'LazyEnumerate', 'LazyMap', 'LazySubsequence', 'LazyZip',
+        'OrderedDict', 'ProxyBasicAuthHandler', 'ProxyDigestAuthHandler',
+        'ProxyHandler', 'Trie', 'bigrams', 'binary_search_file',
+        'breadth_first', 'build_opener', 'chain', 'choose', 'class_types',
+        'clean_html', 'clean_url', 'combinations', 'defaultdict', 'deque',
+        'elementtree_indent', 'encode_string_table', 'everygrams',
+        'filestring', 'flatten', 'getproxies', 'guess_encoding', 'in_idle',
+        'install_opener', 'invert_dict', 'invert_graph', 'islice', 'ngrams',
+        'open_buffer', 'pad_sequence', 'pprint', 'pr', 'print_string', 'py25',
+        'py26', 'py27', 'python_2_unicode_compatible',
+        'raise_unorderable_types', 're_show', 'set_proxy', 'skipgrams',
+        'slice_bounds', 'string_types', 'text_type', 'tokenwrap',
+        'total_ordering', 'transitive_closure', 'trigrams', 'unique_list',
+        'usage', 'version_info'
+    ],
+    'nltk.jsontags': [
+        'JSONTaggedDecoder', 'JSONTaggedEncoder', 'json_tags', 'register_tag'
+    ],
+    'nltk.chunk': [
+        'ChunkParserI', 'ChunkScore', 'RegexpChunkParser', 'RegexpParser',
+        'conllstr2tree', 'conlltags2tree', 'ieerstr2tree', 'ne_chunk',
+        'ne_chunk_sents', 'tagstr2tree', 'tree2conllstr', 'tree2conlltags'
+    ],
+    'nltk.classify': [
+        'BinaryMaxentFeatureEncoding', 'ClassifierI',
+        'ConditionalExponentialClassifier', 'DecisionTreeClassifier',
+        'MaxentClassifier', 'MultiClassifierI', 'NaiveBayesClassifier',
+        'OnlineNaiveBayesClassifier', 'PositiveNaiveBayesClassifier',
+        'RTEFeatureExtractor', 'Senna', 'SklearnClassifier', 'TextCat',
+        'TypedMaxentFeatureEncoding', 'WekaClassifier', 'apply_features',
+        'call_megam', 'config_megam', 'config_weka', 'decisiontree', 'maxent',
+        'megam', 'naivebayes', 'positivenaivebayes', 'rte_classifier',
+        'rte_classify', 'rte_features', 'scikitlearn', 'tadm', 'textcat',
+        'weka'
+    ],
+    'nltk.inference': [
+        'CfgReadingCommand', 'DiscourseTester', 'DrtGlueReadingCommand',
+        'Mace', 'MaceCommand', 'ParallelProverBuilder',
+        'ParallelProverBuilderCommand', 'Prover9', 'Prover9Command',
+        'ReadingCommand', 'ResolutionProver', 'ResolutionProverCommand',
+        'TableauProver', 'TableauProverCommand', 'discourse', 'mace',
+        'prover9', 'resolution', 'tableau'
+    ],
+    'nltk.metrics': [
+        'AnnotationTask', 'BigramAssocMeasures', 'ConfusionMatrix',
+        'ContingencyMeasures', 'NgramAssocMeasures', 'Paice',
+        'TrigramAssocMeasures', 'accuracy', 'agreement', 'approxrand',
+        'association', 'binary_distance', 'confusionmatrix', 'custom_distance',
+        'distance', 'edit_distance', 'f_measure', 'fractional_presence', 'ghd',
+        'interval_distance', 'jaccard_distance', 'log_likelihood',
+        'masi_distance', 'paice', 'pk', 'precision', 'presence',
+        'ranks_from_scores', 'ranks_from_sequence', 'recall', 'scores',
+        'segmentation', 'spearman', 'spearman_correlation', 'windowdiff'
+    ],
+    'nltk.parse': [
+        'BllipParser', 'BottomUpChartParser', 'BottomUpLeftCornerChartParser',
+        'BottomUpProbabilisticChartParser', 'ChartParser',
+        'DependencyEvaluator', 'DependencyGraph', 'EarleyChartParser',
+        'FeatureBottomUpChartParser', 'FeatureBottomUpLeftCornerChartParser',
+        'FeatureChartParser', 'FeatureEarleyChartParser',
+        'FeatureIncrementalBottomUpChartParser',
+        'FeatureIncrementalBottomUpLeftCornerChartParser',
+        'FeatureIncrementalChartParser',
+        'FeatureIncrementalTopDownChartParser', 'FeatureTopDownChartParser',
+        'IncrementalBottomUpChartParser',
+        'IncrementalBottomUpLeftCornerChartParser', 'IncrementalChartParser',
+        'IncrementalLeftCornerChartParser', 'IncrementalTopDownChartParser',
+        'InsideChartParser', 'LeftCornerChartParser', 'LongestChartParser',
+        'MaltParser', 'NaiveBayesDependencyScorer',
+        'NonprojectiveDependencyParser', 'ParserI',
+        'ProbabilisticNonprojectiveParser',
+        'ProbabilisticProjectiveDependencyParser',
+        'ProjectiveDependencyParser', 'RandomChartParser',
+        'RecursiveDescentParser', 'ShiftReduceParser', 'SteppingChartParser',
+        'SteppingRecursiveDescentParser', 'SteppingShiftReduceParser',
+        'TestGrammar', 'TopDownChartParser', 'TransitionParser',
+        'UnsortedChartParser', 'ViterbiParser', 'bllip', 'chart',
+        'dependencygraph', 'earleychart', 'extract_test_sentences',
+        'featurechart', 'load_parser', 'malt', 'nonprojectivedependencyparser',
+        'pchart', 'projectivedependencyparser', 'recursivedescent',
+        'shiftreduce', 'transitionparser', 'viterbi'
+    ],
+    'nltk.tag': [
+        'AffixTagger', 'BigramTagger', 'BrillTagger', 'BrillTaggerTrainer',
+        'CRFTagger', 'ClassifierBasedPOSTagger', 'ClassifierBasedTagger',
+        'CompiledBackoffTagger', 'ContextTagger', 'DefaultTagger',
+        'HiddenMarkovModelTagger', 'HiddenMarkovModelTrainer', 'HunposTagger',
+        'NgramTagger', 'PerceptronTagger', 'RegexpTagger', 'SennaChunkTagger',
+        'SennaNERTagger', 'SennaTagger', 'SequentialBackoffTagger',
+        'StanfordNERTagger', 'StanfordPOSTagger', 'StanfordTagger', 'TaggerI',
+        'TnT', 'TrigramTagger', 'UnigramTagger', 'brill', 'brill_trainer',
+        'crf', 'hmm', 'hunpos', 'map_tag', 'mapping', 'perceptron', 'pos_tag',
+        'pos_tag_sents', 'senna', 'sequential', 'str2tuple', 'tagset_mapping',
+        'tnt', 'tuple2str', 'untag'
+    ],
+    'nltk.tokenize': [
+        'BlanklineTokenizer', 'LineTokenizer', 'MWETokenizer',
+        'PunktSentenceTokenizer', 'RegexpTokenizer', 'SExprTokenizer',
+        'SpaceTokenizer', 'StanfordTokenizer', 'TabTokenizer',
+        'TextTilingTokenizer', 'TreebankWordTokenizer', 'TweetTokenizer',
+        'WhitespaceTokenizer', 'WordPunctTokenizer', 'blankline_tokenize',
+        'casual', 'casual_tokenize', 'line_tokenize', 'load', 'mwe', 'punkt',
+        'regexp_span_tokenize', 'regexp_tokenize', 'sent_tokenize',
+        'sent_tokenize_stream', 'sexpr', 'sexpr_tokenize', 'simple',
+        'stanford', 'string_span_tokenize', 'texttiling', 'treebank',
+        'word_tokenize', 'word_tokenize_stream', 'wordpunct_tokenize'
+    ],
+    'nltk.translate': [
+        'AlignedSent', 'Alignment', 'IBMModel', 'IBMModel1', 'IBMModel2',
+        'IBMModel3', 'IBMModel4', 'IBMModel5', 'PhraseTable', 'StackDecoder',
+        'alignment_error_rate', 'bleu', 'bleu_score', 'ibm1', 'ibm2', 'ibm3',
+        'ibm4', 'ibm5', 'ibm_model', 'metrics', 'ribes', 'ribes_score',
+        'stack_decoder'
+    ],
+    'nltk.sem': [
+        'ApplicationExpression', 'Assignment', 'Boxer', 'DRS', 'DrtExpression',
+        'Expression', 'FStructure', 'LogicalExpressionException', 'Model',
+        'Undefined', 'Valuation', 'Variable', 'arity', 'binding_ops',
+        'boolean_ops', 'boxer', 'clause', 'drt', 'equality_preds', 'evaluate',
+        'evaluate_sents', 'extract_rels', 'glue', 'interpret_sents', 'is_rel',
+        'lfg', 'linearlogic', 'logic', 'parse_sents', 'read_logic',
+        'read_valuation', 'relextract', 'root_semrep', 'rtuple', 'set2rel',
+        'skolemize'
+    ],
+    'nltk.stem': [
+        'ISRIStemmer', 'LancasterStemmer', 'PorterStemmer', 'RSLPStemmer',
+        'RegexpStemmer', 'SnowballStemmer', 'StemmerI', 'WordNetLemmatizer',
+        'api', 'isri', 'lancaster', 'porter', 'regexp', 'rslp', 'snowball',
+        'util', 'wordnet'
+    ],
+}
 
-from nltk.chunk import *
-from nltk.classify import *
-from nltk.inference import *
-from nltk.metrics import *
-from nltk.parse import *
-from nltk.tag import *
-from nltk.tokenize import *
-from nltk.translate import *
-from nltk.sem import *
-from nltk.stem import *
+_SUBMODULES = [
+    'ccg', 'chunk', 'classify', 'cluster', 'collocations', 'compat',
+    'data', 'decorators', 'downloader', 'featstruct', 'grammar', 'help',
+    'inference', 'internals', 'jsontags', 'metrics', 'misc', 'parse',
+    'probability', 'sem', 'stem', 'tag', 'tbl', 'text', 'tokenize',
+    'translate', 'tree', 'treetransforms', 'util', 'wsd',
+]
+
+from nltk.decorators import decorator, memoize
 
 # Packages which can be lazily imported
 # (a) we don't import *
@@ -148,38 +316,13 @@ corpus = lazyimport.LazyModule('nltk.corpus', locals(), globals())
 draw = lazyimport.LazyModule('nltk.draw', locals(), globals())
 toolbox = lazyimport.LazyModule('nltk.toolbox', locals(), globals())
 
-# Optional loading
-
-try:
-    import numpy
-except ImportError:
-    pass
-else:
-    from nltk import cluster
-
-from nltk.downloader import download, download_shell
-try:
-    import tkinter
-except ImportError:
-    pass
-else:
-    try:
-        from nltk.downloader import download_gui
-    except RuntimeError as e:
-        import warnings
-        warnings.warn("Corpus downloader GUI not loaded "
-                      "(RuntimeError during import: %s)" % str(e))
-
-# explicitly import all top-level modules (ensuring
-# they override the same names inadvertently imported
-# from a subpackage)
-
-from nltk import ccg, chunk, classify, collocations
-from nltk import data, featstruct, grammar, help, inference, metrics
-from nltk import misc, parse, probability, sem, stem, wsd
-from nltk import tag, tbl, text, tokenize, translate, tree, treetransforms, util
-
-
 # override any accidentally imported demo
 def demo():
     print("To run the demo code for a module, type nltk.module.demo()")
+
+
+lazyimport.lazy_package(__name__, _SUBMODULES, dict(
+    [(name, module) for module in _STAR_IMPORTS
+     for name in _LAZY_EXPORTS[module]] +
+    [(name, 'nltk.downloader')
+     for name in ('download', 'download_shell', 'download_gui')]))
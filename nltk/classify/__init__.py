@@ -85,7 +85,8 @@ as lists of ``(featuredict, label)`` tuples.
 from nltk.classify.api import ClassifierI, MultiClassifierI
 from nltk.classify.megam import config_megam, call_megam
 from nltk.classify.weka import WekaClassifier, config_weka
-from nltk.classify.naivebayes import NaiveBayesClassifier
+from nltk.classify.naivebayes import (NaiveBayesClassifier,
+                                      OnlineNaiveBayesClassifier)
 from nltk.classify.positivenaivebayes import PositiveNaiveBayesClassifier
 from nltk.classify.decisiontree import DecisionTreeClassifier
 from nltk.classify.rte_classify import rte_classifier, rte_features, RTEFeatureExtractor
@@ -94,5 +95,8 @@ from nltk.classify.scikitlearn import SklearnClassifier
 from nltk.classify.maxent import (MaxentClassifier, BinaryMaxentFeatureEncoding,
                                   TypedMaxentFeatureEncoding,
                                   ConditionalExponentialClassifier)
+# nltk.tag depends on the classifiers above, and nltk.tag.senna subclasses
+# Senna, which is itself a TaggerI; so finish initializing nltk.tag first.
+import nltk.tag
 from nltk.classify.senna import Senna
 from nltk.classify.textcat import TextCat
@@ -12,7 +12,8 @@ on feature values, and leaves correspond to label assignments.
 """
 from __future__ import print_function, unicode_literals, division
 
-from collections import defaultdict
+from collections import defaultdict, Counter
+from itertools import chain
 
 from nltk.probability import FreqDist, MLEProbDist, entropy
 from nltk.classify.api import ClassifierI
@@ -129,17 +130,25 @@ class DecisionTreeClassifier(ClassifierI):
     @staticmethod
     def train(labeled_featuresets, entropy_cutoff=0.05, depth_cutoff=100,
               support_cutoff=10, binary=False, feature_values=None,
-              verbose=False):
+              verbose=False, n_jobs=1):
         """
+        Build a decision tree.  The training corpus is indexed once, and
+        the best stump for each node is found by counting the labels
+        that occur with each feature value in the node's training
+        tokens (see ``SplitIndex``), rather than by building and testing
+        a stump for every candidate feature; the tree is the one that
+        ``best_stump()`` (or ``best_binary_stump()``) and ``refine()``
+        would build.
+
         :param binary: If true, then treat all feature/value pairs as
             individual binary features, rather than using a single n-way
             branch for each feature.
+        :param n_jobs: The number of worker processes that grow subtrees
+            in parallel.  If it is less than 1, the number of CPUs is
+            used.  The training corpus is sent to each worker once, so
+            it must be picklable.
         """
-        # Collect a list of all feature names.
-        feature_names = set()
-        for featureset, label in labeled_featuresets:
-            for fname in featureset:
-                feature_names.add(fname)
+        labeled_featuresets = list(labeled_featuresets)
 
         # Collect a list of the values each feature can take.
         if feature_values is None and binary:
@@ -148,19 +157,38 @@ class DecisionTreeClassifier(ClassifierI):
                 for fname, fval in featureset.items():
                     feature_values[fname].add(fval)
 
-        # Start with a stump.
-        if not binary:
-            tree = DecisionTreeClassifier.best_stump(
-                feature_names, labeled_featuresets, verbose)
-        else:
-            tree = DecisionTreeClassifier.best_binary_stump(
-                feature_names, labeled_featuresets, feature_values, verbose)
-
-        # Refine the stump.
-        tree.refine(labeled_featuresets, entropy_cutoff, depth_cutoff-1,
-                    support_cutoff, binary, feature_values, verbose)
-
-        # Return it
+        index = SplitIndex(labeled_featuresets, feature_values)
+        params = (entropy_cutoff, support_cutoff, binary, verbose)
+        rows = list(range(len(labeled_featuresets)))
+        if n_jobs == 1:
+            return _grow(index, rows, depth_cutoff, params)
+
+        # Grow the top of the tree until it has a subtree to be grown
+        # for each worker; and then grow those subtrees in parallel.
+        import multiprocessing
+        if n_jobs < 1:
+            n_jobs = multiprocessing.cpu_count()
+        tree = _stump(index, rows, params)
+        tasks = [(tree, key, subrows, depth_cutoff - 1) for (key, subrows)
+                 in _subtrees(index, tree, rows, depth_cutoff - 1, params)]
+        while tasks and len(tasks) < n_jobs:
+            tasks.sort(key=lambda task: len(task[2]))
+            parent, key, subrows, depth = tasks.pop()
+            subtree = _stump(index, subrows, params)
+            _attach(parent, key, subtree)
+            tasks.extend((subtree, subkey, subsubrows, depth - 1)
+                         for (subkey, subsubrows) in _subtrees(
+                             index, subtree, subrows, depth - 1, params))
+        if tasks:
+            pool = multiprocessing.Pool(n_jobs, _init_train_worker,
+                                        (index, params))
+            try:
+                subtrees = pool.map(_grow_task, [(subrows, depth) for
+                                    (parent, key, subrows, depth) in tasks])
+            finally:
+                pool.terminate()
+            for (parent, key, subrows, depth), subtree in zip(tasks, subtrees):
+                _attach(parent, key, subtree)
         return tree
 
     @staticmethod
@@ -276,6 +304,243 @@ class DecisionTreeClassifier(ClassifierI):
                    (len(labeled_featuresets), descr, best_error)))
         return best_stump
 
+##//////////////////////////////////////////////////////
+##  Split Search
+##//////////////////////////////////////////////////////
+
+class SplitIndex(object):
+    """
+    An index of a training corpus, which is used by
+    ``DecisionTreeClassifier.train()`` to find the best stump for a
+    subset of the corpus without building a stump for every candidate
+    feature (or feature/value pair).  Each ``(fname, fval)`` pair and
+    each label is assigned an integer id, once; and then the
+    classification errors of every candidate stump for a subset of
+    the training tokens are computed from a histogram of how many
+    times each label occurs with each feature value in the subset.
+    A feature's value is ``None`` if it is missing from a featureset.
+    """
+    def __init__(self, labeled_featuresets, feature_values=None):
+        """
+        :param labeled_featuresets: A list of classified featuresets,
+            i.e., a list of tuples ``(featureset, label)``.
+        :param feature_values: The values of each feature that binary
+            stumps test for, as for ``best_binary_stump()``.
+        """
+        self.labeled_featuresets = labeled_featuresets
+        self._labels = []
+        self._pairs = []
+        label_ids, pair_ids, rows = {}, {}, []
+        for featureset, label in labeled_featuresets:
+            if label not in label_ids:
+                label_ids[label] = len(self._labels)
+                self._labels.append(label)
+            row = []
+            for pair in featureset.items():
+                if pair[1] is None:
+                    continue
+                if pair not in pair_ids:
+                    pair_ids[pair] = len(self._pairs)
+                    self._pairs.append(pair)
+                row.append(pair_ids[pair])
+            rows.append((row, label_ids[label]))
+
+        # Each token is indexed by the ids of the (feature value,
+        # label) histogram bins that it falls into.
+        L = len(self._labels)
+        self._row_labels = [l for (row, l) in rows]
+        self._row_bins = [[p*L + l for p in row] for (row, l) in rows]
+
+        # The order in which best_binary_stump() tests feature values.
+        self._fval_ranks = {}
+        if feature_values is not None:
+            for fname in feature_values:
+                ranks = self._fval_ranks[fname] = {}
+                for rank, fval in enumerate(feature_values[fname]):
+                    ranks.setdefault(fval, (rank, fval))
+
+    def best_stump(self, rows, feature_names, binary=False):
+        """
+        :return: A tuple ``(errors, fname, fval)``, where ``errors`` is
+            the number of tokens in ``rows`` that are misclassified by the
+            stump that ``best_stump()`` (or, if ``binary`` is true,
+            ``best_binary_stump()``) would choose; ``fname`` is the
+            feature that it tests (or None for a leaf); and ``fval``
+            is the feature value that a binary stump tests.
+        :param rows: The indices of the training tokens.
+        :param feature_names: The features to consider, in the order
+            that ``best_stump()`` considers them (ties are won by the
+            first).
+        """
+        L = len(self._labels)
+        label_totals = [0] * L
+        for i in rows:
+            label_totals[self._row_labels[i]] += 1
+        leaf_correct = max(label_totals) if rows else 0
+
+        # Count the labels for each feature value, and for each feature
+        # (whose counts are subtracted from the totals to get the
+        # counts for its missing value).
+        bins = Counter(chain.from_iterable(self._row_bins[i] for i in rows))
+        pair_counts = {}
+        fname_counts = {}
+        for b, count in bins.items():
+            p, l = divmod(b, L)
+            if p not in pair_counts:
+                pair_counts[p] = [0] * L
+            pair_counts[p][l] = count
+        for p, counts in pair_counts.items():
+            fname = self._pairs[p][0]
+            if fname not in fname_counts:
+                fname_counts[fname] = [0] * L
+            fname_counts[fname] = [x+y for (x, y) in
+                                   zip(fname_counts[fname], counts)]
+        missing_counts = dict(
+            (fname, [t-c for (t, c) in zip(label_totals, counts)])
+            for (fname, counts) in fname_counts.items())
+
+        # Find the number of tokens that each candidate classifies
+        # correctly.  Candidates are ranked as the stump-building
+        # methods would visit them.
+        fname_ranks = dict((fname, rank) for (rank, fname)
+                           in enumerate(feature_names))
+        candidates = []
+        if not binary:
+            correct = dict((fname, max(counts)) for (fname, counts)
+                           in missing_counts.items())
+            for p, counts in pair_counts.items():
+                correct[self._pairs[p][0]] += max(counts)
+            for fname, fname_correct in correct.items():
+                candidates.append((fname_correct, fname_ranks[fname], 0,
+                                   fname, None))
+        else:
+            def binary_correct(pos_counts):
+                return (max(pos_counts) +
+                        max(t-c for (t, c) in zip(label_totals, pos_counts)))
+            for p, counts in pair_counts.items():
+                fname, fval = self._pairs[p]
+                ranks = self._fval_ranks.get(fname, {})
+                if fval in ranks:
+                    rank, fval = ranks[fval]
+                    candidates.append((binary_correct(counts),
+                                       fname_ranks[fname], rank, fname, fval))
+            for fname, counts in missing_counts.items():
+                ranks = self._fval_ranks.get(fname, {})
+                if None in ranks and any(counts):
+                    rank, fval = ranks[None]
+                    candidates.append((binary_correct(counts),
+                                       fname_ranks[fname], rank, fname, fval))
+
+        best = (leaf_correct, None, None)
+        best_rank = None
+        for (n_correct, fname_rank, fval_rank, fname, fval) in candidates:
+            rank = (fname_rank, fval_rank)
+            if n_correct > best[0] or (n_correct == best[0] and
+                                       best_rank is not None and
+                                       rank < best_rank):
+                best, best_rank = (n_correct, fname, fval), rank
+        return (len(rows) - best[0], best[1], best[2])
+
+def _stump(index, rows, params):
+    """
+    Return the best stump for the training tokens ``rows``, as
+    ``DecisionTreeClassifier.best_stump()`` (or
+    ``best_binary_stump()``) would.
+    """
+    entropy_cutoff, support_cutoff, binary, verbose = params
+    labeled_featuresets = [index.labeled_featuresets[i] for i in rows]
+
+    # Collect a list of all feature names.
+    feature_names = set()
+    for featureset, label in labeled_featuresets:
+        for fname in featureset:
+            feature_names.add(fname)
+
+    errors, fname, fval = index.best_stump(rows, feature_names, binary)
+    if fname is None:
+        stump = DecisionTreeClassifier.leaf(labeled_featuresets)
+    elif not binary:
+        stump = DecisionTreeClassifier.stump(fname, labeled_featuresets)
+    else:
+        stump = DecisionTreeClassifier.binary_stump(fname, fval,
+                                                    labeled_featuresets)
+    if verbose:
+        if not binary:
+            descr = stump._fname
+        elif stump._decisions:
+            descr = '%s=%s' % (stump._fname, list(stump._decisions.keys())[0])
+        else:
+            descr = '(default)'
+        print(('best stump for %6d toks uses %-20s err=%6.4f' %
+               (len(rows), descr, errors / len(rows))))
+    return stump
+
+def _subtrees(index, tree, rows, depth_cutoff, params):
+    """
+    Return a list of ``(key, rows)`` pairs, one for each branch of
+    ``tree`` that ``DecisionTreeClassifier.refine()`` would replace
+    with a subtree trained on ``rows``.  ``key`` is the feature value
+    of the branch, or ``_DEFAULT`` for the default branch.
+    """
+    entropy_cutoff, support_cutoff, binary, verbose = params
+    if len(rows) <= support_cutoff: return []
+    if tree._fname is None: return []
+    if depth_cutoff <= 0: return []
+
+    branches = defaultdict(list)
+    default_rows = []
+    for i in rows:
+        fval = index.labeled_featuresets[i][0].get(tree._fname)
+        if fval in tree._decisions:
+            branches[fval].append(i)
+        else:
+            default_rows.append(i)
+    subtrees = [(fval, branches.get(fval, [])) for fval in tree._decisions]
+    if tree._default is not None:
+        subtrees.append((_DEFAULT, default_rows))
+
+    result = []
+    for key, subrows in subtrees:
+        label_freqs = FreqDist(index.labeled_featuresets[i][1]
+                               for i in subrows)
+        if entropy(MLEProbDist(label_freqs)) > entropy_cutoff:
+            result.append((key, subrows))
+    return result
+
+def _grow(index, rows, depth_cutoff, params):
+    """
+    Return the decision tree that ``DecisionTreeClassifier.train()``
+    would build for the training tokens ``rows``.
+    """
+    tree = _stump(index, rows, params)
+    for key, subrows in _subtrees(index, tree, rows, depth_cutoff - 1,
+                                  params):
+        _attach(tree, key, _grow(index, subrows, depth_cutoff - 1, params))
+    return tree
+
+#: The key of the default branch of a decision tree, for ``_subtrees()``.
+_DEFAULT = object()
+
+def _attach(tree, key, subtree):
+    if key is _DEFAULT:
+        tree._default = subtree
+    else:
+        tree._decisions[key] = subtree
+
+# The index and parameters that are used by every task of a
+# DecisionTreeClassifier.train() worker process.
+_worker_index = None
+_worker_params = None
+
+def _init_train_worker(index, params):
+    global _worker_index, _worker_params
+    _worker_index = index
+    _worker_params = params
+
+def _grow_task(task):
+    rows, depth_cutoff = task
+    return _grow(_worker_index, rows, depth_cutoff, _worker_params)
+
 ##//////////////////////////////////////////////////////
 ##  Demo
 ##//////////////////////////////////////////////////////
@@ -61,6 +61,8 @@ except ImportError:
 
 import tempfile
 import os
+import math
+from array import array
 from collections import defaultdict
 
 from nltk import compat
@@ -221,11 +223,11 @@ class MaxentClassifier(ClassifierI):
 
     #: A list of the algorithm names that are accepted for the
     #: ``train()`` method's ``algorithm`` parameter.
-    ALGORITHMS = ['GIS', 'IIS', 'MEGAM', 'TADM']
+    ALGORITHMS = ['GIS', 'IIS', 'LBFGS', 'MEGAM', 'TADM']
 
     @classmethod
     def train(cls, train_toks, algorithm=None, trace=3, encoding=None,
-              labels=None, gaussian_prior_sigma=0, **cutoffs):
+              labels=None, gaussian_prior_sigma=0, sparse=False, **cutoffs):
         """
         Train a new maxent classifier based on the given corpus of
         training samples.  This classifier will have its weights
@@ -247,6 +249,8 @@ class MaxentClassifier(ClassifierI):
 
             - Iterative Scaling Methods: Generalized Iterative Scaling (``'GIS'``),
               Improved Iterative Scaling (``'IIS'``)
+            - Quasi-Newton Methods (requiring scipy): L-BFGS algorithm,
+              with training performed by ``scipy.optimize`` (``'LBFGS'``)
             - External Libraries (requiring megam):
               LM-BFGS algorithm, with training performed by Megam (``'megam'``)
 
@@ -266,7 +270,15 @@ class MaxentClassifier(ClassifierI):
             used instead.
         :param gaussian_prior_sigma: The sigma value for a gaussian
             prior on model weights.  Currently, this is supported by
-            ``megam``. For other algorithms, its value is ignored.
+            ``megam`` and ``LBFGS``. For other algorithms, its value is
+            ignored.
+        :type sparse: bool
+        :param sparse: If true, then ``GIS`` and ``IIS`` encode the
+            training corpus once, as a sparse matrix (requiring scipy),
+            and compute each iteration's feature counts with matrix
+            products, rather than by encoding and classifying every
+            token on every iteration.  The trained weights are the
+            same.  ``LBFGS`` always uses the sparse matrix.
         :param cutoffs: Arguments specifying various conditions under
             which the training should be halted.  (Some of the cutoff
             conditions are not supported by some algorithms.)
@@ -285,12 +297,22 @@ class MaxentClassifier(ClassifierI):
                            'norm', 'explicit', 'bernoulli'):
                 raise TypeError('Unexpected keyword arg %r' % key)
         algorithm = algorithm.lower()
-        if algorithm == 'iis':
+        if algorithm == 'iis' and sparse:
+            return train_maxent_classifier_with_sparse_iis(
+                train_toks, trace, encoding, labels, **cutoffs)
+        elif algorithm == 'iis':
             return train_maxent_classifier_with_iis(
                 train_toks, trace, encoding, labels, **cutoffs)
+        elif algorithm == 'gis' and sparse:
+            return train_maxent_classifier_with_sparse_gis(
+                train_toks, trace, encoding, labels, **cutoffs)
         elif algorithm == 'gis':
             return train_maxent_classifier_with_gis(
                 train_toks, trace, encoding, labels, **cutoffs)
+        elif algorithm == 'lbfgs':
+            return train_maxent_classifier_with_lbfgs(
+                train_toks, trace, encoding, labels,
+                gaussian_prior_sigma, **cutoffs)
         elif algorithm == 'megam':
             return train_maxent_classifier_with_megam(
                 train_toks, trace, encoding, labels,
@@ -1015,7 +1037,7 @@ def train_maxent_classifier_with_gis(train_toks, trace=3, encoding=None,
     # feature, and weight=-infinity for each unattested feature.
     weights = numpy.zeros(len(empirical_fcount), 'd')
     for fid in unattested:
-        weights[fid] = numpy.NINF
+        weights[fid] = -numpy.inf
     classifier = ConditionalExponentialClassifier(encoding, weights)
 
     # Take the log of the empirical fcount.
@@ -1135,7 +1157,7 @@ def train_maxent_classifier_with_iis(train_toks, trace=3, encoding=None,
     # feature, and weight=-infinity for each unattested feature.
     weights = numpy.zeros(len(empirical_ffreq), 'd')
     for fid in unattested:
-        weights[fid] = numpy.NINF
+        weights[fid] = -numpy.inf
     classifier = ConditionalExponentialClassifier(encoding, weights)
 
     if trace > 0:
@@ -1271,14 +1293,6 @@ def calculate_deltas(train_toks, classifier, unattested, ffreq_empirical,
     :param nftranspose: The transpose of ``nfarray``
     :type nftranspose: array(float)
     """
-    # These parameters control when we decide that we've
-    # converged.  It probably should be possible to set these
-    # manually, via keyword arguments to train.
-    NEWTON_CONVERGE = 1e-12
-    MAX_NEWTON = 300
-
-    deltas = numpy.ones(encoding.length(), 'd')
-
     # Precompute the A matrix:
     # A[nf][id] = sum ( p(fs) * p(label|fs) * f(fs,label) )
     # over all label,fs s.t. num_features[label,fs]=nf
@@ -1297,6 +1311,23 @@ def calculate_deltas(train_toks, classifier, unattested, ffreq_empirical,
                 A[nfmap[nf], id] += dist.prob(label) * val
     A /= len(train_toks)
 
+    return solve_deltas(A, unattested, ffreq_empirical, nfarray, nftranspose)
+
+def solve_deltas(A, unattested, ffreq_empirical, nfarray, nftranspose):
+    """
+    Solve for the IIS update values, given the matrix ``A``, where
+    ``A[nfmap[nf], i]`` is the estimated frequency of feature *i* in
+    labeled tokens that have ``nf`` active features.  The remaining
+    parameters are as for ``calculate_deltas()``.
+    """
+    # These parameters control when we decide that we've
+    # converged.  It probably should be possible to set these
+    # manually, via keyword arguments to train.
+    NEWTON_CONVERGE = 1e-12
+    MAX_NEWTON = 300
+
+    deltas = numpy.ones(A.shape[1], 'd')
+
     # Iteratively solve for delta.  Use the following variables:
     #   - nf_delta[x][y] = nfarray[x] * delta[y]
     #   - exp_nf_delta[x][y] = exp(nf[x] * delta[y])
@@ -1327,6 +1358,399 @@ def calculate_deltas(train_toks, classifier, unattested, ffreq_empirical,
 
     return deltas
 
+######################################################################
+#{ Classifier Trainer: Sparse Matrices
+######################################################################
+
+class SparseTrainingData(object):
+    """
+    A training corpus that has been encoded, once, as a sparse matrix
+    of joint-feature values, so that the training algorithms can
+    classify every training token, and count the features that a
+    classifier expects to see, using matrix products.
+
+    Row ``i*L+j`` of the design matrix is the joint-feature vector
+    ``encoding.encode(fs_i, labels[j])``, where *L* is the number of
+    labels.  The label probabilities that a weight vector assigns to
+    the training tokens are returned by ``prob_matrix()`` as an array
+    whose row *i* is the distribution for token *i*; these are the
+    probabilities that ``MaxentClassifier(encoding, weights)`` would
+    assign.
+    """
+    def __init__(self, train_toks, encoding):
+        from scipy import sparse
+
+        self.labels = list(encoding.labels())
+        label_index = dict((label, j) for (j, label) in
+                           enumerate(self.labels))
+        L = len(self.labels)
+        M = encoding.length()
+
+        data, indices, indptr = array('d'), array('l'), array('l', [0])
+        gold, unknown = array('l'), []
+        for tok, label in train_toks:
+            for l in self.labels:
+                for (fid, fval) in encoding.encode(tok, l):
+                    indices.append(fid)
+                    data.append(fval)
+                indptr.append(len(indices))
+            gold.append(label_index.get(label, -1))
+            if label not in label_index:
+                unknown.append((tok, label))
+        N = len(gold)
+
+        #: The design matrix, with one row per (token, label) pair.
+        self.matrix = sparse.csr_matrix(
+            (numpy.frombuffer(data, 'd'), numpy.frombuffer(indices, 'l'),
+             numpy.frombuffer(indptr, 'l')), shape=(N*L, M))
+        self.matrix.eliminate_zeros()
+        #: The index of each token's label in ``labels`` (or -1 if it is
+        #: not one of the encoding's labels).
+        self.gold = numpy.frombuffer(gold, 'l')
+        #: True for each token whose label is one of the encoding's labels.
+        self.known = self.gold >= 0
+        gold_rows = numpy.zeros(N*L, 'd')
+        gold_rows[(numpy.arange(N)*L + self.gold)[self.known]] = 1
+
+        #: The number of times that each feature occurs in the training
+        #: data with the labels in ``gold``.
+        self.gold_fcount = self.matrix.T.dot(gold_rows)
+        #: The number of times that each feature occurs in the training
+        #: data; as ``calculate_empirical_fcount()``.
+        self.empirical_fcount = self.gold_fcount
+        if unknown:
+            self.empirical_fcount = (self.gold_fcount +
+                calculate_empirical_fcount(unknown, encoding))
+
+        # Ties between labels are broken as DictionaryProbDist.max()
+        # breaks them: in favor of the greatest label.
+        self._max_order = numpy.array(
+            sorted(range(L), key=self.labels.__getitem__, reverse=True),
+            'l')
+
+    def __len__(self):
+        return len(self.gold)
+
+    def scores(self, weights):
+        """
+        :return: An array containing the (base 2 logarithmic) score of
+            each label for each token, given a feature weight vector.
+        """
+        return self.matrix.dot(weights).reshape(len(self), len(self.labels))
+
+    def prob_matrix(self, weights):
+        """
+        :return: An array containing the probability of each label for
+            each token, given a feature weight vector.
+        """
+        scores = self.scores(weights)
+        with numpy.errstate(invalid='ignore', over='ignore'):
+            top = scores.max(axis=1)
+            # Tokens whose labels all have zero probability are given a
+            # uniform distribution, as by DictionaryProbDist.
+            degenerate = ~numpy.isfinite(top)
+            top[degenerate] = 0
+            probs = numpy.exp2(scores - top[:, None])
+            probs /= probs.sum(axis=1)[:, None]
+        probs[degenerate] = 1.0 / len(self.labels)
+        return probs
+
+    def estimated_fcount(self, probs, known_only=False):
+        """
+        :return: The number of times that each feature is expected to
+            occur in the training data, given the label probabilities
+            ``probs``; as ``calculate_estimated_fcount()``.
+        :param known_only: If true, then ignore the tokens whose
+            labels are not labels of the encoding.
+        """
+        if known_only:
+            probs = probs * self.known[:, None]
+        return self.matrix.T.dot(probs.ravel())
+
+    def gold_probs(self, probs):
+        """
+        :return: The probability of each token's own label, given
+            the label probabilities ``probs``.
+        """
+        gold_probs = probs[numpy.arange(len(self)), self.gold]
+        gold_probs[~self.known] = 0
+        return gold_probs
+
+    def log_likelihood(self, probs):
+        """
+        :return: The log likelihood of the training data, given the
+            label probabilities ``probs``; as ``log_likelihood()``.
+        """
+        return math.log(self.gold_probs(probs).sum() / len(self))
+
+    def accuracy(self, probs):
+        """
+        :return: The accuracy of the most likely labels, given the label
+            probabilities ``probs``; as ``accuracy()``.
+        """
+        if not len(self):
+            return 0
+        best = self._max_order[probs[:, self._max_order].argmax(axis=1)]
+        return float((best == self.gold).sum()) / len(self)
+
+def train_maxent_classifier_with_sparse_gis(train_toks, trace=3,
+                                            encoding=None, labels=None,
+                                            **cutoffs):
+    """
+    Train a new ``ConditionalExponentialClassifier``, using the
+    Generalized Iterative Scaling algorithm, as
+    ``train_maxent_classifier_with_gis()`` does.  But the training
+    tokens are encoded only once, as a ``SparseTrainingData``; and
+    each iteration's estimated feature counts are computed with
+    sparse matrix products.
+
+    :see: ``train_maxent_classifier()`` for parameter descriptions.
+    """
+    cutoffs.setdefault('max_iter', 100)
+    cutoffchecker = CutoffChecker(cutoffs)
+
+    # Construct an encoding from the training data.
+    if encoding is None:
+        encoding = GISEncoding.train(train_toks, labels=labels)
+
+    if not hasattr(encoding, 'C'):
+        raise TypeError('The GIS algorithm requires an encoding that '
+                        'defines C (e.g., GISEncoding).')
+
+    Cinv = 1.0/encoding.C
+    data = SparseTrainingData(train_toks, encoding)
+
+    # Start with weight=0 for each attested feature, and
+    # weight=-infinity for each unattested feature.
+    unattested = (data.empirical_fcount == 0)
+    weights = numpy.zeros(len(unattested), 'd')
+    weights[unattested] = -numpy.inf
+    classifier = ConditionalExponentialClassifier(encoding, weights)
+
+    with numpy.errstate(divide='ignore'):
+        log_empirical_fcount = numpy.log2(data.empirical_fcount)
+
+    if trace > 0:
+        print('  ==> Training (%d iterations)' % cutoffs['max_iter'])
+    if trace > 2:
+        print()
+        print('      Iteration    Log Likelihood    Accuracy')
+        print('      ---------------------------------------')
+
+    # Train the classifier.
+    probs = data.prob_matrix(weights)
+    try:
+        while True:
+            if trace > 2:
+                ll = cutoffchecker.ll or data.log_likelihood(probs)
+                acc = cutoffchecker.acc or data.accuracy(probs)
+                iternum = cutoffchecker.iter
+                print('     %9d    %14.5f    %9.3f' % (iternum, ll, acc))
+
+            # Use the model to estimate the number of times each
+            # feature should occur in the training data; and update
+            # the weights (avoiding taking log(0)).
+            estimated_fcount = data.estimated_fcount(probs)
+            estimated_fcount[unattested] += 1
+            weights += ((log_empirical_fcount - numpy.log2(estimated_fcount))
+                        * Cinv)
+            classifier.set_weights(weights)
+
+            # Check the log-likelihood & accuracy cutoffs.
+            probs = data.prob_matrix(weights)
+            if cutoffchecker.check(classifier, train_toks,
+                                   data.log_likelihood(probs)):
+                break
+
+    except KeyboardInterrupt:
+        print('      Training stopped: keyboard interrupt')
+
+    if trace > 2:
+        probs = data.prob_matrix(weights)
+        ll = data.log_likelihood(probs)
+        acc = data.accuracy(probs)
+        print('         Final    %14.5f    %9.3f' % (ll, acc))
+
+    return classifier
+
+def train_maxent_classifier_with_sparse_iis(train_toks, trace=3,
+                                            encoding=None, labels=None,
+                                            **cutoffs):
+    """
+    Train a new ``ConditionalExponentialClassifier``, using the
+    Improved Iterative Scaling algorithm, as
+    ``train_maxent_classifier_with_iis()`` does.  But the training
+    tokens are encoded only once, as a ``SparseTrainingData``; and
+    the matrix of estimated feature frequencies that each iteration's
+    Newton's method solves is computed from the design matrix.
+
+    :see: ``train_maxent_classifier()`` for parameter descriptions.
+    """
+    cutoffs.setdefault('max_iter', 100)
+    cutoffchecker = CutoffChecker(cutoffs)
+
+    # Construct an encoding from the training data.
+    if encoding is None:
+        encoding = BinaryMaxentFeatureEncoding.train(train_toks, labels=labels)
+
+    data = SparseTrainingData(train_toks, encoding)
+    empirical_ffreq = data.empirical_fcount / len(data)
+
+    # nf is the sum of the features for each labeled token; nfarray
+    # lists the distinct values of nf, and nfindex maps each
+    # labeled token (i.e., each row of the design matrix) to its
+    # nf's index in nfarray.
+    matrix = data.matrix
+    nfarray, nfindex = numpy.unique(numpy.asarray(matrix.sum(axis=1)).ravel(),
+                                    return_inverse=True)
+    nftranspose = numpy.reshape(nfarray, (len(nfarray), 1))
+    rows = numpy.repeat(numpy.arange(matrix.shape[0]), numpy.diff(matrix.indptr))
+    cells = nfindex.ravel()[rows] * matrix.shape[1] + matrix.indices
+    A_shape = (len(nfarray), matrix.shape[1])
+
+    # Start with weight=0 for each attested feature, and
+    # weight=-infinity for each unattested feature.
+    unattested = numpy.nonzero(empirical_ffreq == 0)[0]
+    weights = numpy.zeros(len(empirical_ffreq), 'd')
+    weights[unattested] = -numpy.inf
+    classifier = ConditionalExponentialClassifier(encoding, weights)
+
+    if trace > 0:
+        print('  ==> Training (%d iterations)' % cutoffs['max_iter'])
+    if trace > 2:
+        print()
+        print('      Iteration    Log Likelihood    Accuracy')
+        print('      ---------------------------------------')
+
+    # Train the classifier.
+    probs = data.prob_matrix(weights)
+    try:
+        while True:
+            if trace > 2:
+                ll = cutoffchecker.ll or data.log_likelihood(probs)
+                acc = cutoffchecker.acc or data.accuracy(probs)
+                iternum = cutoffchecker.iter
+                print('     %9d    %14.5f    %9.3f' % (iternum, ll, acc))
+
+            # A[nf][id] = sum ( p(fs) * p(label|fs) * f(fs,label) )
+            # over all label,fs s.t. num_features[label,fs]=nf
+            A = numpy.bincount(cells, matrix.data * probs.ravel()[rows],
+                               A_shape[0] * A_shape[1]).reshape(A_shape)
+            A /= len(data)
+
+            # Calculate the deltas for this iteration, using Newton's
+            # method, and use them to update our weights.
+            weights += solve_deltas(A, unattested, empirical_ffreq,
+                                    nfarray, nftranspose)
+            classifier.set_weights(weights)
+
+            # Check the log-likelihood & accuracy cutoffs.
+            probs = data.prob_matrix(weights)
+            if cutoffchecker.check(classifier, train_toks,
+                                   data.log_likelihood(probs)):
+                break
+
+    except KeyboardInterrupt:
+        print('      Training stopped: keyboard interrupt')
+
+    if trace > 2:
+        probs = data.prob_matrix(weights)
+        ll = data.log_likelihood(probs)
+        acc = data.accuracy(probs)
+        print('         Final    %14.5f    %9.3f' % (ll, acc))
+
+    return classifier
+
+######################################################################
+#{ Classifier Trainer: L-BFGS
+######################################################################
+
+def train_maxent_classifier_with_lbfgs(train_toks, trace=3, encoding=None,
+                                       labels=None, gaussian_prior_sigma=0,
+                                       **cutoffs):
+    """
+    Train a new ``ConditionalExponentialClassifier``, using the given
+    training samples, by maximizing their conditional log likelihood
+    with the L-BFGS algorithm from ``scipy.optimize``.  The training
+    tokens are encoded once, as a ``SparseTrainingData``; and the
+    log likelihood and its gradient are computed with sparse matrix
+    products.
+
+    If ``gaussian_prior_sigma`` is zero, then features that are not
+    attested in ``train_toks`` are given a weight of -infinity, as
+    they are by the iterative scaling algorithms; otherwise, all
+    weights are penalized by a gaussian prior with the given sigma.
+    Only the ``max_iter`` cutoff is supported.
+
+    :see: ``train_maxent_classifier()`` for parameter descriptions.
+    """
+    from scipy.optimize import minimize
+
+    cutoffs.setdefault('max_iter', 100)
+
+    # Construct an encoding from the training data.
+    if encoding is None:
+        encoding = BinaryMaxentFeatureEncoding.train(train_toks, labels=labels)
+
+    data = SparseTrainingData(train_toks, encoding)
+    # Tokens whose labels are not labels of the encoding cannot be
+    # predicted by any model, so only the others are fit.
+    gold_fcount = data.gold_fcount
+    if gaussian_prior_sigma:
+        free = numpy.ones(len(gold_fcount), bool)
+    else:
+        free = (gold_fcount != 0)
+    weights = numpy.zeros(len(gold_fcount), 'd')
+    weights[~free] = -numpy.inf
+
+    # The optimizer works with natural logarithmic weights; but the
+    # classifier's weights are base 2 logarithms.
+    LOG2_E = numpy.log2(numpy.e)
+    variance = gaussian_prior_sigma ** 2
+
+    def negative_log_likelihood(params):
+        weights[free] = params * LOG2_E
+        probs = data.prob_matrix(weights)
+        with numpy.errstate(divide='ignore'):
+            loss = -numpy.log(data.gold_probs(probs)[data.known]).sum()
+        gradient = (data.estimated_fcount(probs, known_only=True)[free] -
+                    gold_fcount[free])
+        if variance:
+            loss += (params ** 2).sum() / (2 * variance)
+            gradient += params / variance
+        return loss, gradient
+
+    def report(params):
+        weights[free] = params * LOG2_E
+        probs = data.prob_matrix(weights)
+        report.iter += 1
+        print('     %9d    %14.5f    %9.3f' % (
+            report.iter, data.log_likelihood(probs), data.accuracy(probs)))
+    report.iter = 0
+
+    if trace > 0:
+        print('  ==> Training (%d iterations)' % cutoffs['max_iter'])
+    if trace > 2:
+        print()
+        print('      Iteration    Log Likelihood    Accuracy')
+        print('      ---------------------------------------')
+
+    result = minimize(negative_log_likelihood, numpy.zeros(free.sum(), 'd'),
+                      jac=True, method='L-BFGS-B',
+                      callback=(report if trace > 2 else None),
+                      options={'maxiter': cutoffs['max_iter']})
+    weights[free] = result.x * LOG2_E
+
+    if trace > 2:
+        probs = data.prob_matrix(weights)
+        ll = data.log_likelihood(probs)
+        acc = data.accuracy(probs)
+        print('         Final    %14.5f    %9.3f' % (ll, acc))
+    if trace > 0 and not result.success:
+        print('      Training stopped: %s' % result.message)
+
+    return ConditionalExponentialClassifier(encoding, weights)
+
 ######################################################################
 #{ Classifier Trainer: megam
 ######################################################################
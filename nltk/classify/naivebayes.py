@@ -33,7 +33,13 @@ from __future__ import print_function, unicode_literals
 
 from collections import defaultdict
 
-from nltk.probability import FreqDist, DictionaryProbDist, ELEProbDist, sum_logs
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from nltk.probability import (FreqDist, ConditionalFreqDist, DictionaryProbDist,
+                              ELEProbDist, sum_logs)
 from nltk.classify.api import ClassifierI
 
 ##//////////////////////////////////////////////////////
@@ -120,6 +126,95 @@ class NaiveBayesClassifier(ClassifierI):
 
         return DictionaryProbDist(logprob, normalize=True, log=True)
 
+    #: The number of featuresets that ``prob_classify_many()`` scores at
+    #: once.
+    BATCH_SIZE = 256
+
+    def classify_many(self, featuresets):
+        return [pdist.max() for pdist in self.prob_classify_many(featuresets)]
+
+    def prob_classify_many(self, featuresets):
+        """
+        Return the probability distribution over labels for each of
+        the given featuresets, as ``prob_classify()`` does.  If numpy
+        is available, then the feature probability distributions are
+        compiled (once) into a table of log probabilities, with a row
+        for each ``(fname, fval)`` pair and a column for each label;
+        and each batch of featuresets is scored by summing the rows of
+        its features.
+        """
+        if numpy is None:
+            return ClassifierI.prob_classify_many(self, featuresets)
+        labels, label_logprobs, table, rows, unseen_rows = self._compile()
+
+        results = []
+        for batch in _batches(featuresets, self.BATCH_SIZE):
+            # Map each feature to its row in the table.  As in
+            # prob_classify(), features whose names have never been
+            # seen are ignored.  Batches are padded with row 0, which
+            # is all zeros.
+            batch_rows = []
+            for featureset in batch:
+                batch_rows.append([rows.get((fname, fval), unseen_rows[fname])
+                                   for (fname, fval) in featureset.items()
+                                   if fname in unseen_rows])
+            width = max(len(fs_rows) for fs_rows in batch_rows)
+            indices = numpy.zeros((len(batch), width), int)
+            for i, fs_rows in enumerate(batch_rows):
+                indices[i, :len(fs_rows)] = fs_rows
+
+            logprobs = table[indices].sum(axis=1) + label_logprobs
+            for fs_logprobs in logprobs.tolist():
+                results.append(DictionaryProbDist(
+                    dict(zip(labels, fs_logprobs)), normalize=True, log=True))
+        return results
+
+    def _compile(self):
+        """
+        :return: A tuple ``(labels, label_logprobs, table, rows,
+            unseen_rows)``, where ``table[rows[fname, fval]]`` holds
+            the log probability of ``fname=fval`` given each label; and
+            ``table[unseen_rows[fname]]`` holds the log probability of
+            a value of ``fname`` that has not been seen with any label.
+        """
+        label_probdist = self._label_probdist
+        feature_probdist = self._feature_probdist
+        compiled = getattr(self, '_compiled', None)
+        if (compiled is not None and compiled[0] is label_probdist and
+                compiled[1] is feature_probdist):
+            return compiled[2]
+
+        labels = self._labels
+        label_index = dict((label, j) for (j, label) in enumerate(labels))
+        feature_values = defaultdict(set)
+        for (label, fname), probdist in feature_probdist.items():
+            feature_values[fname].update(probdist.samples())
+
+        unseen_rows = {}
+        rows = {}
+        for fname, fvals in feature_values.items():
+            unseen_rows[fname] = len(unseen_rows) + len(rows) + 1
+            for fval in fvals:
+                rows[fname, fval] = len(unseen_rows) + len(rows) + 1
+
+        # A (label, fname) pair that has no probability distribution
+        # gives every value of fname a probability of 0.
+        table = numpy.empty((len(unseen_rows) + len(rows) + 1, len(labels)))
+        table.fill(sum_logs([]))
+        table[0] = 0
+        unseen = object()
+        for (label, fname), probdist in feature_probdist.items():
+            j = label_index[label]
+            table[unseen_rows[fname], j] = probdist.logprob(unseen)
+            for fval in feature_values[fname]:
+                table[rows[fname, fval], j] = probdist.logprob(fval)
+        label_logprobs = numpy.array([label_probdist.logprob(label)
+                                      for label in labels])
+
+        compiled = (labels, label_logprobs, table, rows, unseen_rows)
+        self._compiled = (label_probdist, feature_probdist, compiled)
+        return compiled
+
     def show_most_informative_features(self, n=10):
         # Determine the most relevant features, and display them.
         cpdist = self._feature_probdist
@@ -227,6 +322,211 @@ class NaiveBayesClassifier(ClassifierI):
 
         return cls(label_probdist, feature_probdist)
 
+def _batches(items, size):
+    """Yield lists of (up to) ``size`` consecutive items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+##//////////////////////////////////////////////////////
+##  Online Naive Bayes Classifier
+##//////////////////////////////////////////////////////
+
+class OnlineNaiveBayesClassifier(NaiveBayesClassifier):
+    """
+    A Naive Bayes classifier that can be trained incrementally.
+    Rather than fixed probability distributions, it keeps the
+    frequency distributions that ``NaiveBayesClassifier.train()``
+    counts, and builds its probability distributions from them when
+    they are next needed.  Training tokens can be added with
+    ``update()``, or removed with ``forget()`` (e.g., to train on a
+    sliding window); and classifiers that were trained on separate
+    shards of a corpus (possibly in separate processes) can be
+    combined with ``merge()``.  At any time, the classifier is the
+    same as the ``NaiveBayesClassifier`` that would be trained on the
+    tokens that have been added and not removed.
+
+        >>> from functools import reduce
+        >>> from nltk.classify import OnlineNaiveBayesClassifier
+        >>> train = [({'a': 1, 'b': 0}, 'x'), ({'a': 1, 'b': 1}, 'x'),
+        ...          ({'a': 0, 'b': 1}, 'y'), ({'a': 0}, 'y')]
+        >>> shards = [OnlineNaiveBayesClassifier.train(train[:2]),
+        ...           OnlineNaiveBayesClassifier.train(train[2:])]
+        >>> classifier = reduce(OnlineNaiveBayesClassifier.merge, shards)
+        >>> classifier.classify({'a': 0})
+        'y'
+        >>> classifier.forget(train[2:]).update([({'a': 0}, 'z')])
+        <OnlineNaiveBayesClassifier: 2 labels, 3 tokens>
+        >>> sorted(classifier.labels())
+        ['x', 'z']
+    """
+    def __init__(self, estimator=ELEProbDist):
+        """
+        :param estimator: The estimator that is used to build the
+            probability distributions, as for
+            ``NaiveBayesClassifier.train()``.
+        """
+        self._estimator = estimator
+        # freq(label)
+        self._label_freqdist = FreqDist()
+        # freq(fval|label, fname)
+        self._feature_freqdist = ConditionalFreqDist()
+        # freq(fval|fname), used to find the values that each feature
+        # can take.
+        self._fval_freqdist = ConditionalFreqDist()
+        self._probdists = None
+
+    def __repr__(self):
+        return '<OnlineNaiveBayesClassifier: %d labels, %d tokens>' % (
+            len(self._label_freqdist), self._label_freqdist.N())
+
+    # The probability distributions that NaiveBayesClassifier's
+    # methods use are built from the frequency distributions when
+    # they are first needed after a change.
+    @property
+    def _label_probdist(self):
+        return self._build_probdists()[0]
+
+    @property
+    def _feature_probdist(self):
+        return self._build_probdists()[1]
+
+    @property
+    def _labels(self):
+        return self._build_probdists()[2]
+
+    def _build_probdists(self):
+        if self._probdists is not None:
+            return self._probdists
+        estimator = self._estimator
+        label_probdist = estimator(self._label_freqdist)
+
+        # As in NaiveBayesClassifier.train(), a feature that is missing
+        # from a token has the value None.
+        feature_values = dict((fname, set(freqdist)) for (fname, freqdist)
+                              in self._fval_freqdist.items())
+        feature_freqdist = {}
+        for label, num_samples in self._label_freqdist.items():
+            for fname in feature_values:
+                freqdist = FreqDist(self._feature_freqdist.get((label, fname),
+                                                               ()))
+                if num_samples - freqdist.N() > 0:
+                    freqdist[None] += num_samples - freqdist.N()
+                    feature_values[fname].add(None)
+                feature_freqdist[label, fname] = freqdist
+
+        feature_probdist = {}
+        for ((label, fname), freqdist) in feature_freqdist.items():
+            probdist = estimator(freqdist, bins=len(feature_values[fname]))
+            feature_probdist[label, fname] = probdist
+
+        self._probdists = (label_probdist, feature_probdist,
+                           list(label_probdist.samples()))
+        return self._probdists
+
+    def update(self, labeled_featuresets):
+        """
+        Train the classifier on more tokens.
+
+        :param labeled_featuresets: A list of classified featuresets,
+            i.e., a list of tuples ``(featureset, label)``.
+        :return: This classifier.
+        """
+        for featureset, label in labeled_featuresets:
+            self._label_freqdist[label] += 1
+            for fname, fval in featureset.items():
+                self._feature_freqdist[label, fname][fval] += 1
+                self._fval_freqdist[fname][fval] += 1
+        self._probdists = None
+        return self
+
+    def forget(self, labeled_featuresets):
+        """
+        Remove tokens that the classifier was trained on.
+
+        :param labeled_featuresets: A list of classified featuresets,
+            i.e., a list of tuples ``(featureset, label)``, each of
+            which was given to ``update()`` (or ``train()``).
+        :return: This classifier.
+        :raise ValueError: If a featureset was not trained on with
+            the given label.  The classifier is then left unchanged.
+        """
+        # Check the whole batch against the current counts before
+        # removing anything.
+        labeled_featuresets = list(labeled_featuresets)
+        label_counts = FreqDist()
+        feature_counts = FreqDist()
+        for featureset, label in labeled_featuresets:
+            label_counts[label] += 1
+            missing = label_counts[label] > self._label_freqdist[label]
+            for fname, fval in featureset.items():
+                feature_counts[label, fname, fval] += 1
+                if (feature_counts[label, fname, fval] >
+                    self._feature_freqdist.get((label, fname), {}).get(fval, 0)):
+                    missing = True
+            if missing:
+                raise ValueError('Featureset %r was not trained on with '
+                                 'label %r' % (featureset, label))
+
+        for featureset, label in labeled_featuresets:
+            _decrement(self._label_freqdist, label)
+            for fname, fval in featureset.items():
+                _decrement(self._feature_freqdist, (label, fname), fval)
+                _decrement(self._fval_freqdist, fname, fval)
+        self._probdists = None
+        return self
+
+    def merge(self, other):
+        """
+        Add the counts of another ``OnlineNaiveBayesClassifier`` to this
+        classifier, which will then be the classifier that would have
+        been trained on the tokens of both.
+
+        :type other: OnlineNaiveBayesClassifier
+        :return: This classifier.
+        """
+        self._label_freqdist.update(other._label_freqdist)
+        for cond, freqdist in other._feature_freqdist.items():
+            self._feature_freqdist[cond].update(freqdist)
+        for fname, freqdist in other._fval_freqdist.items():
+            self._fval_freqdist[fname].update(freqdist)
+        self._probdists = None
+        return self
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_probdists'] = None
+        state.pop('_compiled', None)
+        return state
+
+    @classmethod
+    def train(cls, labeled_featuresets, estimator=ELEProbDist):
+        """
+        :param labeled_featuresets: A list of classified featuresets,
+            i.e., a list of tuples ``(featureset, label)``.
+        """
+        return cls(estimator).update(labeled_featuresets)
+
+def _decrement(freqdist, key, sample=None):
+    """
+    Decrement the count of ``key`` in a ``FreqDist`` (or of ``sample``
+    in ``freqdist[key]``, if ``freqdist`` is a ``ConditionalFreqDist``),
+    removing any counts and conditions that reach zero.
+    """
+    if isinstance(freqdist, ConditionalFreqDist):
+        _decrement(freqdist[key], sample)
+        if not freqdist[key]:
+            del freqdist[key]
+    elif freqdist[key] > 1:
+        freqdist[key] -= 1
+    else:
+        del freqdist[key]
+
 ##//////////////////////////////////////////////////////
 ##  Demo
 ##//////////////////////////////////////////////////////
@@ -29,15 +29,32 @@ best 1000 features:
 ...                      ('chi2', SelectKBest(chi2, k=1000)),
 ...                      ('nb', MultinomialNB())])
 >>> classif = SklearnClassifier(pipeline)
+
+A corpus that does not fit in memory can be used to train an estimator
+that supports ``partial_fit``, such as ``SGDClassifier``, by streaming
+it with ``train_stream()``.  Its featuresets are vectorized and fitted a
+mini-batch at a time, using either a vocabulary that is collected in a
+first pass over the corpus, or a feature hasher:
+
+>>> train = [({'a': 1}, 'x'), ({'b': 1}, 'y')] * 10
+>>> classif = SklearnClassifier(MultinomialNB())
+>>> classif = classif.train_stream(iter(train), labels=['x', 'y'],
+...                                n_features=2**10, batch_size=5)
+>>> classif.classify_many([{'a': 1}, {'b': 1}]) == ['x', 'y']
+True
 """
 from __future__ import print_function, unicode_literals
 
+from itertools import islice
+
 from nltk.classify.api import ClassifierI
 from nltk.probability import DictionaryProbDist
 from nltk import compat
 
 try:
-    from sklearn.feature_extraction import DictVectorizer
+    import numpy
+    from scipy import sparse as sp
+    from sklearn.feature_extraction import DictVectorizer, FeatureHasher
     from sklearn.preprocessing import LabelEncoder
 except ImportError:
     pass
@@ -68,32 +85,40 @@ class SklearnClassifier(ClassifierI):
         self._clf = estimator
         self._encoder = LabelEncoder()
         self._vectorizer = DictVectorizer(dtype=dtype, sparse=sparse)
+        self._dtype = dtype
+        self._sparse = sparse
 
     def __repr__(self):
         return "<SklearnClassifier(%r)>" % self._clf
 
+    #: The number of featuresets that are vectorized at a time by
+    #: ``classify_many()``, ``prob_classify_many()`` and (by default)
+    #: ``train_stream()``.
+    BATCH_SIZE = 1000
+
     def classify_many(self, featuresets):
         """Classify a batch of samples.
 
         :param featuresets: An iterable over featuresets, each a dict mapping
-            strings to either numbers, booleans or strings.
+            strings to either numbers, booleans or strings.  They are
+            vectorized ``BATCH_SIZE`` at a time.
         :return: The predicted class label for each input sample.
         :rtype: list
         """
-        X = self._vectorizer.transform(featuresets)
         classes = self._encoder.classes_
-        return [classes[i] for i in self._clf.predict(X)]
+        return [classes[i] for X in self._batches(featuresets)
+                for i in self._clf.predict(X)]
 
     def prob_classify_many(self, featuresets):
         """Compute per-class probabilities for a batch of samples.
 
         :param featuresets: An iterable over featuresets, each a dict mapping
-            strings to either numbers, booleans or strings.
+            strings to either numbers, booleans or strings.  They are
+            vectorized ``BATCH_SIZE`` at a time.
         :rtype: list of ``ProbDistI``
         """
-        X = self._vectorizer.transform(featuresets)
-        y_proba_list = self._clf.predict_proba(X)
-        return [self._make_probdist(y_proba) for y_proba in y_proba_list]
+        return [self._make_probdist(y_proba) for X in self._batches(featuresets)
+                for y_proba in self._clf.predict_proba(X)]
 
     def labels(self):
         """The class labels used by this classifier.
@@ -118,12 +143,111 @@ class SklearnClassifier(ClassifierI):
 
         return self
 
+    def train_stream(self, labeled_featuresets, labels=None, n_features=None,
+                     batch_size=None):
+        """
+        Train (fit) the scikit-learn estimator on a stream of labeled
+        featuresets, which are vectorized ``batch_size`` at a time, so
+        that the corpus need not fit in memory.  If the estimator has a
+        ``partial_fit`` method, then it is called for each batch;
+        otherwise, the batches' (sparse) feature matrices are stacked
+        and passed to ``fit``.
+
+        If ``n_features`` is given, then the featuresets are vectorized
+        by a ``FeatureHasher`` with that many (non-negative) features,
+        and ``labeled_featuresets`` is read once.  Otherwise, a first pass
+        over ``labeled_featuresets`` collects the vocabulary of
+        features (and the labels); it is then frozen, and features
+        that are not in it are ignored.
+
+        :param labeled_featuresets: An iterable over ``(featureset,
+            label)`` pairs, where each ``featureset`` is a dict mapping
+            strings to either numbers, booleans or strings.  Unless
+            ``n_features`` is given, it must be possible to iterate
+            over it twice (e.g., it may be a corpus view, but not a
+            generator).
+        :param labels: The list of all labels.  It is required if
+            ``n_features`` is given.
+        :param n_features: The number of features to hash featuresets
+            into (e.g., ``2**20``).
+        :param batch_size: The number of featuresets per batch.  It
+            defaults to ``BATCH_SIZE``.
+        """
+        if batch_size is None:
+            batch_size = self.BATCH_SIZE
+        if n_features is not None:
+            if labels is None:
+                raise ValueError('The labels must be given when features '
+                                 'are hashed.')
+            self._vectorizer = FeatureHasher(n_features, input_type='dict',
+                                             dtype=self._dtype,
+                                             alternate_sign=False)
+        else:
+            if iter(labeled_featuresets) is labeled_featuresets:
+                raise ValueError('A vocabulary can only be collected from '
+                                 'labeled featuresets that can be read '
+                                 'twice; use n_features to hash features '
+                                 'from an iterator.')
+            seen_labels = set()
+            def featuresets():
+                for featureset, label in labeled_featuresets:
+                    seen_labels.add(label)
+                    yield featureset
+            self._vectorizer = DictVectorizer(dtype=self._dtype,
+                                              sparse=self._sparse)
+            self._vectorizer.fit(featuresets())
+            if labels is None:
+                labels = seen_labels
+        self._encoder.fit(list(labels))
+        classes = numpy.arange(len(self._encoder.classes_))
+
+        partial_fit = getattr(self._clf, 'partial_fit', None)
+        Xs, ys = [], []
+        for batch in _batches(labeled_featuresets, batch_size):
+            X = self._transform([featureset for (featureset, label) in batch])
+            y = self._encoder.transform([label for (featureset, label)
+                                         in batch])
+            if partial_fit is not None:
+                partial_fit(X, y, classes=classes)
+            else:
+                Xs.append(X)
+                ys.append(y)
+        if partial_fit is None and Xs:
+            X = sp.vstack(Xs) if sp.issparse(Xs[0]) else numpy.vstack(Xs)
+            self._clf.fit(X, numpy.concatenate(ys))
+
+        return self
+
+    def _transform(self, featuresets):
+        X = self._vectorizer.transform(featuresets)
+        if not self._sparse and sp.issparse(X):
+            X = X.toarray()
+        return X
+
+    def _batches(self, featuresets):
+        """
+        Yield the feature matrices of consecutive batches of
+        ``BATCH_SIZE`` featuresets.
+        """
+        for batch in _batches(featuresets, self.BATCH_SIZE):
+            yield self._transform(batch)
+
     def _make_probdist(self, y_proba):
         classes = self._encoder.classes_
         return DictionaryProbDist(dict((classes[i], p)
                                        for i, p in enumerate(y_proba)))
 
 
+def _batches(items, size):
+    """Yield lists of (up to) ``size`` consecutive items."""
+    items = iter(items)
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
 # skip doctests if scikit-learn is not installed
 def setup_module(module):
     from nose import SkipTest
@@ -109,12 +109,15 @@ class Senna(TaggerI):
         """
         return self.tag_sents([tokens])[0]
 
-    def tag_sents(self, sentences):
+    def tag_sents(self, sentences, n_jobs=1, chunksize=100):
         """
         Applies the tag method over a list of sentences. This method will return a
         list of dictionaries. Every dictionary will contain a word with its
         calculated annotations/tags.
+        See ``TaggerI.tag_sents()`` for ``n_jobs`` and ``chunksize``.
         """
+        if n_jobs != 1:
+            return super(Senna, self).tag_sents(sentences, n_jobs, chunksize)
         encoding = self._encoding
         
         if not path.isfile(self.executable(self._path)):
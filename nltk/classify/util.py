@@ -109,13 +109,20 @@ class CutoffChecker(object):
         self.acc = None
         self.iter = 1
 
-    def check(self, classifier, train_toks):
+    def check(self, classifier, train_toks, ll=None):
+        """
+        :param ll: The log likelihood of ``classifier`` on
+            ``train_toks``, if the caller has already computed it.
+        """
         cutoffs = self.cutoffs
         self.iter += 1
         if 'max_iter' in cutoffs and self.iter >= cutoffs['max_iter']:
             return True # iteration cutoff.
 
-        new_ll = nltk.classify.util.log_likelihood(classifier, train_toks)
+        if ll is None:
+            new_ll = nltk.classify.util.log_likelihood(classifier, train_toks)
+        else:
+            new_ll = ll
         if math.isnan(new_ll):
             return True
 
@@ -128,8 +135,7 @@ class CutoffChecker(object):
             self.ll = new_ll
 
         if 'max_acc' in cutoffs or 'min_accdelta' in cutoffs:
-            new_acc = nltk.classify.util.log_likelihood(
-                classifier, train_toks)
+            new_acc = new_ll
             if 'max_acc' in cutoffs and new_acc >= cutoffs['max_acc']:
                 return True # log likelihood cutoff
             if ('min_accdelta' in cutoffs and self.acc and
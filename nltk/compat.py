@@ -545,7 +545,9 @@ else:
 
 
 def add_py3_data(path):
-    if PY3:
+    # Compact Punkt models (see nltk.tokenize.punkt) are the same for
+    # Python 2 and 3.
+    if PY3 and not str(path).endswith('.punkt'):
         for item in _PY3_DATA_UPDATES:
             if item in str(path) and "/PY3" not in str(path):
                 pos = path.index(item) + len(item)
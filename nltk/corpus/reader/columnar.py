@@ -0,0 +1,432 @@
+# Natural Language Toolkit: Columnar Corpus Reader
+#
+# Copyright (C) 2001-2015 NLTK Project
+# URL: <http://nltk.org/>
+# For license information, see LICENSE.TXT
+
+"""
+A reader for tokenized and tagged corpora that have been converted to
+a compact binary, column-oriented format.
+
+Each corpus file stores an interned vocabulary, a column of 32-bit
+token ids, an optional column of 32-bit tag ids, and a table of
+sentence offsets.  Files are memory-mapped, so any word, sentence or
+slice of the corpus can be located in constant time, and only the
+parts of the file that are actually used are read from disk.  Unlike
+``PickleCorpusView``, the format contains no pickled objects, so it
+is safe to share, and it does not depend on the Python version.
+
+Columnar corpora are usually built from an existing corpus reader:
+
+    >>> from nltk.corpus import brown
+    >>> from nltk.corpus.reader import build_columnar_corpus
+    >>> reader = build_columnar_corpus(brown, '/tmp/brown') # doctest: +SKIP
+    >>> reader.tagged_sents()[5000][:3] # doctest: +SKIP
+    [('The', 'AT'), ('jury', 'NN'), ('said', 'VBD')]
+"""
+
+import os
+import sys
+import bisect
+import mmap
+import array
+import struct
+
+from nltk import compat
+from nltk.tag import map_tag
+from nltk.util import AbstractLazySequence, LazySubsequence
+from nltk.internals import slice_bounds
+from nltk.data import PathPointer, FileSystemPathPointer
+
+from nltk.corpus.reader.api import *
+from nltk.corpus.reader.util import *
+
+######################################################################
+#{ File Format
+######################################################################
+
+def _int64_bytes(values):
+    return struct.pack('<%dq' % len(values), *values)
+
+def _string_table_bytes(strings):
+    encoded = [s.encode('utf8') for s in strings]
+    offsets = [0]
+    for s in encoded:
+        offsets.append(offsets[-1] + len(s))
+    return _int64_bytes(offsets) + b''.join(encoded)
+
+def _write_int32(out, values):
+    if sys.byteorder == 'big':
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    values.tofile(out)
+
+def _open_buffer(fileid):
+    """
+    Return a buffer with the contents of the given file: a read-only
+    memory map if the file is on disk, or a byte string otherwise
+    (e.g., for files inside a zip archive).
+    """
+    if isinstance(fileid, PathPointer) and \
+           not isinstance(fileid, FileSystemPathPointer):
+        stream = fileid.open()
+        try:
+            return stream.read()
+        finally:
+            stream.close()
+    if isinstance(fileid, FileSystemPathPointer):
+        fileid = fileid.path
+    with open(fileid, 'rb') as fp:
+        return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+class _StringTable(object):
+    """
+    A string table stored in a columnar corpus file.  Strings are
+    decoded the first time they are used.
+    """
+    def __init__(self, buf, offset, size):
+        self._buf = buf
+        self._offsets = offset
+        self._strings = offset + 8*(size+1)
+        self._cache = [None] * size
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __getitem__(self, i):
+        s = self._cache[i]
+        if s is None:
+            start, end = struct.unpack_from('<2q', self._buf,
+                                            self._offsets + 8*i)
+            s = self._buf[self._strings+start:self._strings+end].decode('utf8')
+            self._cache[i] = s
+        return s
+
+    def end(self):
+        """Return the buffer position just past the end of this table."""
+        return self._strings + struct.unpack_from(
+            '<q', self._buf, self._offsets + 8*len(self._cache))[0]
+
+######################################################################
+#{ Corpus Views
+######################################################################
+
+class ColumnarCorpusView(AbstractLazySequence):
+    """
+    A corpus view for a single columnar corpus file.  Depending on its
+    flags, the view is a list of words, of ``(word, tag)`` tuples, or of
+    sentences.  Since the file records the position of every token and
+    sentence, indexing and slicing take constant time, no matter where
+    in the file they occur.
+
+    ``ColumnarCorpusView`` objects are typically created by
+    ``ColumnarCorpusReader`` (not directly by nltk users).
+    """
+    MAGIC = b'NLTKCOL1'
+
+    HEADER = struct.Struct('<8sqqqqq')
+    """The file header: the magic string, a tagged flag, and the number of
+    tokens, sentences, vocabulary entries and tags.  The header is followed
+    by the sentence offsets (``int64 * (num_sents+1)``), the token ids
+    (``int32 * num_tokens``), the tag ids (``int32 * num_tokens``, tagged
+    files only), and the word and tag string tables.  Each string table
+    consists of ``int64 * (size+1)`` offsets followed by the UTF-8 encoded
+    strings.  All integers are little-endian."""
+
+    NO_TAG = -1
+    """The tag id used for tokens whose tag is None."""
+
+    CHUNK_SIZE = 4096
+    """The number of tokens or sentences that are decoded at a time
+       when iterating over the view."""
+
+    def __init__(self, fileid, tagged=False, group_by_sent=False,
+                 tag_mapping_function=None):
+        """
+        :param fileid: The path of the columnar corpus file, as a string
+            or a ``PathPointer``.
+        :param tagged: If true, then tokens are ``(word, tag)`` tuples;
+            otherwise they are words.
+        :param group_by_sent: If true, then the view is a list of
+            sentences; otherwise it is a list of tokens.
+        :param tag_mapping_function: A function that is applied to
+            each tag, or None.
+        """
+        self._fileid = fileid
+        self._tagged = tagged
+        self._group_by_sent = group_by_sent
+        self._tag_mapping_function = tag_mapping_function
+        self._open()
+
+    def _open(self):
+        self._buf = buf = _open_buffer(self._fileid)
+        if len(buf) < self.HEADER.size:
+            raise ValueError('%s is not a columnar corpus file' % self._fileid)
+        (magic, has_tags, self._num_tokens, self._num_sents,
+         num_words, num_tags) = self.HEADER.unpack_from(buf, 0)
+        if magic != self.MAGIC:
+            raise ValueError('%s is not a columnar corpus file' % self._fileid)
+        if self._tagged and not has_tags:
+            raise ValueError('%s does not contain tags' % self._fileid)
+
+        self._sent_pos = self.HEADER.size
+        self._token_pos = self._sent_pos + 8*(self._num_sents+1)
+        self._tag_pos = self._token_pos + 4*self._num_tokens
+        if has_tags:
+            words_pos = self._tag_pos + 4*self._num_tokens
+        else:
+            words_pos = self._tag_pos
+        self._words = _StringTable(buf, words_pos, num_words)
+        tags = _StringTable(buf, self._words.end(), num_tags)
+        tags = [tags[i] for i in range(num_tags)]
+        if self._tag_mapping_function:
+            tags = [self._tag_mapping_function(t) for t in tags]
+        # NO_TAG (-1) indexes this final None.
+        self._tags = tags + [None]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for attr in ('_buf', '_words', '_tags'):
+            del state[attr]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
+
+    def __len__(self):
+        if self._group_by_sent:
+            return self._num_sents
+        return self._num_tokens
+
+    def _sent_offsets(self, start, stop):
+        return struct.unpack_from('<%dq' % (stop-start), self._buf,
+                                  self._sent_pos + 8*start)
+
+    def _tokens(self, start, stop):
+        """Decode the tokens in the range ``[start, stop)``."""
+        n = stop - start
+        words = self._words
+        ids = struct.unpack_from('<%di' % n, self._buf,
+                                 self._token_pos + 4*start)
+        if not self._tagged:
+            return [words[i] for i in ids]
+        tags = self._tags
+        tag_ids = struct.unpack_from('<%di' % n, self._buf,
+                                     self._tag_pos + 4*start)
+        return [(words[i], tags[t]) for (i, t) in zip(ids, tag_ids)]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop = slice_bounds(self, i)
+            return LazySubsequence(self, start, stop)
+        if i < 0: i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('index out of range')
+        if self._group_by_sent:
+            return self._tokens(*self._sent_offsets(i, i+2))
+        return self._tokens(i, i+1)[0]
+
+    def iterate_from(self, start):
+        chunk = self.CHUNK_SIZE
+        end = len(self)
+        for pos in range(max(0, start), end, chunk):
+            stop = min(pos+chunk, end)
+            if self._group_by_sent:
+                offsets = self._sent_offsets(pos, stop+1)
+                base = offsets[0]
+                tokens = self._tokens(base, offsets[-1])
+                for (s, e) in zip(offsets, offsets[1:]):
+                    yield tokens[s-base:e-base]
+            else:
+                for token in self._tokens(pos, stop):
+                    yield token
+
+    @classmethod
+    def write(cls, sents, output_file, tagged=True):
+        """
+        Write a list of sentences to a columnar corpus file.
+
+        :param sents: The sentences to write.  If ``tagged`` is true, then
+            each sentence is a list of ``(word, tag)`` tuples; otherwise
+            it is a list of words.
+        :param output_file: A filename or a file opened in binary mode.
+        :param tagged: Whether the sentences are tagged.
+        """
+        if isinstance(output_file, compat.string_types):
+            with open(output_file, 'wb') as out:
+                return cls.write(sents, out, tagged)
+
+        vocab, tagset = {}, {}
+        words, tags = [], []
+        token_ids = array.array(str('i'))
+        tag_ids = array.array(str('i'))
+        sent_offsets = [0]
+
+        for sent in sents:
+            for token in sent:
+                if tagged:
+                    word, tag = token
+                    if tag is None:
+                        tag_ids.append(cls.NO_TAG)
+                    else:
+                        tag_id = tagset.get(tag)
+                        if tag_id is None:
+                            tag_id = tagset[tag] = len(tags)
+                            tags.append(tag)
+                        tag_ids.append(tag_id)
+                else:
+                    word = token
+                word_id = vocab.get(word)
+                if word_id is None:
+                    word_id = vocab[word] = len(words)
+                    words.append(word)
+                token_ids.append(word_id)
+            sent_offsets.append(len(token_ids))
+
+        header = cls.HEADER.pack(cls.MAGIC, int(tagged), len(token_ids),
+                                 len(sent_offsets)-1, len(words), len(tags))
+        output_file.write(header)
+        output_file.write(_int64_bytes(sent_offsets))
+        _write_int32(output_file, token_ids)
+        if tagged:
+            _write_int32(output_file, tag_ids)
+        output_file.write(_string_table_bytes(words))
+        output_file.write(_string_table_bytes(tags))
+
+class ConcatenatedColumnarView(AbstractLazySequence):
+    """
+    A view that joins together several ``ColumnarCorpusView`` objects.
+    Since the length of each piece is known, indexing takes
+    logarithmic time in the number of pieces.
+    """
+    def __init__(self, pieces):
+        self._pieces = pieces
+        self._offsets = [0]
+        for piece in pieces:
+            self._offsets.append(self._offsets[-1] + len(piece))
+
+    def __len__(self):
+        return self._offsets[-1]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop = slice_bounds(self, i)
+            return LazySubsequence(self, start, stop)
+        if i < 0: i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('index out of range')
+        piecenum = bisect.bisect_right(self._offsets, i)-1
+        return self._pieces[piecenum][i-self._offsets[piecenum]]
+
+    def iterate_from(self, start):
+        start = max(0, start)
+        piecenum = bisect.bisect_right(self._offsets, start)-1
+        for piecenum in range(piecenum, len(self._pieces)):
+            offset = self._offsets[piecenum]
+            for tok in self._pieces[piecenum].iterate_from(
+                    max(0, start-offset)):
+                yield tok
+
+######################################################################
+#{ Corpus Reader
+######################################################################
+
+class ColumnarCorpusReader(CorpusReader):
+    """
+    Reader for corpora stored in the columnar format, which are
+    usually created with ``build_columnar_corpus()``.  Files that were
+    built from a tagged corpus support ``tagged_words()`` and
+    ``tagged_sents()``; all files support ``words()`` and ``sents()``.
+    """
+    def __init__(self, root, fileids, tagset=None):
+        """
+        :param root: The root directory for this corpus.
+        :param fileids: A list or regexp specifying the fileids in this
+            corpus.
+        :param tagset: The name of the tagset used by this corpus.
+        """
+        CorpusReader.__init__(self, root, fileids, encoding=None,
+                              tagset=tagset)
+
+    def _views(self, fileids, tagged, group_by_sent, tagset=None):
+        if tagset and tagset != self._tagset:
+            tag_mapping_function = lambda t: map_tag(self._tagset, tagset, t)
+        else:
+            tag_mapping_function = None
+        views = [ColumnarCorpusView(path, tagged, group_by_sent,
+                                    tag_mapping_function)
+                 for path in self.abspaths(fileids)]
+        if len(views) == 1:
+            return views[0]
+        return ConcatenatedColumnarView(views)
+
+    def words(self, fileids=None):
+        """
+        :return: the given file(s) as a list of words
+            and punctuation symbols.
+        :rtype: list(str)
+        """
+        return self._views(fileids, False, False)
+
+    def sents(self, fileids=None):
+        """
+        :return: the given file(s) as a list of
+            sentences or utterances, each encoded as a list of word
+            strings.
+        :rtype: list(list(str))
+        """
+        return self._views(fileids, False, True)
+
+    def tagged_words(self, fileids=None, tagset=None):
+        """
+        :return: the given file(s) as a list of tagged
+            words and punctuation symbols, encoded as tuples
+            ``(word,tag)``.
+        :rtype: list(tuple(str,str))
+        """
+        return self._views(fileids, True, False, tagset)
+
+    def tagged_sents(self, fileids=None, tagset=None):
+        """
+        :return: the given file(s) as a list of
+            sentences, each encoded as a list of ``(word,tag)`` tuples.
+        :rtype: list(list(tuple(str,str)))
+        """
+        return self._views(fileids, True, True, tagset)
+
+def build_columnar_corpus(reader, root, fileids=None, tagged=None):
+    """
+    Convert the files of a corpus to the columnar format, and return a
+    ``ColumnarCorpusReader`` for the result.  Each file is written to
+    the path ``fileid`` under ``root``.
+
+    :param reader: The corpus reader to convert, such as a
+        ``TaggedCorpusReader`` or a ``PlaintextCorpusReader``.  Tagged
+        sentences are read with ``reader.tagged_sents()``, and untagged
+        sentences with ``reader.sents()``.
+    :param root: The directory where the columnar files are written.
+    :param fileids: The files to convert, or None for all files.
+    :param tagged: Whether to store tags.  By default, tags are stored
+        if the reader has a ``tagged_sents()`` method.
+    :rtype: ColumnarCorpusReader
+    """
+    if tagged is None:
+        tagged = hasattr(reader, 'tagged_sents')
+    if fileids is None:
+        fileids = reader.fileids()
+    elif isinstance(fileids, compat.string_types):
+        fileids = [fileids]
+
+    for fileid in fileids:
+        path = os.path.join(root, fileid)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        if tagged:
+            sents = reader.tagged_sents(fileid)
+        else:
+            sents = reader.sents(fileid)
+        ColumnarCorpusView.write(sents, path, tagged)
+
+    return ColumnarCorpusReader(root, fileids,
+                                tagset=getattr(reader, '_tagset', None))
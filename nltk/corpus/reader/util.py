@@ -9,6 +9,10 @@
 import os
 import bisect
 import re
+import struct
+import hashlib
+import functools
+import types
 import tempfile
 from functools import reduce
 try:
@@ -27,10 +31,154 @@ from nltk.data import PathPointer, FileSystemPathPointer, ZipFilePathPointer
 from nltk.data import SeekableUnicodeStreamReader
 from nltk.util import AbstractLazySequence, LazySubsequence, LazyConcatenation, py25
 
+######################################################################
+#{ Block Index Files
+######################################################################
+
+class _PackedOffsets(object):
+    """
+    A read-only sequence of 64-bit integers stored in a buffer, such as
+    the contents of a block index file.  It supports just enough of the
+    list interface for ``StreamBackedCorpusView``'s offset tables, at
+    8 bytes per entry.
+    """
+    def __init__(self, buf, offset, length):
+        self._buf = buf
+        self._offset = offset
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError('index out of range')
+        return struct.unpack_from('<q', self._buf, self._offset + 8*i)[0]
+
+class BlockIndexFile(object):
+    """
+    A file that stores the complete toknum/filepos mapping of a
+    ``StreamBackedCorpusView``, so that views created later -- in this
+    process or in any other -- can seek straight to the block that
+    contains any token, without first scanning the corpus file.
+
+    The file consists of a header followed by two arrays of 64-bit
+    integers (the token index and the file position of each block).
+    It is read into memory and closed straight away, so that a reader
+    with many indexed files does not hold one file descriptor per view.
+    The header records the size and modification time of the corpus
+    file, and an index whose header does not match the corpus file is
+    ignored.
+    """
+    MAGIC = b'NLTKIDX1'
+    HEADER = struct.Struct('<8s20sdqqq')
+
+    @classmethod
+    def write(cls, path, key, stat, startpos, toknum, filepos):
+        """
+        Write an index file atomically.  Errors (such as an unwritable
+        directory) are ignored, since the index is only an optimization.
+        """
+        assert len(toknum) == len(filepos)
+        header = cls.HEADER.pack(cls.MAGIC, key, stat.st_mtime,
+                                 stat.st_size, startpos, len(toknum))
+        body = struct.pack('<%dq' % len(toknum), *toknum)
+        body += struct.pack('<%dq' % len(filepos), *filepos)
+        try:
+            dirname = os.path.dirname(path)
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            fd, tmp = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as out:
+                out.write(header)
+                out.write(body)
+            try:
+                os.rename(tmp, path)
+            except OSError:
+                # Windows won't rename over an existing file.
+                os.remove(tmp)
+        except (IOError, OSError):
+            pass
+
+    @classmethod
+    def read(cls, path, key, stat, startpos):
+        """
+        Read an index file, and return its ``(toknum, filepos)`` tables;
+        or return None if the file does not exist or does not match the
+        given key, corpus file status and start position.
+        """
+        try:
+            with open(path, 'rb') as fp:
+                buf = fp.read()
+        except (IOError, OSError):
+            return None
+        if len(buf) < cls.HEADER.size:
+            return None
+        (magic, file_key, mtime, size, file_startpos,
+         length) = cls.HEADER.unpack_from(buf, 0)
+        if (magic != cls.MAGIC or file_key != key or mtime != stat.st_mtime
+            or size != stat.st_size or file_startpos != startpos or
+            len(buf) != cls.HEADER.size + 16*length):
+            return None
+        return (_PackedOffsets(buf, cls.HEADER.size, length),
+                _PackedOffsets(buf, cls.HEADER.size + 8*length, length))
+
 ######################################################################
 #{ Corpus View
 ######################################################################
 
+def _describe_setting(value, seen, depth=0):
+    """
+    Return a string that describes ``value`` independently of the
+    running process, for use in a block index key; or None if
+    ``value`` can not be described that way.
+    """
+    if value is None or isinstance(value, (bool, int, float, string_types,
+                                           bytes)):
+        return repr(value)
+    if depth > 8 or id(value) in seen:
+        return None
+    seen = seen | set([id(value)])
+    if isinstance(value, (list, tuple)):
+        parts = [_describe_setting(v, seen, depth+1) for v in value]
+    elif isinstance(value, (set, frozenset)):
+        parts = sorted(_describe_setting(v, seen, depth+1) or '\0'
+                       for v in value)
+    elif isinstance(value, dict):
+        parts = sorted('%s:%s' % (_describe_setting(k, seen, depth+1) or '\0',
+                                  _describe_setting(v, seen, depth+1) or '\0')
+                       for (k, v) in value.items())
+    elif isinstance(value, type(re.compile(''))):
+        parts = [repr(value.pattern), repr(value.flags)]
+    elif isinstance(value, functools.partial):
+        parts = [_describe_setting(value.func, seen, depth+1),
+                 _describe_setting(value.args, seen, depth+1),
+                 _describe_setting(value.keywords or {}, seen, depth+1)]
+    elif isinstance(value, type):
+        parts = [value.__module__, value.__name__]
+    elif isinstance(value, (types.MethodType, types.BuiltinFunctionType)):
+        owner = value.__self__
+        parts = [value.__name__,
+                 owner.__name__ if isinstance(owner, types.ModuleType)
+                 else _describe_setting(owner, seen, depth+1)]
+    elif isinstance(value, types.FunctionType):
+        # Lambdas are told apart by their line number.
+        parts = [value.__module__, value.__name__,
+                 repr(value.__code__.co_firstlineno)]
+    elif getattr(value, '__dict__', None):
+        # Look at the instance dictionary only: attribute lookups could
+        # have side effects, such as loading a LazyLoader's resource.
+        parts = ['%s.%s' % (type(value).__module__, type(value).__name__),
+                 _describe_setting(vars(value), seen, depth+1)]
+    else:
+        return None
+    if None in parts or any('\0' in part for part in parts):
+        return None
+    return '%s(%s)' % (type(value).__name__, ','.join(parts))
+
+
 class StreamBackedCorpusView(AbstractLazySequence):
     """
     A 'view' of a corpus file, which acts like a sequence of tokens:
@@ -99,6 +247,28 @@ class StreamBackedCorpusView(AbstractLazySequence):
         relative offsets, or with offsets based on string lengths, may
         lead to incorrect behavior.
 
+    The toknum/filepos mapping can be saved to a ``BlockIndexFile``
+    once it is complete, i.e. once the view has been read to the end
+    of its file (calling ``len()`` on the view is enough).  Views of
+    the same file that are created later -- including views in other
+    processes -- load the saved index, and can then jump to any
+    token without scanning the file.  Saving is enabled by setting
+    ``StreamBackedCorpusView.index_dir`` to a cache directory, or by
+    setting ``StreamBackedCorpusView.index_sidecar`` to save each index
+    next to its corpus file:
+
+        >>> from nltk.corpus.reader.util import StreamBackedCorpusView
+        >>> StreamBackedCorpusView.index_dir = '/var/cache/nltk' # doctest: +SKIP
+
+    An index is identified by the corpus file's path, the view's start
+    position and encoding, the name of its block reader, and the
+    settings that subclasses store on the view (such as the flags and
+    tokenizers of a ``TaggedCorpusView``); it is ignored if the corpus
+    file's size or modification time has changed since it was written.
+    Views with a setting that cannot be described independently of the
+    running process (such as an arbitrary object without attributes)
+    are not indexed.
+
     :ivar _block_reader: The function used to read
         a single block from the underlying file stream.
     :ivar _toknum: A list containing the token index of each block
@@ -122,7 +292,17 @@ class StreamBackedCorpusView(AbstractLazySequence):
        start_toknum is the token index of the first token in the block;
        end_toknum is the token index of the first token not in the
        block; and tokens is a list of the tokens in the block.
+    :ivar _index_path: The path of the block index file for this view,
+       or None if block indexes are disabled or the view's file is not
+       a plain file.
     """
+    index_dir = None
+    """The directory in which block index files are saved, or None."""
+
+    index_sidecar = False
+    """If true, block index files are saved next to their corpus files,
+       rather than in ``index_dir``."""
+
     def __init__(self, fileid, block_reader=None, startpos=0,
                  encoding='utf8'):
         """
@@ -183,6 +363,80 @@ class StreamBackedCorpusView(AbstractLazySequence):
         # increase efficiency of random access.
         self._cache = (-1, -1, None)
 
+        # Use a saved block index, if there is one.
+        self._index_path = None
+        if self.index_sidecar or self.index_dir is not None:
+            self._open_index()
+
+    def _index_key(self):
+        """
+        Return a sha1 hash that identifies the file, start position,
+        encoding, block reader and settings of this view, or None if
+        the view's settings cannot be described.
+        """
+        reader = self.read_block
+        owner = getattr(reader, '__self__', None)
+        name = '%s.%s.%s' % (getattr(reader, '__module__', ''),
+                             type(owner).__name__ if owner is not None else '',
+                             getattr(reader, '__name__', ''))
+        settings = dict((attr, value) for (attr, value) in vars(self).items()
+                        if attr not in self._BASE_ATTRIBUTES)
+        if owner is not self:
+            # The block reader is a function, or a method of some
+            # other object, whose settings matter too.
+            settings['read_block'] = reader
+        settings = _describe_setting(settings, set())
+        if settings is None:
+            return None
+        key = '\0'.join([os.path.abspath(self._path), name, settings,
+                         '%s' % self._encoding, '%d' % self._filepos[0]])
+        return hashlib.sha1(key.encode('utf8'))
+
+    _BASE_ATTRIBUTES = frozenset([
+        '_toknum', '_filepos', '_encoding', '_len', '_fileid', '_stream',
+        '_current_toknum', '_current_blocknum', '_eofpos', '_cache',
+        '_index_path', '_index_stat', '_path', 'read_block'])
+    """The attributes of ``StreamBackedCorpusView`` itself, which are
+       not part of the settings that identify a view's block index."""
+
+    def _index_location(self, key):
+        if self.index_sidecar:
+            return '%s.%s.idx' % (self._path, key.hexdigest()[:12])
+        return os.path.join(self.index_dir, key.hexdigest() + '.idx')
+
+    def _open_index(self):
+        """
+        Set ``_index_path``, and load the toknum/filepos mapping from
+        the index file if it is up to date.
+        """
+        if isinstance(self._fileid, FileSystemPathPointer):
+            self._path = self._fileid.path
+        elif isinstance(self._fileid, string_types):
+            self._path = self._fileid
+        else:
+            return
+        key = self._index_key()
+        if key is None:
+            return
+        self._index_path = self._index_location(key)
+        self._index_stat = os.stat(self._path)
+        tables = BlockIndexFile.read(self._index_path, key.digest(),
+                                     self._index_stat, self._filepos[0])
+        if tables is not None:
+            self._toknum, self._filepos = tables
+            self._len = self._toknum[-1]
+            self._index_path = None # Already saved.
+
+    def _save_index(self):
+        # Subclasses may change their settings after the base
+        # constructor has run, so the key is computed again here.
+        key = self._index_key()
+        if key is not None:
+            BlockIndexFile.write(self._index_location(key), key.digest(),
+                                 self._index_stat, self._filepos[0],
+                                 self._toknum, self._filepos)
+        self._index_path = None
+
     fileid = property(lambda self: self._fileid, doc="""
         The fileid of the file that is accessed by this view.
 
@@ -316,9 +570,12 @@ class StreamBackedCorpusView(AbstractLazySequence):
                     assert toknum+num_toks == self._toknum[block_index], (
                         'inconsistent block reader (num tokens returned)')
 
-            # If we reached the end of the file, then update self._len
+            # If we reached the end of the file, then update self._len,
+            # and save the (now complete) mapping if requested.
             if new_filepos == self._eofpos:
                 self._len = toknum + num_toks
+                if self._index_path is not None:
+                    self._save_index()
             # Generate the tokens in this block (but skip any tokens
             # before start_tok).  Note that between yields, our state
             # may be modified.
@@ -119,6 +119,12 @@ class XMLCorpusView(StreamBackedCorpusView):
     #: The number of characters read at a time by this corpus reader.
     _BLOCK_SIZE = 1024
 
+    #: Block index files are never used, since each block can only be
+    #: read with the XML context that ``_tag_context`` recorded for it
+    #: while the file was being scanned.
+    index_dir = None
+    index_sidecar = False
+
     def __init__(self, fileid, tagspec, elt_handler=None):
         """
         Create a new corpus view based on a specified XML file.
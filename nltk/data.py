@@ -40,6 +40,9 @@ import textwrap
 import re
 import zipfile
 import codecs
+import time
+import threading
+from collections import OrderedDict
 
 from gzip import GzipFile, READ as GZ_READ, WRITE as GZ_WRITE
 
@@ -528,11 +531,194 @@ class ZipFilePathPointer(PathPointer):
 # Access Functions
 ######################################################################
 
+def _pickled_size(value):
+    """
+    Estimate the memory used by a resource, as the size of its pickle.
+    """
+    try:
+        return len(pickle.dumps(value, -1))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class ResourceCache(object):
+    """
+    A cache of loaded resources, used by ``load()`` so that resources
+    won't need to be loaded more than once.  By default the cache is
+    unbounded; but it can be given a budget, as a maximum number of
+    entries and/or a maximum total size in bytes.  When a budget is
+    exceeded, the least recently used resources are evicted from the
+    cache.  Pinned resources are never evicted.
+
+    The cache also keeps counters of hits, misses, evictions and the
+    time spent loading resources, which are returned by ``stats()``.
+
+    The cache is keyed by ``(resource_url, format)`` pairs.  Normally
+    it is accessed through the module-level functions
+    ``cache_policy()``, ``cache_stats()``, ``pin()``, ``unpin()`` and
+    ``clear_cache()``.
+    """
+    def __init__(self, max_entries=None, max_bytes=None, sizeof=None):
+        """
+        :param max_entries: The maximum number of cached resources, or
+            None for no limit.
+        :param max_bytes: The maximum total size of the cached
+            resources, or None for no limit.
+        :param sizeof: A function that estimates the size of a resource
+            in bytes.  By default, the size of its pickle is used.  It
+            is only called if ``max_bytes`` is set.
+        """
+        self._entries = OrderedDict()
+        """A dictionary mapping each key to a ``(value, size)`` pair,
+           ordered from least to most recently used."""
+        self._pinned = set()
+        self._lock = threading.RLock()
+        self._sizeof = sizeof or _pickled_size
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self.reset_stats()
+
+    def configure(self, max_entries=None, max_bytes=None, sizeof=None):
+        """
+        Change the budget of this cache, evicting resources if they
+        no longer fit.
+        """
+        with self._lock:
+            self._max_entries = max_entries
+            self._max_bytes = max_bytes
+            if sizeof is not None:
+                self._sizeof = sizeof
+            if max_bytes is not None:
+                # Sizes are only computed when there is a byte budget.
+                for key, (value, size) in list(self._entries.items()):
+                    if size is None:
+                        size = self._sizeof(value)
+                        self._entries[key] = (value, size)
+                        self._bytes += size
+            self._evict()
+
+    def reset_stats(self):
+        """Reset the hit, miss, eviction and load time counters."""
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
+            self._loads = 0
+            self._load_time = 0.0
+
+    def get(self, key, default=None):
+        """
+        Return the cached value for ``key``, marking it as the most
+        recently used resource; or ``default`` if it is not cached.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self._misses += 1
+                return default
+            self._entries[key] = entry
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key, value, load_time=0.0):
+        """
+        Add a resource to the cache, and evict the least recently used
+        resources if the budget is exceeded.  A resource that does not
+        fit in the budget on its own is not cached, unless it is pinned.
+
+        :param load_time: The time taken to load the resource, in
+            seconds, which is added to the load time counter.
+        """
+        with self._lock:
+            self._loads += 1
+            self._load_time += load_time
+            self.discard(key)
+            size = None
+            if self._max_bytes is not None:
+                size = self._sizeof(value)
+                if size > self._max_bytes and key not in self._pinned:
+                    return
+                self._bytes += size
+            self._entries[key] = (value, size)
+            self._evict()
+
+    def discard(self, key):
+        """Remove a resource from the cache, if it is cached."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None and entry[1] is not None:
+                self._bytes -= entry[1]
+
+    def pin(self, key):
+        """
+        Protect a resource from eviction.  The resource need not be
+        cached yet; once it is loaded, it will stay in the cache.
+        """
+        with self._lock:
+            self._pinned.add(key)
+
+    def unpin(self, key):
+        """Allow a pinned resource to be evicted again."""
+        with self._lock:
+            self._pinned.discard(key)
+            self._evict()
+
+    def clear(self):
+        """Remove all resources, including pinned ones, from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _evict(self):
+        # Remove unpinned resources, least recently used first, until
+        # the cache fits in its budget.
+        for key in list(self._entries):
+            if self._fits():
+                break
+            if key not in self._pinned:
+                self.discard(key)
+                self._evictions += 1
+
+    def _fits(self):
+        return ((self._max_entries is None or
+                 len(self._entries) <= self._max_entries) and
+                (self._max_bytes is None or self._bytes <= self._max_bytes))
+
+    def stats(self):
+        """
+        Return a dictionary with the cache's counters: the number of
+        ``hits``, ``misses``, ``evictions`` and ``loads``, the total
+        ``load_time`` in seconds, the number of cached ``entries``, the
+        number of ``pinned`` keys, and the estimated total size of the
+        cached resources in ``bytes`` (None if there is no byte budget).
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'loads': self._loads,
+                'load_time': self._load_time,
+                'entries': len(self._entries),
+                'pinned': len(self._pinned),
+                'bytes': self._bytes if self._max_bytes is not None else None,
+                'max_entries': self._max_entries,
+                'max_bytes': self._max_bytes,
+            }
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '<ResourceCache with %d entries>' % len(self._entries)
+
 # Don't use a weak dictionary, because in the common case this
 # causes a lot more reloading that necessary.
-_resource_cache = {}
-"""A dictionary used to cache resources so that they won't
-   need to be loaded more than once."""
+_resource_cache = ResourceCache()
+"""The cache used by ``load()`` so that resources won't need to be
+   loaded more than once."""
 
 
 def find(resource_name, paths=None):
@@ -689,6 +875,8 @@ FORMATS = {
             "nltk.sem.logic.LogicParser.  Requires an additional logic_parser "
             "parameter",
     'val': "A semantic valuation, parsed by nltk.sem.Valuation.fromstring.",
+    'punkt': "A Punkt sentence tokenizer, whose parameters are stored in "
+             "the compact binary format of nltk.tokenize.punkt.",
     'raw': "The raw (byte string) contents of a file.",
     'text': "The raw (unicode string) contents of a file. "
 }
@@ -706,6 +894,7 @@ AUTO_FORMATS = {
     'fol': 'fol',
     'logic': 'logic',
     'val': 'val',
+    'punkt': 'punkt',
     'txt': 'text',
     'text': 'text',
 }
@@ -726,6 +915,7 @@ def load(resource_url, format='auto', cache=True, verbose=False,
       - ``fol`` (formulas of First Order Logic)
       - ``logic`` (Logical formulas to be parsed by the given logic_parser)
       - ``val`` (valuation of First Order Logic model)
+      - ``punkt`` (a Punkt sentence tokenizer with compact parameters)
       - ``text`` (the file contents as a unicode string)
       - ``raw`` (the raw file contents as a byte string)
 
@@ -733,7 +923,8 @@ def load(resource_url, format='auto', cache=True, verbose=False,
     format based on the resource name's file extension.  If that
     fails, ``load()`` will raise a ``ValueError`` exception.
 
-    For all text formats (everything except ``pickle``, ``json``, ``yaml`` and ``raw``),
+    For all text formats (everything except ``pickle``, ``json``, ``yaml``,
+    ``punkt`` and ``raw``),
     it tries to decode the raw contents using UTF-8, and if that doesn't
     work, it tries with ISO-8859-1 (Latin-1), unless the ``encoding``
     is specified.
@@ -745,9 +936,9 @@ def load(resource_url, format='auto', cache=True, verbose=False,
     :type cache: bool
     :param cache: If true, add this resource to a cache.  If load()
         finds a resource in its cache, then it will return it from the
-        cache rather than loading it.  The cache uses weak references,
-        so a resource wil automatically be expunged from the cache
-        when no more objects are using it.
+        cache rather than loading it.  By default the cache is
+        unbounded; use ``cache_policy()`` to limit its size, in which
+        case the least recently used resources are evicted first.
     :type verbose: bool
     :param verbose: If true, print a message when loading a resource.
         Messages are not displayed when a resource is retrieved from
@@ -761,24 +952,7 @@ def load(resource_url, format='auto', cache=True, verbose=False,
     :type encoding: str
     :param encoding: the encoding of the input; only used for text formats.
     """
-    resource_url = normalize_resource_url(resource_url)
-    resource_url = add_py3_data(resource_url)
-
-    # Determine the format of the resource.
-    if format == 'auto':
-        resource_url_parts = resource_url.split('.')
-        ext = resource_url_parts[-1]
-        if ext == 'gz':
-            ext = resource_url_parts[-2]
-        format = AUTO_FORMATS.get(ext)
-        if format is None:
-            raise ValueError('Could not determine format for %s based '
-                             'on its file\nextension; use the "format" '
-                             'argument to specify the format explicitly.'
-                             % resource_url)
-
-    if format not in FORMATS:
-        raise ValueError('Unknown format type: %s!' % (format,))
+    resource_url, format = _resource_key(resource_url, format)
 
     # If we've cached the resource, then just return it.
     if cache:
@@ -791,6 +965,7 @@ def load(resource_url, format='auto', cache=True, verbose=False,
     # Let the user know what's going on.
     if verbose:
         print('<<Loading %s>>' % (resource_url,))
+    start_time = time.time()
 
     # Load the resource.
     opened_resource = _open(resource_url)
@@ -811,6 +986,11 @@ def load(resource_url, format='auto', cache=True, verbose=False,
     elif format == 'yaml':
         import yaml
         resource_val = yaml.load(opened_resource)
+    elif format == 'punkt':
+        from nltk.tokenize.punkt import (PunktSentenceTokenizer,
+                                         CompactPunktParameters)
+        resource_val = PunktSentenceTokenizer(
+            CompactPunktParameters.open(opened_resource))
     else:
         # The resource is a text format.
         binary_data = opened_resource.read()
@@ -851,18 +1031,39 @@ def load(resource_url, format='auto', cache=True, verbose=False,
 
     # If requested, add it to the cache.
     if cache:
-        try:
-            _resource_cache[(resource_url, format)] = resource_val
-            # TODO: add this line
-            # print('<<Caching a copy of %s>>' % (resource_url,))
-        except TypeError:
-            # We can't create weak references to some object types, like
-            # strings and tuples.  For now, just don't cache them.
-            pass
+        _resource_cache.put((resource_url, format), resource_val,
+                            time.time() - start_time)
 
     return resource_val
 
 
+def _resource_key(resource_url, format='auto'):
+    """
+    Return the normalized ``(resource_url, format)`` pair that is used
+    to identify a resource in the cache.
+    """
+    resource_url = normalize_resource_url(resource_url)
+    resource_url = add_py3_data(resource_url)
+
+    # Determine the format of the resource.
+    if format == 'auto':
+        resource_url_parts = resource_url.split('.')
+        ext = resource_url_parts[-1]
+        if ext == 'gz':
+            ext = resource_url_parts[-2]
+        format = AUTO_FORMATS.get(ext)
+        if format is None:
+            raise ValueError('Could not determine format for %s based '
+                             'on its file\nextension; use the "format" '
+                             'argument to specify the format explicitly.'
+                             % resource_url)
+
+    if format not in FORMATS:
+        raise ValueError('Unknown format type: %s!' % (format,))
+
+    return resource_url, format
+
+
 def show_cfg(resource_url, escape='##'):
     """
     Write out a grammar file, ignoring escaped and empty lines.
@@ -893,6 +1094,50 @@ def clear_cache():
     _resource_cache.clear()
 
 
+def cache_policy(max_entries=None, max_bytes=None, sizeof=None):
+    """
+    Set the budget of the resource cache.  When the budget is exceeded,
+    the least recently used resources that are not pinned are evicted.
+
+    :param max_entries: The maximum number of cached resources, or None
+        for no limit.
+    :param max_bytes: The maximum total size of the cached resources, in
+        bytes, or None for no limit.
+    :param sizeof: A function used to estimate the size of a resource.
+        By default, the size of the resource's pickle is used.
+    :see: load()
+    """
+    _resource_cache.configure(max_entries, max_bytes, sizeof)
+
+
+def cache_stats():
+    """
+    Return a dictionary of statistics about the resource cache,
+    including the number of hits, misses and evictions and the total
+    time spent loading resources.
+    :see: ResourceCache.stats()
+    """
+    return _resource_cache.stats()
+
+
+def pin(resource_url, format='auto'):
+    """
+    Keep the given resource in the resource cache, even if it is the
+    least recently used resource when the cache's budget is exceeded.
+    The resource does not need to be loaded yet.
+    :see: load()
+    """
+    _resource_cache.pin(_resource_key(resource_url, format))
+
+
+def unpin(resource_url, format='auto'):
+    """
+    Allow the given resource to be evicted from the resource cache.
+    :see: pin()
+    """
+    _resource_cache.unpin(_resource_key(resource_url, format))
+
+
 def _open(resource_url):
     """
     Helper function that returns an open file object for a resource,
@@ -1436,5 +1681,6 @@ class SeekableUnicodeStreamReader(object):
 __all__ = ['path', 'PathPointer', 'FileSystemPathPointer', 'BufferedGzipFile',
            'GzipFileSystemPathPointer', 'GzipFileSystemPathPointer',
            'find', 'retrieve', 'FORMATS', 'AUTO_FORMATS', 'load',
-           'show_cfg', 'clear_cache', 'LazyLoader', 'OpenOnDemandZipFile',
+           'show_cfg', 'clear_cache', 'cache_policy', 'cache_stats', 'pin',
+           'unpin', 'ResourceCache', 'LazyLoader', 'OpenOnDemandZipFile',
            'GzipFileSystemPathPointer', 'SeekableUnicodeStreamReader']
@@ -162,6 +162,11 @@ default: unzip or not?
 import time, os, zipfile, sys, textwrap, threading, itertools
 from hashlib import md5
 
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
 try:
     TKINTER = True
     from tkinter import (Tk, Frame, Label, Entry, Button, Canvas, Menu, IntVar,
@@ -518,7 +523,8 @@ class Downloader(object):
     # downloader in the gui can just kill the download thread anytime
     # it wants.
 
-    def incr_download(self, info_or_id, download_dir=None, force=False):
+    def incr_download(self, info_or_id, download_dir=None, force=False,
+                      workers=1):
         # If they didn't specify a download_dir, then use the default one.
         if download_dir is None:
             download_dir = self._download_dir
@@ -526,7 +532,8 @@ class Downloader(object):
 
         # If they gave us a list of ids, then download each one.
         if isinstance(info_or_id, (list,tuple)):
-            for msg in self._download_list(info_or_id, download_dir, force):
+            for msg in self._download_list(info_or_id, download_dir, force,
+                                           workers):
                 yield msg
             return
 
@@ -540,7 +547,8 @@ class Downloader(object):
         # Handle collections.
         if isinstance(info, Collection):
             yield StartCollectionMessage(info)
-            for msg in self.incr_download(info.children, download_dir, force):
+            for msg in self.incr_download(info.children, download_dir, force,
+                                          workers):
                 yield msg
             yield FinishCollectionMessage(info)
 
@@ -553,7 +561,7 @@ class Downloader(object):
         if isinstance(item, Package): return 1
         else: return len(item.packages)
 
-    def _download_list(self, items, download_dir, force):
+    def _download_list(self, items, download_dir, force, workers=1):
         # Look up the requested items.
         for i in range(len(items)):
             try: items[i] = self._info_or_id(items[i])
@@ -561,6 +569,20 @@ class Downloader(object):
                 yield ErrorMessage(items[i], e)
                 return
 
+        # Download all the packages concurrently, if requested.
+        if workers > 1:
+            packages = {}
+            for item in items:
+                if isinstance(item, Package):
+                    packages[item.id] = item
+                else:
+                    packages.update((pkg.id, pkg) for pkg in item.packages)
+            packages = sorted(packages.values())
+            for msg in self._download_concurrent(packages, download_dir,
+                                                 force, workers):
+                yield msg
+            return
+
         # Download each item, re-scaling their progress.
         num_packages = sum(self._num_packages(item) for item in items)
         progress = 0
@@ -577,6 +599,64 @@ class Downloader(object):
 
             progress += 100*delta
 
+    def _download_concurrent(self, packages, download_dir, force, workers):
+        """
+        Download the given packages using a pool of ``workers`` threads.
+        The messages generated by the threads are yielded as they
+        arrive, and progress is reported for all packages together.
+        If this generator is closed before it is exhausted, then the
+        threads stop after their current block, and any partially
+        downloaded files are kept so that they can be resumed.
+        """
+        if not packages:
+            return
+        package_queue = queue.Queue()
+        for info in packages:
+            package_queue.put(info)
+        msg_queue = queue.Queue()
+        abort = threading.Event()
+        progress = dict((info.id, 0) for info in packages)
+
+        def download_worker():
+            while not abort.is_set():
+                try: info = package_queue.get_nowait()
+                except queue.Empty: break
+                messages = self._download_package(info, download_dir, force)
+                try:
+                    for msg in messages:
+                        msg_queue.put((info, msg))
+                        if abort.is_set(): break
+                except Exception as e:
+                    msg_queue.put((info, ErrorMessage(
+                        info, 'Error installing %r: %s' % (info.id, e))))
+                finally:
+                    messages.close()
+            msg_queue.put(None)
+
+        threads = [threading.Thread(target=download_worker)
+                   for i in range(min(workers, len(packages)))]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        try:
+            running = len(threads)
+            while running:
+                item = msg_queue.get()
+                if item is None:
+                    running -= 1
+                    continue
+                info, msg = item
+                if isinstance(msg, ProgressMessage):
+                    progress[info.id] = msg.progress
+                    yield ProgressMessage(sum(progress.values())/len(progress))
+                else:
+                    yield msg
+        finally:
+            abort.set()
+            for thread in threads:
+                thread.join()
+
     def _download_package(self, info, download_dir, force):
         yield StartPackageMessage(info)
         yield ProgressMessage(0)
@@ -599,28 +679,21 @@ class Downloader(object):
                 yield StaleMessage(info)
             os.remove(filepath)
 
-        # Ensure the download_dir exists
-        if not os.path.exists(download_dir):
-            os.mkdir(download_dir)
-        if not os.path.exists(os.path.join(download_dir, info.subdir)):
-            os.mkdir(os.path.join(download_dir, info.subdir))
+        # Ensure the download_dir exists.  (Another download thread
+        # may create it at the same time.)
+        for dirname in (download_dir, os.path.join(download_dir, info.subdir)):
+            if not os.path.exists(dirname):
+                try: os.mkdir(dirname)
+                except OSError:
+                    if not os.path.isdir(dirname): raise
 
         # Download the file.  This will raise an IOError if the url
-        # is not found.
+        # is not found, or if the file does not match its checksum.
         yield StartDownloadMessage(info)
         yield ProgressMessage(5)
         try:
-            infile = compat.urlopen(info.url)
-            with open(filepath, 'wb') as outfile:
-                #print info.size
-                num_blocks = max(1, info.size/(1024*16))
-                for block in itertools.count():
-                    s = infile.read(1024*16) # 16k blocks.
-                    outfile.write(s)
-                    if not s: break
-                    if block % 2 == 0: # how often?
-                        yield ProgressMessage(min(80, 5+75*(block/num_blocks)))
-            infile.close()
+            for msg in self._download_file(info, filepath):
+                yield msg
         except IOError as e:
             yield ErrorMessage(info, 'Error downloading %r from <%s>:'
                                '\n  %s' % (info.id, info.url, e))
@@ -643,9 +716,85 @@ class Downloader(object):
 
         yield FinishPackageMessage(info)
 
+    def _download_file(self, info, filepath):
+        """
+        Download a package's file to ``filepath``, and yield progress
+        messages.  The data is written to ``filepath + '.part'``, and
+        its size and MD5 checksum are checked against the index while
+        it streams in; the file is only renamed to ``filepath`` if
+        they match.  If a ``.part`` file was left by an interrupted
+        download, then the download is resumed with an HTTP range
+        request; if the resumed file turns out to be corrupt, it is
+        downloaded again from scratch.
+
+        :raise IOError: If the file can not be downloaded, or if it
+            does not match the index.
+        """
+        partpath = filepath + '.part'
+        for attempt in range(2):
+            offset = 0
+            if os.path.exists(partpath):
+                offset = os.path.getsize(partpath)
+                if offset >= info.size:
+                    os.remove(partpath)
+                    offset = 0
+
+            # Checksum whatever we already have.
+            md5_digest = md5()
+            if offset:
+                with open(partpath, 'rb') as infile:
+                    for block in iter(lambda: infile.read(1024*16), b''):
+                        md5_digest.update(block)
+
+            request = compat.Request(info.url)
+            if offset:
+                request.add_header('Range', 'bytes=%d-' % offset)
+            infile = compat.urlopen(request)
+            try:
+                if offset and infile.getcode() != 206:
+                    # The server ignored the range; start over.
+                    offset = 0
+                    md5_digest = md5()
+                size = offset
+                num_blocks = max(1, info.size/(1024*16))
+                with open(partpath, 'ab' if offset else 'wb') as outfile:
+                    for block in itertools.count():
+                        s = infile.read(1024*16) # 16k blocks.
+                        if not s: break
+                        md5_digest.update(s)
+                        outfile.write(s)
+                        size += len(s)
+                        if size > info.size: break
+                        if block % 2 == 0: # how often?
+                            yield ProgressMessage(
+                                min(80, 5+75*(size/(1024*16)/num_blocks)))
+            finally:
+                infile.close()
+
+            if size == info.size and md5_digest.hexdigest() == info.checksum:
+                if os.path.exists(filepath):
+                    os.remove(filepath)
+                os.rename(partpath, filepath)
+                return
+            os.remove(partpath)
+            # Only a resumed download is worth retrying.
+            if not offset:
+                break
+
+        raise IOError('Downloaded file does not match the size and '
+                      'checksum in the index')
+
     def download(self, info_or_id=None, download_dir=None, quiet=False,
                  force=False, prefix='[nltk_data] ', halt_on_error=True,
-                 raise_on_error=False):
+                 raise_on_error=False, workers=1):
+        """
+        Download and install the given package or collection, or list
+        of packages and collections.
+
+        :param workers: The number of packages to download at the same
+            time, each in its own thread.  Concurrent downloads are
+            mainly useful for collections with many packages.
+        """
         # If no info or id is given, then use the interactive shell.
         if info_or_id is None:
             # [xx] hmm -- changing self._download_dir here seems like
@@ -661,7 +810,8 @@ class Downloader(object):
                 print(textwrap.fill(s, initial_indent=prefix+prefix2,
                                     subsequent_indent=prefix+prefix2+' '*4))
 
-            for msg in self.incr_download(info_or_id, download_dir, force):
+            for msg in self.incr_download(info_or_id, download_dir, force,
+                                          workers):
                 # Error messages
                 if isinstance(msg, ErrorMessage):
                     show(msg.message)
@@ -16,6 +16,10 @@
 """
 from __future__ import print_function
 
+import sys
+import types
+import importlib
+
 ### Constants
 
 _debug = 0
@@ -140,3 +144,113 @@ class LazyModule:
 
     def __repr__(self):
         return "<LazyModule '%s'>" % self.__name__
+
+
+### Lazy package namespaces
+
+def star_exports(module):
+    """ Return the names that ``from module import *`` would import.
+    """
+    names = getattr(module, '__all__', None)
+    if names is None:
+        names = [name for name in module.__dict__ if not name.startswith('_')]
+    return list(names)
+
+def export_table(module_names):
+    """ Return a dictionary mapping each name that would be imported by
+        ``from module import *`` for each of the given modules (in order)
+        to the module it would be imported from.  Names that are bound
+        to modules outside the importing package, and __future__
+        features, are skipped.
+
+        This is used to build the table passed to lazy_package().
+    """
+    # Import everything first, since importing a module can add names
+    # (e.g. submodules) to modules that were imported earlier.
+    modules = [importlib.import_module(module_name)
+               for module_name in module_names]
+    table = {}
+    for module_name, module in zip(module_names, modules):
+        package = module_name.split('.')[0]
+        for name in star_exports(module):
+            value = getattr(module, name)
+            if (isinstance(value, types.ModuleType) and
+                not value.__name__.startswith(package + '.')):
+                continue
+            if type(value).__module__ == '__future__':
+                continue
+            table[name] = module_name
+    return table
+
+class LazyPackage(types.ModuleType):
+
+    """ A package module whose submodules and re-exported names are
+        imported on first attribute access.
+
+        The names are described by two attributes of the package:
+        __lazy_submodules__, a collection of submodule names, and
+        __lazy_exports__, a dictionary mapping names to the module
+        they are imported from.  Once loaded, a name is stored in the
+        package's namespace, so it is only looked up once.
+
+        Use lazy_package() to turn an existing package into a
+        LazyPackage.
+    """
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return _load_lazy_name(self, name)
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(self.__lazy_submodules__) |
+                      set(self.__lazy_exports__))
+
+def _load_lazy_name(package, name):
+
+    """ Import a lazily loaded name, and store it in package.
+    """
+    if name in package.__lazy_submodules__:
+        value = importlib.import_module(package.__name__ + '.' + name)
+    elif name in package.__lazy_exports__:
+        if _debug:
+            print('LazyPackage: Loading %r from %r' %
+                  (name, package.__lazy_exports__[name]))
+        module = importlib.import_module(package.__lazy_exports__[name])
+        value = getattr(module, name)
+    else:
+        raise AttributeError("module %r has no attribute %r" %
+                             (package.__name__, name))
+    setattr(package, name, value)
+    return value
+
+def lazy_package(name, submodules, exports):
+    """ Make the package called name load the given submodules and
+        exported names on first access.  exports is a dictionary
+        mapping names to the modules they are imported from.
+
+        Names that are already defined in the package are left alone.
+        The package's __all__ is set to all of its public names, so
+        ``from package import *`` still imports everything.
+
+        On Python versions that do not allow a module's class to be
+        changed (before 3.5), everything is imported immediately.
+    """
+    package = sys.modules[name]
+    package.__lazy_submodules__ = frozenset(
+        sub for sub in submodules if sub not in package.__dict__)
+    package.__lazy_exports__ = dict(
+        (key, value) for (key, value) in exports.items()
+        if key not in package.__dict__)
+    package.__all__ = sorted(
+        key for key in (set(package.__dict__) | package.__lazy_submodules__ |
+                        set(package.__lazy_exports__))
+        if not key.startswith('_'))
+    try:
+        package.__class__ = LazyPackage
+    except TypeError:
+        for key in package.__lazy_submodules__:
+            _load_lazy_name(package, key)
+        for key in package.__lazy_exports__:
+            if key not in package.__lazy_submodules__:
+                _load_lazy_name(package, key)
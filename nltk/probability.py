@@ -43,6 +43,9 @@ import math
 import random
 import warnings
 import array
+import heapq
+import itertools
+from bisect import bisect_left
 from operator import itemgetter
 from collections import defaultdict
 from functools import reduce
@@ -53,6 +56,16 @@ from nltk.internals import raise_unorderable_types
 
 _NINF = float('-1e300')
 
+def _import_numpy():
+    # numpy is only imported by the batch methods (such as prob_many()),
+    # since this module is imported by every tokenizer.
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('The batch probability methods, such as '
+                          'prob_many(), require numpy to be installed.')
+    return numpy
+
 ##//////////////////////////////////////////////////////
 ##  Frequency Distributions
 ##//////////////////////////////////////////////////////
@@ -389,6 +402,116 @@ class FreqDist(Counter):
         return '<FreqDist with %d samples and %d outcomes>' % (len(self), self.N())
 
 
+class IncrementalFreqDist(FreqDist):
+    """
+    A frequency distribution that keeps its total count and its
+    frequency of frequencies table up to date as counts change, so
+    that ``N()``, ``Nr()`` and ``r_Nr()`` do not need to scan every
+    sample.  Every change also increments a revision number, which
+    ``WittenBellProbDist`` and ``SimpleGoodTuringProbDist`` use to
+    refresh their estimates lazily when the distribution changes, as
+    it does when the counts of a moving window are kept:
+
+        >>> from nltk.probability import IncrementalFreqDist, WittenBellProbDist
+        >>> fdist = IncrementalFreqDist('abracadabra')
+        >>> wb = WittenBellProbDist(fdist, bins=26)
+        >>> fdist.N(), fdist.Nr(1), wb.prob('z')
+        (11, 2, 0.01488...)
+        >>> fdist['a'] -= 1
+        >>> fdist['z'] += 1
+        >>> fdist.N(), fdist.Nr(1), wb.prob('z')
+        (11, 3, 0.05882...)
+
+    Keeping the tables makes each change of a count several times
+    slower than it is for a ``FreqDist``, so this class should only be
+    used when the tables are read between changes.
+    """
+
+    def __init__(self, samples=None):
+        self._reset_cache()
+        Counter.__init__(self, samples)
+
+    def _reset_cache(self):
+        self._N = 0
+        self._Nr_cache = defaultdict(int)
+        self._revision = getattr(self, '_revision', 0) + 1
+        for count in dict.values(self):
+            self._N += count
+            self._Nr_cache[count] += 1
+
+    def _uncount(self, count):
+        self._N -= count
+        self._Nr_cache[count] -= 1
+        if not self._Nr_cache[count]:
+            del self._Nr_cache[count]
+
+    def __setitem__(self, sample, count):
+        # This is the inner loop of counting, so _uncount() is inlined.
+        Nr = self._Nr_cache
+        old = dict.get(self, sample)
+        if old is not None:
+            self._N -= old
+            if Nr[old] == 1:
+                del Nr[old]
+            else:
+                Nr[old] -= 1
+        dict.__setitem__(self, sample, count)
+        self._N += count
+        Nr[count] += 1
+        self._revision += 1
+
+    def __delitem__(self, sample):
+        if sample in self:
+            self._uncount(dict.__getitem__(self, sample))
+            self._revision += 1
+        Counter.__delitem__(self, sample)
+
+    def update(self, *args, **kwargs):
+        # Count the new samples with a plain Counter first, so that
+        # __setitem__ is called once per distinct sample rather than
+        # once per sample.
+        counts = Counter(*args, **kwargs)
+        if self:
+            Counter.update(self, counts)
+        else:
+            dict.update(self, counts)
+            self._reset_cache()
+
+    def setdefault(self, sample, default=None):
+        if sample not in self:
+            self[sample] = default
+        return dict.__getitem__(self, sample)
+
+    def pop(self, sample, *default):
+        if sample in self:
+            self._uncount(dict.__getitem__(self, sample))
+            self._revision += 1
+        return Counter.pop(self, sample, *default)
+
+    def popitem(self):
+        sample, count = Counter.popitem(self)
+        self._uncount(count)
+        self._revision += 1
+        return sample, count
+
+    def clear(self):
+        Counter.clear(self)
+        self._reset_cache()
+
+    def N(self):
+        return self._N
+
+    def Nr(self, r, bins=None):
+        if r == 0:
+            return bins - self.B() if bins is not None else 0
+        return self._Nr_cache.get(r, 0)
+
+    def r_Nr(self, bins=None):
+        _r_Nr = defaultdict(int, self._Nr_cache)
+        _r_Nr[0] = bins - self.B() if bins is not None else 0
+        return _r_Nr
+
+
 ##//////////////////////////////////////////////////////
 ##  Probability Distributions
 ##//////////////////////////////////////////////////////
@@ -489,6 +612,89 @@ class ProbDistI(object):
                           " is returning an arbitrary sample." % (self, p_init-p))
         return random.choice(list(self.samples()))
 
+    # The batch methods below require numpy.  Subclasses should define
+    # more efficient implementations of prob_many(), where possible.
+    def prob_many(self, samples):
+        """
+        Return the probabilities of the given samples, as a numpy array.
+
+        :param samples: The samples whose probabilities should be
+            returned.
+        :type samples: iter
+        :rtype: numpy.ndarray
+        """
+        numpy = _import_numpy()
+        return numpy.fromiter(compat.imap(self.prob, samples), float)
+
+    def logprob_many(self, samples):
+        """
+        Return the base 2 logarithms of the probabilities of the given
+        samples, as a numpy array.  As with ``logprob()``, samples with
+        a probability of zero are given a very large negative value.
+
+        :param samples: The samples whose probabilities should be
+            returned.
+        :type samples: iter
+        :rtype: numpy.ndarray
+        """
+        numpy = _import_numpy()
+        return numpy.fromiter(compat.imap(self.logprob, samples), float)
+
+    def generate_many(self, k):
+        """
+        Return a list of ``k`` samples drawn independently from this
+        probability distribution.  Each sample is selected as
+        ``generate()`` would select it, but the cumulative probabilities
+        are only computed once.
+
+        :param k: The number of samples to generate.
+        :type k: int
+        :rtype: list
+        """
+        numpy = _import_numpy()
+        samples = list(self.samples())
+        if not samples:
+            return [None] * k
+        cumulative = numpy.cumsum(self.prob_many(samples))
+        draws = numpy.random.random(k)
+        result = []
+        for p, i in zip(draws, numpy.searchsorted(cumulative, draws)):
+            if i < len(samples):
+                result.append(samples[i])
+            # allow for some rounding error:
+            elif p - cumulative[-1] < .0001:
+                result.append(samples[-1])
+            else:
+                if self.SUM_TO_ONE:
+                    warnings.warn("Probability distribution %r sums to %r; "
+                                  "generate_many() is returning an arbitrary "
+                                  "sample." % (self, cumulative[-1]))
+                result.append(random.choice(samples))
+        return result
+
+
+def _log2_many(probs):
+    """
+    Return the base 2 logarithms of an array of probabilities, using
+    ``_NINF`` for probabilities of zero, as ``ProbDistI.logprob()`` does.
+    """
+    numpy = _import_numpy()
+    with numpy.errstate(divide='ignore'):
+        logprobs = numpy.log2(probs)
+    logprobs[probs == 0] = _NINF
+    return logprobs
+
+def _counts_many(freqdist, samples):
+    """
+    Return the counts of the given samples in ``freqdist``, as a numpy
+    array.  This still makes one ``get()`` call per sample, but the
+    calls are driven by ``imap()`` and ``numpy.fromiter()`` rather than
+    by a ``for`` loop, and no intermediate list is built.
+    """
+    numpy = _import_numpy()
+    return numpy.fromiter(compat.imap(freqdist.get, samples, itertools.repeat(0)),
+                          float)
+
 
 @compat.python_2_unicode_compatible
 class UniformProbDist(ProbDistI):
@@ -675,6 +881,14 @@ class MLEProbDist(ProbDistI):
     def prob(self, sample):
         return self._freqdist.freq(sample)
 
+    def prob_many(self, samples):
+        counts = _counts_many(self._freqdist, samples)
+        N = self._freqdist.N()
+        return counts / N if N else counts * 0
+
+    def logprob_many(self, samples):
+        return _log2_many(self.prob_many(samples))
+
     def max(self):
         return self._freqdist.max()
 
@@ -763,6 +977,13 @@ class LidstoneProbDist(ProbDistI):
         c = self._freqdist[sample]
         return (c + self._gamma) / self._divisor
 
+    def prob_many(self, samples):
+        counts = _counts_many(self._freqdist, samples)
+        return (counts + self._gamma) / self._divisor
+
+    def logprob_many(self, samples):
+        return _log2_many(self.prob_many(samples))
+
     def max(self):
         # For Lidstone distributions, probability is monotonic with
         # frequency, so the most probable sample is the one that
@@ -1136,8 +1357,21 @@ class WittenBellProbDist(ProbDistI):
         if bins is None:
             bins = freqdist.B()
         self._freqdist = freqdist
+        self._bins = bins
+        self._estimate()
+
+    def _estimate(self):
+        """
+        Calculate the parameters of the estimate from the current
+        counts of the frequency distribution.
+        """
+        if self._freqdist.B() >= self._bins:
+            raise ValueError('The frequency distribution has %d bins, so '
+                             'bins=%d leaves no probability mass for unseen '
+                             'samples' % (self._freqdist.B(), self._bins))
+        self._revision = getattr(self._freqdist, '_revision', None)
         self._T = self._freqdist.B()
-        self._Z = bins - self._freqdist.B()
+        self._Z = self._bins - self._freqdist.B()
         self._N = self._freqdist.N()
         # self._P0 is P(0), precalculated for efficiency:
         if self._N==0:
@@ -1146,8 +1380,23 @@ class WittenBellProbDist(ProbDistI):
         else:
             self._P0 = self._T / (self._Z * (self._N + self._T))
 
+    def _refresh(self):
+        """
+        Recalculate the estimate if the frequency distribution has
+        changed since it was last calculated.  Only an
+        ``IncrementalFreqDist`` records its changes; it keeps ``N()``
+        and ``B()`` up to date as it changes, so this does not depend
+        on the size of the vocabulary.
+
+        :raise ValueError: If the frequency distribution now has as
+            many bins as this distribution's ``bins`` parameter.
+        """
+        if getattr(self._freqdist, '_revision', None) != self._revision:
+            self._estimate()
+
     def prob(self, sample):
         # inherit docs from ProbDistI
+        self._refresh()
         c = self._freqdist[sample]
         return (c / (self._N + self._T) if c != 0 else self._P0)
 
@@ -1263,15 +1512,44 @@ class SimpleGoodTuringProbDist(ProbDistI):
         """
         assert bins is None or bins > freqdist.B(),\
                'bins parameter must not be less than %d=freqdist.B()+1' % (freqdist.B()+1)
-        if bins is None:
-            bins = freqdist.B() + 1
         self._freqdist = freqdist
-        self._bins = bins
+        self._fixed_bins = bins
+        self._estimate()
+
+    def _estimate(self):
+        """
+        Fit the smoothing curve to the current frequency of frequencies
+        table of the frequency distribution.
+        """
+        self._revision = getattr(self._freqdist, '_revision', None)
+        if self._fixed_bins is None:
+            self._bins = self._freqdist.B() + 1
+        elif self._freqdist.B() >= self._fixed_bins:
+            raise ValueError('The frequency distribution has %d bins, so '
+                             'bins=%d leaves no probability mass for unseen '
+                             'samples' % (self._freqdist.B(), self._fixed_bins))
+        else:
+            self._bins = self._fixed_bins
         r, nr = self._r_Nr()
         self.find_best_fit(r, nr)
         self._switch(r, nr)
         self._renormalize(r, nr)
 
+    def _refresh(self):
+        """
+        Refit the smoothing curve if the frequency distribution has
+        changed since it was last fitted.  Only an
+        ``IncrementalFreqDist`` records its changes; it keeps its
+        frequency of frequencies table up to date as it changes, so
+        refitting is linear in the number of distinct counts, not in
+        the number of samples.
+
+        :raise ValueError: If the frequency distribution now has as
+            many bins as this distribution's ``bins`` parameter.
+        """
+        if getattr(self._freqdist, '_revision', None) != self._revision:
+            self._estimate()
+
     def _r_Nr_non_zero(self):
         r_Nr = self._freqdist.r_Nr()
         del r_Nr[0]
@@ -1390,6 +1668,7 @@ class SimpleGoodTuringProbDist(ProbDistI):
         :type sample: str
         :rtype: float
         """
+        self._refresh()
         count = self._freqdist[sample]
         p = self._prob_measure(count)
         if count == 0:
@@ -1429,6 +1708,7 @@ class SimpleGoodTuringProbDist(ProbDistI):
         This function returns the total mass of probability transfers from the
         seen samples to the unseen samples.
         """
+        self._refresh()
         return  self.smoothedNr(1) / self._freqdist.N()
 
     def max(self):
@@ -1499,6 +1779,35 @@ class MutableProbDist(ProbDistI):
             return float('-inf')
         return (self._data[i] if self._logs else math.log(self._data[i], 2))
 
+    def _data_many(self, samples):
+        # The stored values for the given samples, and a mask of the
+        # samples that are not in this distribution.
+        numpy = _import_numpy()
+        data = numpy.array(self._data, float)
+        if samples is self._samples and len(samples) == len(data):
+            return data, numpy.zeros(len(data), bool)
+        index = numpy.fromiter((self._sample_dict.get(sample, -1)
+                                for sample in samples), int)
+        return data[index], index < 0
+
+    def prob_many(self, samples):
+        # inherit documentation
+        values, unknown = self._data_many(samples)
+        if self._logs:
+            values = 2**values
+        values[unknown] = 0.0
+        return values
+
+    def logprob_many(self, samples):
+        # inherit documentation
+        numpy = _import_numpy()
+        values, unknown = self._data_many(samples)
+        if not self._logs:
+            with numpy.errstate(divide='ignore'):
+                values = numpy.log2(values)
+        values[unknown] = float('-inf')
+        return values
+
     def update(self, sample, prob, log=True):
         """
         Update the probability for the given sample. This may cause the object
@@ -1586,6 +1895,7 @@ class KneserNeyProbDist(ProbDistI):
 
         # cache for probability calculation
         self._cache = {}
+        self._cached_seen = False
 
         # internal bigram and trigram frequency distributions
         self._bigrams = defaultdict(int)
@@ -1637,6 +1947,31 @@ class KneserNeyProbDist(ProbDistI):
             self._cache[trigram] = prob
             return prob
 
+    def _cache_seen(self):
+        """
+        Compute the probabilities of all the trigrams seen in training
+        at once, and add them to the probability cache.
+        """
+        numpy = _import_numpy()
+        trigrams = list(self._trigrams)
+        counts = numpy.fromiter((self._trigrams[t] for t in trigrams), float)
+        contexts = numpy.fromiter((self._bigrams[t[:2]] for t in trigrams),
+                                  float)
+        probs = (counts - self.discount()) / contexts
+        self._cache.update(zip(trigrams, probs.tolist()))
+        self._cached_seen = True
+
+    def prob_many(self, trigrams):
+        numpy = _import_numpy()
+        if not self._cached_seen:
+            self._cache_seen()
+        cache, prob = self._cache, self.prob
+        return numpy.fromiter((cache[t] if t in cache else prob(t)
+                               for t in compat.imap(tuple, trigrams)), float)
+
+    def logprob_many(self, trigrams):
+        return _log2_many(self.prob_many(trigrams))
+
     def discount(self):
         """
         Return the value by which counts are discounted. By default set to 0.75.
@@ -1654,6 +1989,9 @@ class KneserNeyProbDist(ProbDistI):
         :rtype: None
         """
         self._D = discount
+        # Cached probabilities depend on the discount.
+        self._cache = {}
+        self._cached_seen = False
 
     def samples(self):
         return self._trigrams.keys()
@@ -1960,6 +2298,530 @@ class ConditionalFreqDist(defaultdict):
         return '<ConditionalFreqDist with %d conditions>' % len(self)
 
 
+##//////////////////////////////////////////////////////
+##  Compact Frequency Distributions
+##//////////////////////////////////////////////////////
+
+class SampleIndex(object):
+    """
+    A table that interns samples as consecutive integer ids.  A single
+    ``SampleIndex`` can be shared by many ``CompactFreqDist`` objects,
+    so that each distinct sample is stored only once, no matter how
+    many distributions it is counted in.
+
+        >>> from nltk.probability import SampleIndex
+        >>> index = SampleIndex()
+        >>> index.intern('dog'), index.intern('cat'), index.intern('dog')
+        (0, 1, 0)
+        >>> index.sample(1)
+        'cat'
+        >>> index.id('fish') is None
+        True
+    """
+    def __init__(self, samples=()):
+        self._ids = {}
+        self._samples = []
+        for sample in samples:
+            self.intern(sample)
+
+    def intern(self, sample):
+        """
+        Return the id of ``sample``, assigning it a new id if it has
+        not been seen before.
+
+        :rtype: int
+        """
+        try:
+            return self._ids[sample]
+        except KeyError:
+            i = self._ids[sample] = len(self._samples)
+            self._samples.append(sample)
+            return i
+
+    def id(self, sample):
+        """
+        Return the id of ``sample``, or None if it has not been interned.
+
+        :rtype: int or None
+        """
+        return self._ids.get(sample)
+
+    def sample(self, i):
+        """
+        Return the sample whose id is ``i``.
+        """
+        return self._samples[i]
+
+    def __len__(self):
+        return len(self._samples)
+
+    def __contains__(self, sample):
+        return sample in self._ids
+
+    def __iter__(self):
+        return iter(self._samples)
+
+    def __getstate__(self):
+        # The id table is fully determined by the sample list.
+        return self._samples
+
+    def __setstate__(self, samples):
+        self._samples = samples
+        self._ids = dict((s, i) for (i, s) in enumerate(samples))
+
+    def __repr__(self):
+        return '<SampleIndex with %d samples>' % len(self)
+
+
+@compat.python_2_unicode_compatible
+class CompactFreqDist(object):
+    """
+    A memory-efficient frequency distribution.  Samples are interned
+    in a (possibly shared) ``SampleIndex``, and the counts are kept in
+    two parallel ``array`` objects -- the sorted sample ids and their
+    counts -- rather than in a dictionary of boxed integers.
+
+    ``CompactFreqDist`` supports the read interface of ``FreqDist``
+    (``N()``, ``B()``, ``freq()``, ``max()``, ``most_common()``,
+    ``r_Nr()``, ``hapaxes()``, indexing and iteration), so the
+    ``ProbDistI`` estimators can be built directly from it:
+
+        >>> from nltk.probability import CompactFreqDist, MLEProbDist
+        >>> fdist = CompactFreqDist('abracadabra')
+        >>> fdist['a'], fdist['z']
+        (5, 0)
+        >>> fdist.N(), fdist.B()
+        (11, 5)
+        >>> fdist.most_common(2)
+        [('a', 5), ('b', 2)]
+        >>> MLEProbDist(fdist).prob('r')
+        0.18181818...
+
+    Counts are added most cheaply in bulk, with ``update()``.  Setting
+    the count of a sample that is not yet in the distribution with
+    ``fdist[sample] = count`` is linear in ``B()``.  Use
+    ``from_freqdist()`` and ``to_freqdist()`` to convert to and from
+    ``FreqDist``.
+    """
+
+    _BATCH_SIZE = 1 << 20
+    """The maximum number of distinct samples that ``update()`` buffers
+       before merging them into the count arrays."""
+
+    def __init__(self, samples=None, index=None):
+        """
+        Construct a new compact frequency distribution.
+
+        :param samples: The samples to initialize the frequency
+            distribution with.
+        :type samples: Sequence or dict
+        :param index: The sample index used to intern samples.  If not
+            specified, a new ``SampleIndex`` is created.
+        :type index: SampleIndex
+        """
+        self._index = index if index is not None else SampleIndex()
+        self._ids = array.array(str('l'))
+        self._counts = array.array(str('l'))
+        self._N = 0
+        self._revision = 0
+        if samples is not None:
+            self.update(samples)
+
+    @classmethod
+    def from_freqdist(cls, freqdist, index=None):
+        """
+        Return a ``CompactFreqDist`` with the same counts as ``freqdist``.
+
+        :type freqdist: FreqDist
+        :type index: SampleIndex
+        :rtype: CompactFreqDist
+        """
+        return cls(freqdist, index)
+
+    def to_freqdist(self):
+        """
+        Return a ``FreqDist`` with the same counts as this distribution.
+
+        :rtype: FreqDist
+        """
+        fdist = FreqDist()
+        for sample, count in self.items():
+            fdist[sample] = count
+        return fdist
+
+    def index(self):
+        """
+        Return the ``SampleIndex`` used to intern this distribution's
+        samples.
+
+        :rtype: SampleIndex
+        """
+        return self._index
+
+    def update(self, samples):
+        """
+        Add counts to this distribution.  If ``samples`` is a mapping,
+        its values are added to the counts of its keys; otherwise each
+        element of ``samples`` is counted once.
+
+        :type samples: Sequence or dict
+        """
+        intern = self._index.intern
+        delta = defaultdict(int)
+        if hasattr(samples, 'items'):
+            for sample, count in samples.items():
+                delta[intern(sample)] += count
+        else:
+            for sample in samples:
+                delta[intern(sample)] += 1
+                if len(delta) >= self._BATCH_SIZE:
+                    self._add_ids(delta)
+                    delta = defaultdict(int)
+        self._add_ids(delta)
+
+    def _add_ids(self, delta):
+        """
+        Merge a dictionary mapping sample ids to count increments into
+        the sorted count arrays.
+        """
+        ids, counts = self._ids, self._counts
+        self._revision += 1
+        new = []
+        for i, c in delta.items():
+            pos = bisect_left(ids, i)
+            if pos < len(ids) and ids[pos] == i:
+                counts[pos] += c
+            else:
+                new.append((i, c))
+            self._N += c
+        if not new:
+            return
+        new.sort()
+        if not ids or new[0][0] > ids[-1]:
+            # Fresh samples get the highest ids, so they can usually be
+            # appended without reordering.
+            ids.extend(i for i, _ in new)
+            counts.extend(c for _, c in new)
+            return
+        merged_ids = array.array(str('l'))
+        merged_counts = array.array(str('l'))
+        j = 0
+        for i, c in zip(ids, counts):
+            while j < len(new) and new[j][0] < i:
+                merged_ids.append(new[j][0])
+                merged_counts.append(new[j][1])
+                j += 1
+            merged_ids.append(i)
+            merged_counts.append(c)
+        for i, c in new[j:]:
+            merged_ids.append(i)
+            merged_counts.append(c)
+        self._ids, self._counts = merged_ids, merged_counts
+
+    def _position(self, sample):
+        """
+        Return the position of ``sample`` in the count arrays, or None
+        if it has no count.
+        """
+        i = self._index.id(sample)
+        if i is None:
+            return None
+        pos = bisect_left(self._ids, i)
+        if pos < len(self._ids) and self._ids[pos] == i:
+            return pos
+        return None
+
+    def __getitem__(self, sample):
+        pos = self._position(sample)
+        return 0 if pos is None else self._counts[pos]
+
+    def get(self, sample, default=None):
+        pos = self._position(sample)
+        return default if pos is None else self._counts[pos]
+
+    def __setitem__(self, sample, count):
+        pos = self._position(sample)
+        if pos is None:
+            self._add_ids({self._index.intern(sample): count})
+        else:
+            self._N += count - self._counts[pos]
+            self._counts[pos] = count
+            self._revision += 1
+
+    def __delitem__(self, sample):
+        pos = self._position(sample)
+        if pos is None:
+            raise KeyError(sample)
+        self._N -= self._counts[pos]
+        del self._ids[pos]
+        del self._counts[pos]
+        self._revision += 1
+
+    def __contains__(self, sample):
+        return self._position(sample) is not None
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        sample = self._index.sample
+        return (sample(i) for i in self._ids)
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return list(self._counts)
+
+    def items(self):
+        sample = self._index.sample
+        return [(sample(i), c) for (i, c) in zip(self._ids, self._counts)]
+
+    def N(self):
+        """
+        Return the total number of sample outcomes that have been
+        recorded by this distribution.
+
+        :rtype: int
+        """
+        return self._N
+
+    def B(self):
+        """
+        Return the number of sample values (or "bins") in this
+        distribution.
+
+        :rtype: int
+        """
+        return len(self._ids)
+
+    def hapaxes(self):
+        """
+        Return a list of all samples that occur once (hapax legomena)
+
+        :rtype: list
+        """
+        sample = self._index.sample
+        return [sample(i) for (i, c) in zip(self._ids, self._counts) if c == 1]
+
+    def Nr(self, r, bins=None):
+        return self.r_Nr(bins)[r]
+
+    def r_Nr(self, bins=None):
+        """
+        Return the dictionary mapping r to Nr, the number of samples
+        with frequency r, where Nr > 0.  See ``FreqDist.r_Nr()``.
+
+        :type bins: int
+        :rtype: dict(int, int)
+        """
+        _r_Nr = defaultdict(int)
+        for count in self._counts:
+            _r_Nr[count] += 1
+        _r_Nr[0] = bins - self.B() if bins is not None else 0
+        return _r_Nr
+
+    def freq(self, sample):
+        """
+        Return the frequency of a given sample, i.e. its count divided
+        by ``N()``.
+
+        :rtype: float
+        """
+        if self._N == 0:
+            return 0
+        return self[sample] / self._N
+
+    def max(self):
+        """
+        Return the sample with the greatest number of outcomes.
+
+        :rtype: any
+        """
+        if len(self) == 0:
+            raise ValueError('A FreqDist must have at least one sample before max is defined.')
+        return self.most_common(1)[0][0]
+
+    def most_common(self, n=None):
+        """
+        List the ``n`` most common samples and their counts, from the
+        most common to the least.  If ``n`` is None, list all samples.
+
+        :rtype: list(tuple)
+        """
+        sample = self._index.sample
+        positions = range(len(self._counts))
+        if n is None:
+            positions = sorted(positions, key=self._counts.__getitem__,
+                               reverse=True)
+        else:
+            positions = heapq.nlargest(n, positions,
+                                       key=self._counts.__getitem__)
+        return [(sample(self._ids[p]), self._counts[p]) for p in positions]
+
+    def copy(self):
+        """
+        Create a copy of this distribution, sharing its sample index.
+
+        :rtype: CompactFreqDist
+        """
+        other = self.__class__(index=self._index)
+        other._ids = array.array(str('l'), self._ids)
+        other._counts = array.array(str('l'), self._counts)
+        other._N = self._N
+        return other
+
+    def __eq__(self, other):
+        if not hasattr(other, 'items'):
+            return False
+        return dict(self.items()) == dict(other.items())
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        items = ['{0!r}: {1!r}'.format(*item) for item in self.most_common(10)]
+        if len(self) > 10:
+            items.append('...')
+        return 'CompactFreqDist({{{0}}})'.format(', '.join(items))
+
+    def __str__(self):
+        return '<CompactFreqDist with %d samples and %d outcomes>' % (len(self), self.N())
+
+
+@compat.python_2_unicode_compatible
+class CompactConditionalFreqDist(dict):
+    """
+    A memory-efficient conditional frequency distribution.  Each
+    condition maps to a ``CompactFreqDist``, and all of them share a
+    single ``SampleIndex``, so a sample that occurs under many
+    conditions is stored only once.
+
+        >>> from nltk.probability import CompactConditionalFreqDist
+        >>> from nltk.probability import ConditionalProbDist, LidstoneProbDist
+        >>> words = 'the cat sat on the mat the end'.split()
+        >>> cfdist = CompactConditionalFreqDist(zip(words, words[1:]))
+        >>> cfdist['the'].most_common(1)
+        [('cat', 1)]
+        >>> cfdist.N()
+        7
+        >>> cpdist = ConditionalProbDist(cfdist, LidstoneProbDist, 0.5, 10)
+        >>> cpdist['the'].prob('mat')
+        0.1...
+
+    As with ``ConditionalFreqDist``, indexing a condition that has not
+    been accessed before creates a new empty distribution for it.
+    """
+
+    _BATCH_SIZE = 1 << 20
+    """The number of (condition, sample) pairs that ``update()``
+       buffers before merging them into the count arrays."""
+
+    def __init__(self, cond_samples=None, index=None):
+        """
+        Construct a new compact conditional frequency distribution.
+
+        :param cond_samples: The samples to initialize the conditional
+            frequency distribution with
+        :type cond_samples: Sequence of (condition, sample) tuples
+        :param index: The sample index shared by every condition.  If
+            not specified, a new ``SampleIndex`` is created.
+        :type index: SampleIndex
+        """
+        dict.__init__(self)
+        self._index = index if index is not None else SampleIndex()
+        if cond_samples:
+            self.update(cond_samples)
+
+    @classmethod
+    def from_conditional_freqdist(cls, cfdist, index=None):
+        """
+        Return a ``CompactConditionalFreqDist`` with the same counts as
+        ``cfdist``.
+
+        :type cfdist: ConditionalFreqDist
+        :type index: SampleIndex
+        :rtype: CompactConditionalFreqDist
+        """
+        result = cls(index=index)
+        for condition in cfdist:
+            result[condition].update(cfdist[condition])
+        return result
+
+    def to_conditional_freqdist(self):
+        """
+        Return a ``ConditionalFreqDist`` with the same counts as this
+        distribution.
+
+        :rtype: ConditionalFreqDist
+        """
+        cfdist = ConditionalFreqDist()
+        for condition, fdist in self.items():
+            cfdist[condition] = fdist.to_freqdist()
+        return cfdist
+
+    def __missing__(self, condition):
+        fdist = self[condition] = CompactFreqDist(index=self._index)
+        return fdist
+
+    def __reduce__(self):
+        return (self.__class__, (None, self._index), None, None,
+                iter(self.items()))
+
+    def index(self):
+        """
+        Return the ``SampleIndex`` shared by every condition.
+
+        :rtype: SampleIndex
+        """
+        return self._index
+
+    def update(self, cond_samples):
+        """
+        Count each (condition, sample) pair in ``cond_samples``.
+
+        :type cond_samples: Sequence of (condition, sample) tuples
+        """
+        intern = self._index.intern
+        pending = defaultdict(lambda: defaultdict(int))
+        size = 0
+        for (cond, sample) in cond_samples:
+            pending[cond][intern(sample)] += 1
+            size += 1
+            if size >= self._BATCH_SIZE:
+                self._flush(pending)
+                pending.clear()
+                size = 0
+        self._flush(pending)
+
+    def _flush(self, pending):
+        for cond, delta in pending.items():
+            self[cond]._add_ids(delta)
+
+    def conditions(self):
+        """
+        Return a list of the conditions that have been accessed for
+        this distribution.
+
+        :rtype: list
+        """
+        return list(self.keys())
+
+    def N(self):
+        """
+        Return the total number of sample outcomes that have been
+        recorded by this distribution.
+
+        :rtype: int
+        """
+        return sum(fdist.N() for fdist in self.values())
+
+    def __repr__(self):
+        return '<CompactConditionalFreqDist with %d conditions>' % len(self)
+
+
 @compat.python_2_unicode_compatible
 class ConditionalProbDistI(dict):
     """
@@ -1987,6 +2849,48 @@ class ConditionalProbDistI(dict):
         """
         return list(self.keys())
 
+    def logprob_many(self, condition_samples):
+        """
+        Return the base 2 logarithms of the probabilities of the given
+        samples under the given conditions, as a numpy array.  The
+        samples are grouped by condition, so that each condition's
+        ``ProbDist`` scores all of its samples in a single call to
+        ``logprob_many()``.
+
+        :param condition_samples: The samples whose probabilities
+            should be returned.
+        :type condition_samples: list of (condition, sample) tuples
+        :rtype: numpy.ndarray
+        """
+        numpy = _import_numpy()
+        groups = defaultdict(list)
+        for i, (condition, sample) in enumerate(condition_samples):
+            groups[condition].append((i, sample))
+        result = numpy.empty(len(condition_samples))
+        for condition, group in groups.items():
+            indices, samples = zip(*group)
+            result[list(indices)] = self[condition].logprob_many(samples)
+        return result
+
+    def generate_many(self, conditions):
+        """
+        Return a list containing one sample drawn from the probability
+        distribution of each of the given conditions.
+
+        :param conditions: The conditions to draw samples for.
+        :type conditions: list
+        :rtype: list
+        """
+        groups = defaultdict(list)
+        for i, condition in enumerate(conditions):
+            groups[condition].append(i)
+        result = [None] * len(conditions)
+        for condition, indices in groups.items():
+            samples = self[condition].generate_many(len(indices))
+            for i, sample in zip(indices, samples):
+                result[i] = sample
+        return result
+
     def __repr__(self):
         """
         Return a string representation of this ``ConditionalProbDist``.
@@ -2110,6 +3014,149 @@ def add_logs(logx, logy):
 def sum_logs(logs):
     return (reduce(add_logs, logs[1:], logs[0]) if len(logs) != 0 else _NINF)
 
+##//////////////////////////////////////////////////////
+##  Parallel N-gram Counting
+##//////////////////////////////////////////////////////
+
+def merge_counts(counts, other):
+    """
+    Add the counts in ``other`` to ``counts``, and return ``counts``.
+    Both arguments must be ``FreqDist`` objects, or both must be
+    ``ConditionalFreqDist`` objects.  Merging is associative, so
+    partial counts can be combined in any grouping with
+    ``functools.reduce``.
+
+        >>> from nltk.probability import FreqDist, merge_counts
+        >>> merge_counts(FreqDist('abb'), FreqDist('bc'))
+        FreqDist({'b': 3, 'a': 1, 'c': 1})
+
+    :type counts: FreqDist or ConditionalFreqDist
+    :type other: FreqDist or ConditionalFreqDist
+    :rtype: FreqDist or ConditionalFreqDist
+    """
+    if isinstance(counts, ConditionalFreqDist):
+        for condition in other:
+            counts[condition].update(other[condition])
+    else:
+        counts.update(other)
+    return counts
+
+def _count_window(counts, tokens, n, start, stop, conditional):
+    """
+    Count the ngrams of ``tokens`` that begin at positions ``start``
+    through ``stop-1``.
+    """
+    for i in range(start, stop):
+        ngram = tuple(tokens[i:i+n])
+        if conditional:
+            counts[ngram[:-1]][ngram[-1]] += 1
+        else:
+            counts[ngram] += 1
+
+# The reader, view method, ngram order and output type that are shared
+# by every task of a count_ngrams() worker process.
+_ngram_task = None
+
+def _init_ngram_worker(reader, method, n, conditional):
+    global _ngram_task
+    _ngram_task = (reader, method, n, conditional)
+
+def _count_file_ngrams(fileid):
+    """
+    Count the ngrams of a single file, and return the counts together
+    with the file's first and last ``n-1`` tokens, which are needed to
+    count the ngrams that cross file boundaries.
+    """
+    reader, method, n, conditional = _ngram_task
+    tokens = list(getattr(reader, method)(fileid))
+    counts = ConditionalFreqDist() if conditional else FreqDist()
+    _count_window(counts, tokens, n, 0, len(tokens) - n + 1, conditional)
+    return counts, tokens[:n-1], tokens[max(0, len(tokens)-n+1):]
+
+def count_ngrams(reader, n, fileids=None, method='words', processes=None,
+                 conditional=False, pad_left=False, pad_right=False,
+                 left_pad_symbol=None, right_pad_symbol=None):
+    """
+    Count the ngrams of a corpus, using a pool of worker processes that
+    each count the ngrams of one file at a time.  The result is
+    identical to counting serially over the concatenation of the files:
+
+        >>> from nltk.corpus import gutenberg
+        >>> from nltk.probability import count_ngrams
+        >>> from nltk.util import ngrams
+        >>> fileids = gutenberg.fileids()[:3]
+        >>> fdist = count_ngrams(gutenberg, 3, fileids, processes=2)
+        >>> fdist == FreqDist(ngrams(gutenberg.words(fileids), 3))
+        True
+
+    Each worker counts with a ``FreqDist`` (or ``ConditionalFreqDist``),
+    and the partial counts are combined with ``merge_counts()``.  The
+    ngrams that span two or more consecutive files are counted in the
+    parent process from the tokens at the edges of each file.
+
+    The corpus reader is sent to each worker once, so it must be
+    picklable.  On platforms that spawn rather than fork new processes,
+    ``count_ngrams()`` should only be called from code that is guarded
+    by ``if __name__ == '__main__'``.
+
+    :param reader: The corpus reader whose files should be counted.
+    :type reader: CorpusReader
+    :param n: The degree of the ngrams.
+    :type n: int
+    :param fileids: The files to count, in order.  Defaults to all
+        of the reader's files.
+    :type fileids: list(str)
+    :param method: The name of the reader method that returns a file's
+        tokens, such as ``'words'``.
+    :type method: str
+    :param processes: The number of worker processes.  Defaults to the
+        number of CPUs; if it is 1, the files are counted in this
+        process.
+    :type processes: int
+    :param conditional: If true, return a ``ConditionalFreqDist``
+        mapping the first ``n-1`` items of each ngram to its last item.
+    :type conditional: bool
+    :param pad_left: whether the ngrams should be left-padded
+    :type pad_left: bool
+    :param pad_right: whether the ngrams should be right-padded
+    :type pad_right: bool
+    :param left_pad_symbol: the symbol to use for left padding
+    :param right_pad_symbol: the symbol to use for right padding
+    :rtype: FreqDist or ConditionalFreqDist
+    """
+    if fileids is None:
+        fileids = reader.fileids()
+    elif isinstance(fileids, compat.string_types):
+        fileids = [fileids]
+
+    initargs = (reader, method, n, conditional)
+    if processes == 1 or len(fileids) <= 1:
+        _init_ngram_worker(*initargs)
+        results = compat.imap(_count_file_ngrams, fileids)
+        pool = None
+    else:
+        import multiprocessing
+        pool = multiprocessing.Pool(processes, _init_ngram_worker, initargs)
+        results = pool.imap(_count_file_ngrams, fileids)
+
+    try:
+        counts = ConditionalFreqDist() if conditional else FreqDist()
+        tail = [left_pad_symbol] * (n-1) if pad_left else []
+        for (file_counts, head, file_tail) in results:
+            merge_counts(counts, file_counts)
+            # Count the ngrams that start before this file and end in it.
+            window = tail + head
+            _count_window(counts, window, n, 0,
+                          min(len(tail), len(window) - n + 1), conditional)
+            tail = (tail + file_tail)[max(0, len(tail) + len(file_tail) - n + 1):]
+        if pad_right:
+            _count_window(counts, tail + [right_pad_symbol] * (n-1), n,
+                          0, len(tail), conditional)
+    finally:
+        if pool is not None:
+            pool.terminate()
+    return counts
+
 ##//////////////////////////////////////////////////////
 ##  Probabilistic Mix-in
 ##//////////////////////////////////////////////////////
@@ -2340,16 +3387,42 @@ def gt_demo():
         print('%18s %8d  %14e' \
             % (key, fd[key], sgt.prob(key)))
 
+def count_ngrams_demo(fileids=None, n=3, processes=(1, 2, 4)):
+    """
+    Time ``count_ngrams()`` on the Gutenberg corpus with different
+    numbers of worker processes, and check that every run gives the
+    same counts as the serial count.
+    """
+    import time
+    from nltk.corpus import gutenberg
+    from nltk.util import ngrams
+
+    if fileids is None:
+        fileids = gutenberg.fileids()
+    start = time.time()
+    serial = FreqDist(ngrams(gutenberg.words(fileids), n))
+    baseline = time.time() - start
+    print('%10s %10s %8s %10s' % ('processes', 'seconds', 'speedup', 'identical'))
+    print('%10s %10.2f %8.2f %10s' % ('serial', baseline, 1.0, True))
+    for p in processes:
+        start = time.time()
+        fdist = count_ngrams(gutenberg, n, fileids, processes=p)
+        elapsed = time.time() - start
+        print('%10d %10.2f %8.2f %10s' % (p, elapsed, baseline / elapsed,
+                                          fdist == serial))
+
 if __name__ == '__main__':
     demo(6, 10)
     demo(5, 5000)
     gt_demo()
 
-__all__ = ['ConditionalFreqDist', 'ConditionalProbDist',
+__all__ = ['CompactConditionalFreqDist', 'CompactFreqDist',
+           'ConditionalFreqDist', 'ConditionalProbDist',
            'ConditionalProbDistI', 'CrossValidationProbDist',
            'DictionaryConditionalProbDist', 'DictionaryProbDist', 'ELEProbDist',
            'FreqDist', 'SimpleGoodTuringProbDist', 'HeldoutProbDist',
-           'ImmutableProbabilisticMixIn', 'LaplaceProbDist', 'LidstoneProbDist',
+           'ImmutableProbabilisticMixIn', 'IncrementalFreqDist', 'LaplaceProbDist', 'LidstoneProbDist',
            'MLEProbDist', 'MutableProbDist', 'KneserNeyProbDist', 'ProbDistI', 'ProbabilisticMixIn',
-           'UniformProbDist', 'WittenBellProbDist', 'add_logs',
-           'log_likelihood', 'sum_logs', 'entropy']
+           'SampleIndex', 'UniformProbDist', 'WittenBellProbDist', 'add_logs',
+           'log_likelihood', 'sum_logs', 'entropy', 'count_ngrams',
+           'merge_counts']
@@ -16,7 +16,7 @@ purposes.
 from __future__ import print_function
 from collections import defaultdict
 
-from nltk.classify.util import apply_features, accuracy as eval_accuracy
+from nltk.classify.util import apply_features
 from nltk.collocations import BigramCollocationFinder
 from nltk.metrics import (BigramAssocMeasures, precision as eval_precision,
     recall as eval_recall, f_measure as eval_f_measure)
@@ -194,17 +194,24 @@ class SentimentAnalyzer(object):
             classifier = self.classifier
         print("Evaluating {0} results...".format(type(classifier).__name__))
         metrics_results = {}
+        # Classify the whole test set at once, so that classifiers with
+        # a batched classify_many() can use it.
+        observed_labels = classifier.classify_many(
+            [feats for (feats, label) in test_set])
         if accuracy == True:
-            accuracy_score = eval_accuracy(classifier, test_set)
+            correct = [label == observed for ((feats, label), observed)
+                       in zip(test_set, observed_labels)]
+            accuracy_score = (float(sum(correct)) / len(correct)
+                              if correct else 0)
             metrics_results['Accuracy'] = accuracy_score
 
         gold_results = defaultdict(set)
         test_results = defaultdict(set)
         labels = set()
-        for i, (feats, label) in enumerate(test_set):
+        for i, ((feats, label), observed) in enumerate(zip(test_set,
+                                                          observed_labels)):
             labels.add(label)
             gold_results[label].add(i)
-            observed = classifier.classify(feats)
             test_results[observed].add(i)
 
         for label in labels:
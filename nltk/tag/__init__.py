@@ -64,7 +64,8 @@ from nltk.tag.sequential    import (SequentialBackoffTagger, ContextTagger,
                                     DefaultTagger, NgramTagger, UnigramTagger,
                                     BigramTagger, TrigramTagger, AffixTagger,
                                     RegexpTagger, ClassifierBasedTagger,
-                                    ClassifierBasedPOSTagger)
+                                    ClassifierBasedPOSTagger,
+                                    CompiledBackoffTagger)
 from nltk.tag.brill         import BrillTagger
 from nltk.tag.brill_trainer import BrillTaggerTrainer
 from nltk.tag.tnt           import TnT
@@ -10,6 +10,9 @@
 Interface for tagging each token in a sentence with supplementary
 information, such as its part of speech.
 """
+from collections import deque
+from itertools import islice
+
 from nltk.internals import overridden
 from nltk.metrics import accuracy
 
@@ -42,13 +45,72 @@ class TaggerI(object):
         else:
             raise NotImplementedError()
 
-    def tag_sents(self, sentences):
+    def tag_sents(self, sentences, n_jobs=1, chunksize=100):
         """
         Apply ``self.tag()`` to each element of *sentences*.  I.e.:
 
             return [self.tag(sent) for sent in sentences]
+
+        If ``n_jobs`` is not 1, the sentences are tagged by a pool of
+        worker processes instead; see ``tag_stream()``.  Subclasses that
+        override this method should accept ``n_jobs`` and ``chunksize``,
+        and pass them on to ``TaggerI.tag_sents()`` when ``n_jobs`` is
+        not 1.
+
+        :param n_jobs: The number of worker processes.  If it is less
+            than 1, the number of CPUs is used.
+        :param chunksize: The number of sentences that are sent to a
+            worker process at a time.
+        :rtype: list(list(tuple(str, str)))
+        """
+        if n_jobs == 1:
+            return [self.tag(sent) for sent in sentences]
+        return list(self.tag_stream(sentences, n_jobs, chunksize))
+
+    def tag_stream(self, sentences, n_jobs=1, chunksize=100):
+        """
+        Return an iterator over the tagged versions of *sentences*, in
+        the same order.  The sentences are read lazily, ``chunksize``
+        at a time, so *sentences* may be a generator over a corpus that
+        does not fit in memory.
+
+        If ``n_jobs`` is not 1, the chunks are tagged by a pool of
+        worker processes, each of which calls ``tag_sents()`` on a
+        copy of this tagger; at most ``2 * n_jobs`` chunks are in
+        progress at any time.  The tagger is sent to each worker once,
+        so it must be picklable.  On platforms that spawn rather than
+        fork new processes, this should only be called from code that
+        is guarded by ``if __name__ == '__main__'``.
+
+        :param n_jobs: The number of worker processes.  If it is less
+            than 1, the number of CPUs is used.
+        :param chunksize: The number of sentences that are tagged at a
+            time.
+        :rtype: iter(list(tuple(str, str)))
         """
-        return [self.tag(sent) for sent in sentences]
+        chunks = _chunks(sentences, chunksize)
+        if n_jobs == 1:
+            for chunk in chunks:
+                for tagged_sent in self.tag_sents(chunk):
+                    yield tagged_sent
+            return
+
+        import multiprocessing
+        if n_jobs < 1:
+            n_jobs = multiprocessing.cpu_count()
+        pool = multiprocessing.Pool(n_jobs, _init_tag_worker, (self,))
+        try:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.apply_async(_tag_chunk, (chunk,)))
+                if len(pending) >= 2 * n_jobs:
+                    for tagged_sent in pending.popleft().get():
+                        yield tagged_sent
+            while pending:
+                for tagged_sent in pending.popleft().get():
+                    yield tagged_sent
+        finally:
+            pool.terminate()
 
     def evaluate(self, gold):
         """
@@ -70,6 +132,25 @@ class TaggerI(object):
         if (train and model) or (not train and not model):
             raise ValueError('Must specify either training data or trained model.')
 
+# The tagger that is used by every task of a tag_stream() worker process.
+_worker_tagger = None
+
+def _init_tag_worker(tagger):
+    global _worker_tagger
+    _worker_tagger = tagger
+
+def _tag_chunk(sentences):
+    return _worker_tagger.tag_sents(sentences)
+
+def _chunks(items, size):
+    """Yield lists of (up to) ``size`` consecutive items."""
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
 class FeaturesetTaggerI(TaggerI):
     """
     A tagger that requires tokens to be ``featuresets``.  A featureset
@@ -137,16 +137,19 @@ class CRFTagger(TaggerI):
         
         return feature_list
         
-    def tag_sents(self, sents):
+    def tag_sents(self, sents, n_jobs=1, chunksize=100):
         '''
         Tag a list of sentences. NB before using this function, user should specify the mode_file either by 
                        - Train a new model using ``train'' function 
                        - Use the pre-trained model which is set via ``set_model_file'' function  
+        See ``TaggerI.tag_sents()`` for ``n_jobs`` and ``chunksize``.
         :params sentences : list of sentences needed to tag. 
         :type sentences : list(list(str))
         :return : list of tagged sentences. 
         :rtype : list (list (tuple(str,str))) 
         '''
+        if n_jobs != 1:
+            return super(CRFTagger, self).tag_sents(sents, n_jobs, chunksize)
         if self._model_file == '':
             raise Exception(' No model file is found !! Please use train or set_model_file function')
         
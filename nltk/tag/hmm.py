@@ -139,6 +139,7 @@ class HiddenMarkovModelTagger(TaggerI):
         self._outputs = outputs
         self._priors = priors
         self._cache = None
+        self._log_cache = None
         self._transform = transform
 
     @classmethod
@@ -271,6 +272,33 @@ class HiddenMarkovModelTagger(TaggerI):
         path = self._best_path(unlabeled_sequence)
         return list(izip(unlabeled_sequence, path))
 
+    BATCH_SIZE = 256
+    """The number of sentences that are decoded at once by
+       ``tag_sents()`` and ``best_paths()``."""
+
+    def tag_sents(self, sentences, n_jobs=1, chunksize=100):
+        """
+        Tags each of the given sequences with its highest probability
+        state sequence.  This gives the same result as calling
+        ``tag()`` on each sequence, but decodes the sequences in
+        batches of ``BATCH_SIZE`` with a vectorized Viterbi algorithm.
+        See ``TaggerI.tag_sents()`` for ``n_jobs`` and ``chunksize``.
+
+        :rtype: list(list)
+        """
+        if n_jobs != 1:
+            return super(HiddenMarkovModelTagger, self).tag_sents(
+                sentences, n_jobs, chunksize)
+        return self._tag_sents(imap(self._transform, sentences))
+
+    def _tag_sents(self, unlabeled_sequences):
+        tagged = []
+        for batch in _batches(unlabeled_sequences, self.BATCH_SIZE):
+            paths = self._best_paths(batch)
+            tagged.extend(list(izip(seq, path))
+                          for (seq, path) in izip(batch, paths))
+        return tagged
+
     def _output_logprob(self, state, symbol):
         """
         :return: the log probability of the symbol being observed in the given
@@ -325,30 +353,81 @@ class HiddenMarkovModelTagger(TaggerI):
         if symbols:
             self._create_cache()
             P, O, X, S = self._cache
-            for symbol in symbols:
-                if symbol not in self._symbols:
-                    self._cache = None
-                    self._symbols.append(symbol)
+            new_symbols = unique_list(symbol for symbol in symbols
+                                      if symbol not in S)
             # don't bother with the work if there aren't any new symbols
-            if not self._cache:
+            if new_symbols:
                 N = len(self._states)
-                M = len(self._symbols)
                 Q = O.shape[1]
+                self._symbols.extend(new_symbols)
                 # add new columns to the output probability table without
                 # destroying the old probabilities
-                O = np.hstack([O, np.zeros((N, M - Q), np.float32)])
+                O = np.hstack([O, np.zeros((N, len(new_symbols)), np.float32)])
                 for i in range(N):
                     si = self._states[i]
                     # only calculate probabilities for new symbols
-                    for k in range(Q, M):
-                        O[i, k] = self._output_logprob(si, self._symbols[k])
+                    for k, symbol in enumerate(new_symbols):
+                        O[i, Q + k] = self._output_logprob(si, symbol)
                 # only create symbol mappings for new symbols
-                for k in range(Q, M):
-                    S[self._symbols[k]] = k
+                for k, symbol in enumerate(new_symbols):
+                    S[symbol] = Q + k
                 self._cache = (P, O, X, S)
 
+    def _log_matrices(self):
+        """
+        Return a tuple ``(P, X, O, S)`` of float64 arrays of log
+        probabilities, which are used by the forward-backward
+        algorithm, and which are cached until ``reset_cache()`` is
+        called:
+
+          - P[i] = log( P(tag[0]=state[i]) )
+          - X[i,j] = log( P(tag[t]=state[j]|tag[t-1]=state[i]) )
+          - O[i,k] = log( P(token[t]=sym[k]|tag[t]=state[i]) )
+          - S maps each symbol to its column in O.
+        """
+        if self._log_cache is None:
+            states, symbols = self._states, self._symbols
+            P = self._priors.logprob_many(states)
+            X = np.array([self._transitions[si].logprob_many(states)
+                          for si in states]).reshape(len(states), -1)
+            O = np.array([self._outputs[si].logprob_many(symbols)
+                          for si in states]).reshape(len(states), -1)
+            S = dict((symbol, k) for k, symbol in enumerate(symbols))
+            self._log_cache = (P, X, O, S)
+        return self._log_cache
+
+    def _emissions(self, sequences):
+        """
+        Return a B by T by N array ``E`` of output log-probabilities for
+        a batch of B labelled or unlabelled sequences, where T is the
+        length of the longest sequence: ``E[b,t,i]`` is the log
+        probability of emitting ``sequences[b][t][_TEXT]`` in state i.
+        Positions past the end of a sequence are padded with zeros.
+        Also return the lengths of the sequences, as an array.
+        """
+        P, X, O, S = self._log_matrices()
+        lengths = np.array([len(seq) for seq in sequences], int)
+        columns = np.zeros((len(sequences), max(lengths.max(), 1)), int)
+        unknown = {}
+        for b, seq in enumerate(sequences):
+            for t, token in enumerate(seq):
+                symbol = token[_TEXT]
+                k = S.get(symbol)
+                if k is None:
+                    k = unknown.setdefault(symbol, O.shape[1] + len(unknown))
+                columns[b, t] = k
+        if unknown:
+            new_symbols = sorted(unknown, key=unknown.get)
+            O = np.hstack([O, np.array(
+                [[self._output_logprob(si, symbol) for symbol in new_symbols]
+                 for si in self._states])])
+        E = O.T[columns]
+        E[np.arange(columns.shape[1]) >= lengths[:, None]] = 0
+        return E, lengths
+
     def reset_cache(self):
         self._cache = None
+        self._log_cache = None
 
     def best_path(self, unlabeled_sequence):
         """
@@ -365,32 +444,65 @@ class HiddenMarkovModelTagger(TaggerI):
         return self._best_path(unlabeled_sequence)
 
     def _best_path(self, unlabeled_sequence):
-        T = len(unlabeled_sequence)
-        N = len(self._states)
+        return self._best_paths([unlabeled_sequence])[0]
+
+    def best_paths(self, unlabeled_sequences):
+        """
+        Returns the optimal state sequence for each of the given
+        sequences, as ``best_path()`` does.  The sequences are decoded
+        in batches of ``BATCH_SIZE``, by running the Viterbi algorithm
+        over all the sequences of a batch at once.
+
+        :return: a list of state sequences
+        :rtype: list(list)
+        :param unlabeled_sequences: the sequences of unlabeled symbols
+        :type unlabeled_sequences: iter(list)
+        """
+        paths = []
+        for batch in _batches(imap(self._transform, unlabeled_sequences),
+                              self.BATCH_SIZE):
+            paths.extend(self._best_paths(batch))
+        return paths
+
+    def _best_paths(self, unlabeled_sequences):
+        if not unlabeled_sequences:
+            return []
+        lengths = np.array([len(seq) for seq in unlabeled_sequences], int)
+        Bsz, T, N = len(lengths), lengths.max(), len(self._states)
+        if T == 0:
+            return [[] for seq in unlabeled_sequences]
         self._create_cache()
-        self._update_cache(unlabeled_sequence)
+        self._update_cache([symbol for seq in unlabeled_sequences
+                            for symbol in seq])
         P, O, X, S = self._cache
 
-        V = np.zeros((T, N), np.float32)
-        B = -np.ones((T, N), np.int)
+        # The output log probabilities of each symbol, by position.
+        columns = np.zeros((Bsz, T), int)
+        for b, seq in enumerate(unlabeled_sequences):
+            columns[b, :len(seq)] = [S[symbol] for symbol in seq]
+        outputs = O.T[columns]
 
-        V[0] = P + O[:, S[unlabeled_sequence[0]]]
+        V = P + outputs[:, 0]
+        B = np.zeros((T, Bsz, N), int)
         for t in range(1, T):
-            for j in range(N):
-                vs = V[t-1, :] + X[:, j]
-                best = np.argmax(vs)
-                V[t, j] = vs[best] + O[j, S[unlabeled_sequence[t]]]
-                B[t, j] = best
-
-        current = np.argmax(V[T-1,:])
-        sequence = [current]
-        for t in range(T-1, 0, -1):
-            last = B[t, current]
-            sequence.append(last)
-            current = last
-
-        sequence.reverse()
-        return list(map(self._states.__getitem__, sequence))
+            # vs[b,i,j] = V[b,i] + X[i,j]; maximize over i.
+            vs = V[:, :, None] + X
+            B[t] = np.argmax(vs, axis=1)
+            # sequences that have already ended keep their final scores
+            V = np.where((t < lengths)[:, None],
+                         vs.max(axis=1) + outputs[:, t], V)
+
+        # follow the back-pointers from the best final state
+        current = np.argmax(V, axis=1)
+        paths = np.zeros((Bsz, T), int)
+        batch = np.arange(Bsz)
+        for t in range(T-1, -1, -1):
+            paths[:, t] = current
+            current = np.where(t < lengths, B[t, batch, current], current)
+
+        states = self._states
+        return [[states[i] for i in paths[b, :lengths[b]]]
+                for b in range(Bsz)]
 
     def best_path_simple(self, unlabeled_sequence):
         """
@@ -669,24 +781,6 @@ class HiddenMarkovModelTagger(TaggerI):
 
         return entropies
 
-    def _transitions_matrix(self):
-        """ Return a matrix of transition log probabilities. """
-        trans_iter = (self._transitions[sj].logprob(si)
-                      for sj in self._states
-                      for si in self._states)
-
-        transitions_logprob = np.fromiter(trans_iter, dtype=np.float64)
-        N = len(self._states)
-        return transitions_logprob.reshape((N, N)).T
-
-    def _outputs_vector(self, symbol):
-        """
-        Return a vector with log probabilities of emitting a symbol
-        when entering states.
-        """
-        out_iter = (self._output_logprob(sj, symbol) for sj in self._states)
-        return np.fromiter(out_iter, dtype=np.float64)
-
     def _forward_probability(self, unlabeled_sequence):
         """
         Return the forward probability matrix, a T by N array of
@@ -700,28 +794,8 @@ class HiddenMarkovModelTagger(TaggerI):
         :return: the forward log probability matrix
         :rtype: array
         """
-        T = len(unlabeled_sequence)
-        N = len(self._states)
-        alpha = _ninf_array((T, N))
-
-        transitions_logprob = self._transitions_matrix()
-
-        # Initialization
-        symbol = unlabeled_sequence[0][_TEXT]
-        for i, state in enumerate(self._states):
-            alpha[0, i] = self._priors.logprob(state) + \
-                          self._output_logprob(state, symbol)
-
-        # Induction
-        for t in range(1, T):
-            symbol = unlabeled_sequence[t][_TEXT]
-            output_logprob = self._outputs_vector(symbol)
-
-            for i in range(N):
-                summand = alpha[t-1] + transitions_logprob[i]
-                alpha[t, i] = logsumexp2(summand) + output_logprob[i]
-
-        return alpha
+        E, lengths = self._emissions([unlabeled_sequence])
+        return self._forward_batch(E, lengths)[0, :len(unlabeled_sequence)]
 
     def _backward_probability(self, unlabeled_sequence):
         """
@@ -736,25 +810,58 @@ class HiddenMarkovModelTagger(TaggerI):
         :param unlabeled_sequence: the sequence of unlabeled symbols
         :type unlabeled_sequence: list
         """
-        T = len(unlabeled_sequence)
-        N = len(self._states)
-        beta = _ninf_array((T, N))
+        E, lengths = self._emissions([unlabeled_sequence])
+        return self._backward_batch(E, lengths)[0, :len(unlabeled_sequence)]
 
-        transitions_logprob = self._transitions_matrix().T
+    def _forward_batch(self, E, lengths):
+        """
+        Return the forward probability matrices of a batch of sequences,
+        as a B by T by N array, given their output log-probabilities
+        ``E`` and lengths (see ``_emissions()``).  Entries past the end
+        of a sequence are undefined.
+
+        The induction is done in linear space, by multiplying by the
+        transition matrix, after rescaling each row of probabilities so
+        that its largest value is 1; the (log) scale factors are added
+        back to give the log probabilities.
+        """
+        P, X, O, S = self._log_matrices()
+        A = 2**X
+        E_max, e = _rescale(E)
+        alpha = np.empty(E.shape, np.float64)
+        alpha[:, 0] = P + E[:, 0]
+        scale, a = _rescale(alpha[:, 0])
+        for t in range(1, E.shape[1]):
+            # sum over the previous state i of alpha[b,t-1,i] * A[i,j]
+            u_max, a = _rescale(np.dot(a, A) * e[:, t], log=False)
+            scale = scale + u_max + E_max[:, t]
+            with np.errstate(divide='ignore'):
+                alpha[:, t] = np.log2(a) + scale[:, None]
+        return alpha
 
-        # initialise the backward values;
+    def _backward_batch(self, E, lengths):
+        """
+        Return the backward probability matrices of a batch of
+        sequences, as a B by T by N array, given their output
+        log-probabilities ``E`` and lengths (see ``_emissions()``).
+        Entries past the end of a sequence are zero.  The induction is
+        done in linear space, as in ``_forward_batch()``.
+        """
+        P, X, O, S = self._log_matrices()
+        A = 2**X
+        E_max, e = _rescale(E)
         # "1" is an arbitrarily chosen value from Rabiner tutorial
-        beta[T-1, :] = np.log2(1)
-
-        # inductively calculate remaining backward values
-        for t in range(T-2, -1, -1):
-            symbol = unlabeled_sequence[t+1][_TEXT]
-            outputs = self._outputs_vector(symbol)
-
-            for i in range(N):
-                summand = transitions_logprob[i] + beta[t+1] + outputs
-                beta[t, i] = logsumexp2(summand)
-
+        beta = np.zeros(E.shape, np.float64)
+        scale = np.zeros(E.shape[0])
+        b = np.ones(E.shape[::2])
+        for t in range(E.shape[1]-2, -1, -1):
+            # sum over the next state j of A[i,j] * E[b,t+1,j] * beta[b,t+1,j]
+            u_max, u = _rescale(np.dot(e[:, t+1] * b, A.T), log=False)
+            active = t < lengths - 1
+            b = np.where(active[:, None], u, 1)
+            scale = np.where(active, scale + u_max + E_max[:, t+1], 0)
+            with np.errstate(divide='ignore'):
+                beta[:, t] = np.log2(b) + scale[:, None]
         return beta
 
     def test(self, test_sequence, verbose=False, **kwargs):
@@ -778,7 +885,7 @@ class HiddenMarkovModelTagger(TaggerI):
             return list(itertools.chain(*seq))
 
         test_sequence = self._transform(test_sequence)
-        predicted_sequence = list(imap(self._tag, imap(words, test_sequence)))
+        predicted_sequence = self._tag_sents(imap(words, test_sequence))
 
         if verbose:
             for test_sent, predicted_sent in izip(test_sequence, predicted_sequence):
@@ -856,47 +963,72 @@ class HiddenMarkovModelTrainer(object):
         return model
 
 
-    def _baum_welch_step(self, sequence, model, symbol_to_number):
-
+    def _baum_welch_batch(self, sequences, model, symbol_to_number):
+        """
+        Return the log probability of a batch of sequences, and the
+        logarithms of the expected transition and emission counts, summed
+        over the batch: ``(logprob, A_numer, A_denom, B_numer, B_denom)``.
+        The forward and backward probabilities of all the sequences are
+        computed at once, and the expected counts are accumulated with
+        a few array operations over the whole batch.
+        """
         N = len(model._states)
         M = len(model._symbols)
-        T = len(sequence)
-
-        # compute forward and backward probabilities
-        alpha = model._forward_probability(sequence)
-        beta = model._backward_probability(sequence)
-
-        # find the log probability of the sequence
-        lpk = logsumexp2(alpha[T-1])
-
-        A_numer = _ninf_array((N, N))
-        B_numer = _ninf_array((N, M))
-        A_denom = _ninf_array(N)
-        B_denom = _ninf_array(N)
 
-        transitions_logprob = model._transitions_matrix().T
-
-        for t in range(T):
-            symbol = sequence[t][_TEXT]  # not found? FIXME
-            next_symbol = None
-            if t < T - 1:
-                next_symbol = sequence[t+1][_TEXT]  # not found? FIXME
-            xi = symbol_to_number[symbol]
-
-            next_outputs_logprob = model._outputs_vector(next_symbol)
-            alpha_plus_beta = alpha[t] + beta[t]
-
-            if t < T - 1:
-                numer_add = transitions_logprob + next_outputs_logprob + \
-                            beta[t+1] + alpha[t].reshape(N, 1)
-                A_numer = np.logaddexp2(A_numer, numer_add)
-                A_denom = np.logaddexp2(A_denom, alpha_plus_beta)
-            else:
-                B_denom = np.logaddexp2(A_denom, alpha_plus_beta)
-
-            B_numer[:,xi] = np.logaddexp2(B_numer[:,xi], alpha_plus_beta)
+        E, lengths = model._emissions(sequences)
+        P, X, O, S = model._log_matrices()
+        alpha = model._forward_batch(E, lengths)
+        beta = model._backward_batch(E, lengths)
+        Bsz, T = E.shape[:2]
+        batch = np.arange(Bsz)
+
+        # find the log probability of each sequence
+        lpk = _logsumexp2(alpha[batch, lengths-1], 1)
+
+        # the positions within each sequence, and those with a successor
+        steps = np.arange(T)
+        inside = steps < lengths[:, None]
+        before_end = steps < lengths[:, None] - 1
+
+        # gamma[b,t,i] is the posterior probability of state i at time t
+        with np.errstate(over='ignore', invalid='ignore'):
+            gamma = np.where(inside[:, :, None],
+                             2**(alpha + beta - lpk[:, None, None]), 0)
+
+        A_denom = (gamma * before_end[:, :, None]).sum(axis=(0, 1))
+        B_denom = gamma.sum(axis=(0, 1))
+        symbols = np.zeros((Bsz, T), int)
+        for b, seq in enumerate(sequences):
+            symbols[b, :len(seq)] = [symbol_to_number[token[_TEXT]]
+                                     for token in seq]
+        B_numer = np.array([np.bincount(symbols.ravel(),
+                                        gamma[:, :, i].ravel(), M)
+                            for i in range(N)]).reshape(N, M)
+
+        # The expected number of transitions from state i to j is the sum
+        # over t of alpha[t,i] * X[i,j] * E[t+1,j] * beta[t+1,j] / p(O).
+        # The alpha and E*beta terms are scaled by their maxima at each t,
+        # so that their outer products can be summed in linear space.
+        if T > 1:
+            mask = before_end[:, :-1, None]
+            a_log = np.where(mask, alpha[:, :-1], -np.inf)
+            g_log = np.where(mask, E[:, 1:] + beta[:, 1:], -np.inf)
+            a_max = a_log.max(axis=2)
+            g_max = g_log.max(axis=2)
+            a_max[np.isinf(a_max)] = 0
+            g_max[np.isinf(g_max)] = 0
+            with np.errstate(over='ignore'):
+                scale = np.where(before_end[:, :-1],
+                                 2**(a_max + g_max - lpk[:, None]), 0)
+            a = 2**(a_log - a_max[:, :, None]) * scale[:, :, None]
+            g = 2**(g_log - g_max[:, :, None])
+            A_numer = np.dot(a.reshape(-1, N).T, g.reshape(-1, N)) * 2**X
+        else:
+            A_numer = np.zeros((N, N))
 
-        return lpk, A_numer, A_denom, B_numer, B_denom
+        with np.errstate(divide='ignore'):
+            return (lpk.sum(), np.log2(A_numer), np.log2(A_denom),
+                    np.log2(B_numer), np.log2(B_denom))
 
     def train_unsupervised(self, unlabeled_sequences, update_outputs=True,
                            **kwargs):
@@ -921,6 +1053,8 @@ class HiddenMarkovModelTrainer(object):
         :param max_iterations: the maximum number of EM iterations
         :param convergence_logprob: the maximum change in log probability to
             allow convergence
+        :param batch_size: the number of sequences whose expected counts
+            are computed at once
         """
 
         # create a uniform HMM, which will be iteratively refined, unless
@@ -964,6 +1098,7 @@ class HiddenMarkovModelTrainer(object):
         iteration = 0
         max_iterations = kwargs.get('max_iterations', 1000)
         epsilon = kwargs.get('convergence_logprob', 1e-6)
+        batch_size = kwargs.get('batch_size', 64)
 
         while not converged and iteration < max_iterations:
             A_numer = _ninf_array((N, N))
@@ -972,21 +1107,18 @@ class HiddenMarkovModelTrainer(object):
             B_denom = _ninf_array(N)
 
             logprob = 0
-            for sequence in unlabeled_sequences:
-                sequence = list(sequence)
-                if not sequence:
-                    continue
-
-                (lpk, seq_A_numer, seq_A_denom,
-                seq_B_numer, seq_B_denom) = self._baum_welch_step(sequence, model, symbol_numbers)
+            sequences = (list(sequence) for sequence in unlabeled_sequences)
+            for batch in _batches((sequence for sequence in sequences
+                                   if sequence), batch_size):
+                (lpk, batch_A_numer, batch_A_denom,
+                batch_B_numer, batch_B_denom) = self._baum_welch_batch(
+                    batch, model, symbol_numbers)
 
                 # add these sums to the global A and B values
-                for i in range(N):
-                    A_numer[i] = np.logaddexp2(A_numer[i], seq_A_numer[i]-lpk)
-                    B_numer[i] = np.logaddexp2(B_numer[i], seq_B_numer[i]-lpk)
-
-                A_denom = np.logaddexp2(A_denom, seq_A_denom-lpk)
-                B_denom = np.logaddexp2(B_denom, seq_B_denom-lpk)
+                A_numer = np.logaddexp2(A_numer, batch_A_numer)
+                B_numer = np.logaddexp2(B_numer, batch_B_numer)
+                A_denom = np.logaddexp2(A_denom, batch_A_denom)
+                B_denom = np.logaddexp2(B_denom, batch_B_denom)
 
                 logprob += lpk
 
@@ -1019,6 +1151,9 @@ class HiddenMarkovModelTrainer(object):
                 # Rabiner says the priors don't need to be updated. I don't
                 # believe him. FIXME
 
+            # the cached log probability matrices are now out of date
+            model.reset_cache()
+
             # test for convergence
             if iteration > 0 and abs(logprob - last_logprob) < epsilon:
                 converged = True
@@ -1101,6 +1236,34 @@ def logsumexp2(arr):
     return np.log2(np.sum(2**(arr - max_))) + max_
 
 
+def _rescale(arr, log=True):
+    """
+    Divide the values in the last axis of ``arr`` by their maximum, and
+    return the base 2 logarithms of the maxima and the rescaled values.
+    If ``log`` is true, ``arr`` contains log probabilities, and they are
+    rescaled and converted to probabilities.  Rows whose maximum is zero
+    (or ``-inf``) are left unscaled.
+    """
+    max_ = arr.max(axis=-1)
+    if log:
+        max_[np.isinf(max_)] = 0
+        return max_, 2**(arr - max_[..., None])
+    max_[max_ == 0] = 1
+    return np.log2(max_), arr / max_[..., None]
+
+
+def _logsumexp2(arr, axis):
+    """
+    Return ``logsumexp2`` of ``arr`` along the given axis.  Slices that
+    are entirely ``-inf`` give ``-inf``.
+    """
+    max_ = arr.max(axis=axis)
+    max_[np.isinf(max_)] = 0
+    with np.errstate(divide='ignore'):
+        return np.log2(np.sum(2**(arr - np.expand_dims(max_, axis)),
+                              axis=axis)) + max_
+
+
 def _log_add(*values):
     """
     Adds the logged values, returning the logarithm of the addition.
@@ -1115,6 +1278,18 @@ def _log_add(*values):
         return x
 
 
+def _batches(items, size):
+    """Yield lists of (up to) ``size`` consecutive items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 def _create_hmm_tagger(states, symbols, A, B, pi):
     def pd(values, samples):
         d = dict(zip(samples, values))
@@ -17,6 +17,11 @@ from collections import defaultdict
 import pickle
 import logging
 
+try:
+    import numpy
+except ImportError:
+    pass
+
 from nltk.tag.api import TaggerI
 from nltk.data import find, load
 from nltk.compat import python_2_unicode_compatible
@@ -95,6 +100,82 @@ class AveragedPerceptron(object):
         '''Load the pickled model weights.'''
         self.weights = load(path)
 
+    def compile(self):
+        '''
+        Return a ``DenseAveragedPerceptron`` that makes the same
+        predictions as this model, using a frozen copy of its current
+        weights.  Requires numpy.
+        '''
+        return DenseAveragedPerceptron(self.weights, self.classes)
+
+class DenseAveragedPerceptron(object):
+
+    '''
+    A read-only averaged perceptron that stores its weights as a dense
+    numpy matrix, with one row per feature and one column per class,
+    so that the score of every class can be computed with a handful of
+    array operations instead of a loop over dictionaries.  Features are
+    mapped to rows with a dictionary (features that have no weights
+    share an all-zero row).
+
+    The scores are summed in the same order, and ties are broken in the
+    same way, as ``AveragedPerceptron.predict``, so the predictions of
+    the two models are identical.
+    '''
+
+    def __init__(self, weights, classes):
+        # Classes are sorted in reverse order, so that argmax (which
+        # returns the first maximum) prefers the alphabetically greatest
+        # label, just like AveragedPerceptron.predict.
+        self.classes = sorted(classes, reverse=True)
+        columns = dict((label, j) for j, label in enumerate(self.classes))
+        self.rows = {}
+        row_index, col_index, values = [], [], []
+        for feat, feat_weights in weights.items():
+            cells = [(columns[label], weight)
+                     for label, weight in feat_weights.items()
+                     if label in columns and weight]
+            if not cells:
+                continue
+            row = self.rows[feat] = len(self.rows) + 1
+            for col, weight in cells:
+                row_index.append(row)
+                col_index.append(col)
+                values.append(weight)
+        # Row 0 is the all-zero row used for unknown features.
+        self.weights = numpy.zeros((len(self.rows) + 1, len(self.classes)))
+        self.weights[row_index, col_index] = values
+
+    def predict(self, features):
+        '''Return the best label for a single feature dictionary.'''
+        return self.predict_many([features])[0]
+
+    def predict_many(self, featuresets):
+        '''
+        Return the best label for each of a list of feature
+        dictionaries, scoring them all at once.
+        '''
+        if not featuresets:
+            return []
+        rows = self.rows
+        index = [[rows.get(feat, 0) for feat in features]
+                 for features in featuresets]
+        scale = [list(features.values()) for features in featuresets]
+        width = max(len(row_list) for row_list in index)
+        # Pad short feature lists with the zero row, which leaves the
+        # (sequentially summed) scores unchanged.
+        for row_list, values in zip(index, scale):
+            if len(row_list) < width:
+                row_list.extend([0] * (width - len(row_list)))
+                values.extend([0] * (width - len(values)))
+        index = numpy.array(index, dtype=int).reshape(len(index), width)
+        scale = numpy.array(scale, dtype=float).reshape(index.shape)
+        feature_weights = self.weights[index]
+        if (scale != 1).any():
+            feature_weights *= scale[:, :, None]
+        scores = feature_weights.sum(axis=1)
+        return [self.classes[j] for j in scores.argmax(axis=1)]
+
 @python_2_unicode_compatible
 class PerceptronTagger(TaggerI):
 
@@ -114,6 +195,13 @@ class PerceptronTagger(TaggerI):
     
     >>> tagger.tag(['today','is','a','beautiful','day'])
     [('today', 'NN'), ('is', 'PRP'), ('a', 'PRP'), ('beautiful', 'JJ'), ('day', 'NN')]
+
+    Compile the model's weights into a dense matrix, for faster tagging
+    (requires numpy).  The tags are unchanged.
+
+    >>> tagger.compile()
+    >>> tagger.tag_sents([['today','is','a','beautiful','day'], ['yes']])
+    [[('today', 'NN'), ('is', 'PRP'), ('a', 'PRP'), ('beautiful', 'JJ'), ('day', 'NN')], [('yes', 'NNS')]]
     
     Use the pretrain model (the default constructor) 
     
@@ -129,17 +217,44 @@ class PerceptronTagger(TaggerI):
     START = ['-START-', '-START2-']
     END = ['-END-', '-END2-']
     
-    def __init__(self, load=True):
+    BATCH_SIZE = 256
+    """The number of sentences that ``tag_sents`` tags at once, when
+       the tagger is compiled."""
+
+    def __init__(self, load=True, compiled=False):
         '''
         :param load: Load the pickled model upon instantiation.
+        :param compiled: Tag with a ``DenseAveragedPerceptron`` compiled
+            from the model (see ``compile()``).
         '''
         self.model = AveragedPerceptron()
         self.tagdict = {}
         self.classes = set()
+        self.compiled = compiled
+        self._dense_model = None
         if load:
             AP_MODEL_LOC = str(find('taggers/averaged_perceptron_tagger/'+PICKLE))
             self.load(AP_MODEL_LOC)
 
+    def compile(self):
+        '''
+        Freeze the model's weights into a dense matrix, and use it for
+        all subsequent tagging.  This produces exactly the same tags,
+        several times faster, especially when many sentences are tagged
+        at once with ``tag_sents()``.  The compiled weights are rebuilt
+        automatically after the tagger is retrained or reloaded.
+        Requires numpy.
+        '''
+        self.compiled = True
+        self._dense_model = self.model.compile()
+
+    def _predictor(self):
+        if not self.compiled:
+            return self.model
+        if self._dense_model is None:
+            self._dense_model = self.model.compile()
+        return self._dense_model
+
     def tag(self, tokens):
         '''
         Tag tokenized sentences.
@@ -148,19 +263,69 @@ class PerceptronTagger(TaggerI):
         '''
         prev, prev2 = self.START
         output = []
+        model = self._predictor()
         
         context = self.START + [self.normalize(w) for w in tokens] + self.END
         for i, word in enumerate(tokens):
             tag = self.tagdict.get(word)
             if not tag:
                 features = self._get_features(i, word, context, prev, prev2)
-                tag = self.model.predict(features)
+                tag = model.predict(features)
             output.append((word, tag))
             prev2 = prev
             prev = tag
 
         return output
 
+    def tag_sents(self, sentences, n_jobs=1, chunksize=100):
+        '''
+        Tag a sequence of tokenized sentences.  If the tagger is
+        compiled, the sentences are tagged in batches of
+        ``BATCH_SIZE``, scoring the i-th word of every sentence in the
+        batch together.  See ``TaggerI.tag_sents()`` for ``n_jobs``
+        and ``chunksize``.
+        '''
+        if not self.compiled or n_jobs != 1:
+            return super(PerceptronTagger, self).tag_sents(
+                sentences, n_jobs, chunksize)
+        output = []
+        batch = []
+        for sent in sentences:
+            batch.append(list(sent))
+            if len(batch) == self.BATCH_SIZE:
+                output.extend(self._tag_batch(batch))
+                batch = []
+        output.extend(self._tag_batch(batch))
+        return output
+
+    def _tag_batch(self, sentences):
+        model = self._predictor()
+        contexts = [self.START + [self.normalize(w) for w in sent] + self.END
+                    for sent in sentences]
+        output = [[] for sent in sentences]
+        history = [self.START[:] for sent in sentences]
+        for i in range(max([len(sent) for sent in sentences] or [0])):
+            untagged = []
+            featuresets = []
+            for s, sent in enumerate(sentences):
+                if i >= len(sent):
+                    continue
+                word = sent[i]
+                tag = self.tagdict.get(word)
+                if tag:
+                    output[s].append((word, tag))
+                else:
+                    prev, prev2 = history[s]
+                    untagged.append(s)
+                    featuresets.append(self._get_features(
+                        i, word, contexts[s], prev, prev2))
+            for s, tag in zip(untagged, model.predict_many(featuresets)):
+                output[s].append((sentences[s][i], tag))
+            for s, sent in enumerate(sentences):
+                if i < len(sent):
+                    history[s] = [output[s][i][1], history[s][0]]
+        return output
+
     def train(self, sentences, save_loc=None, nr_iter=5):
         '''Train a model from sentences, and save it at ``save_loc``. ``nr_iter``
         controls the number of Perceptron training iterations.
@@ -171,6 +336,7 @@ class PerceptronTagger(TaggerI):
         '''
         self._make_tagdict(sentences)
         self.model.classes = self.classes
+        self._dense_model = None
         for iter_ in range(nr_iter):
             c = 0
             n = 0
@@ -208,6 +374,7 @@ class PerceptronTagger(TaggerI):
 
         self.model.weights, self.tagdict, self.classes = load(loc)
         self.model.classes = self.classes
+        self._dense_model = None
         
 
     def normalize(self, word):
@@ -38,18 +38,24 @@ The input is:
 """
 
 from nltk.compat import python_2_unicode_compatible
-from nltk.classify import Senna
+from nltk.classify.senna import Senna
+from nltk.tag.api import TaggerI
 
 @python_2_unicode_compatible
 class SennaTagger(Senna):
     def __init__(self, path, encoding='utf-8'):
         super(SennaTagger, self).__init__(path, ['pos'], encoding)
 
-    def tag_sents(self, sentences):
+    def tag_sents(self, sentences, n_jobs=1, chunksize=100):
         """
         Applies the tag method over a list of sentences. This method will return
         for each sentence a list of tuples of (word, tag).
+        See ``TaggerI.tag_sents()`` for ``n_jobs`` and ``chunksize``.
         """
+        if n_jobs != 1:
+            # The workers call this method, so bypass Senna.tag_sents()
+            # to convert each sentence only once.
+            return TaggerI.tag_sents(self, sentences, n_jobs, chunksize)
         tagged_sents = super(SennaTagger, self).tag_sents(sentences)
         for i in range(len(tagged_sents)):
             for j in range(len(tagged_sents[i])):
@@ -62,11 +68,16 @@ class SennaChunkTagger(Senna):
     def __init__(self, path, encoding='utf-8'):
         super(SennaChunkTagger, self).__init__(path, ['chk'], encoding)
 
-    def tag_sents(self, sentences):
+    def tag_sents(self, sentences, n_jobs=1, chunksize=100):
         """
         Applies the tag method over a list of sentences. This method will return
         for each sentence a list of tuples of (word, tag).
+        See ``TaggerI.tag_sents()`` for ``n_jobs`` and ``chunksize``.
         """
+        if n_jobs != 1:
+            # The workers call this method, so bypass Senna.tag_sents()
+            # to convert each sentence only once.
+            return TaggerI.tag_sents(self, sentences, n_jobs, chunksize)
         tagged_sents = super(SennaChunkTagger, self).tag_sents(sentences)
         for i in range(len(tagged_sents)):
             for j in range(len(tagged_sents[i])):
@@ -121,11 +132,16 @@ class SennaNERTagger(Senna):
     def __init__(self, path, encoding='utf-8'):
         super(SennaNERTagger, self).__init__(path, ['ner'], encoding)
 
-    def tag_sents(self, sentences):
+    def tag_sents(self, sentences, n_jobs=1, chunksize=100):
         """
         Applies the tag method over a list of sentences. This method will return
         for each sentence a list of tuples of (word, tag).
+        See ``TaggerI.tag_sents()`` for ``n_jobs`` and ``chunksize``.
         """
+        if n_jobs != 1:
+            # The workers call this method, so bypass Senna.tag_sents()
+            # to convert each sentence only once.
+            return TaggerI.tag_sents(self, sentences, n_jobs, chunksize)
         tagged_sents = super(SennaNERTagger, self).tag_sents(sentences)
         for i in range(len(tagged_sents)):
             for j in range(len(tagged_sents[i])):
@@ -82,6 +82,17 @@ class SequentialBackoffTagger(TaggerI):
             if tag is not None:  break
         return tag
 
+    def compile(self):
+        """
+        Return a ``CompiledBackoffTagger`` that assigns the same tags
+        as this tagger, but looks up the tags that are chosen by the
+        n-gram taggers at the start of its backoff chain in a single
+        merged table.
+
+        :rtype: CompiledBackoffTagger
+        """
+        return CompiledBackoffTagger(self)
+
     def choose_tag(self, tokens, index, history):
         """
         Decide which tag should be used for the specified token, and
@@ -559,6 +570,163 @@ class RegexpTagger(SequentialBackoffTagger):
         return '<Regexp Tagger: size=%d>' % self._size
 
 
+@python_2_unicode_compatible
+class CompiledBackoffTagger(SequentialBackoffTagger):
+    """
+    A tagger that assigns the same tags as a chain of backoff taggers,
+    such as a ``TrigramTagger`` that backs off to a ``BigramTagger``,
+    a ``UnigramTagger`` and a ``DefaultTagger``, but which looks up
+    the tag for each token in a single table rather than asking each
+    tagger in turn.
+
+        >>> from nltk.tag import DefaultTagger, UnigramTagger, BigramTagger
+        >>> train = [[('the', 'DT'), ('can', 'NN'), ('rusts', 'VBZ')],
+        ...          [('we', 'PRP'), ('can', 'MD'), ('go', 'VB')],
+        ...          [('they', 'PRP'), ('can', 'MD'), ('see', 'VB')]]
+        >>> tagger = BigramTagger(train, backoff=UnigramTagger(train,
+        ...     backoff=DefaultTagger('NN')))
+        >>> compiled = tagger.compile()
+        >>> compiled
+        <CompiledBackoffTagger: size=8, backoff=<DefaultTagger: tag=NN>>
+        >>> compiled.tag('the can rusts'.split())
+        [('the', 'DT'), ('can', 'NN'), ('rusts', 'VBZ')]
+        >>> compiled.tag('the can rusts'.split()) == tagger.tag('the can rusts'.split())
+        True
+
+    The table is a trie, which maps each word to a node; each node
+    maps the tag of the preceding token to a child node, which maps the
+    tag of the token before that to a grandchild, and so on.  Every
+    node records the tag that the chain would choose, given only the
+    tags on the path to it.  Contexts that only occur at the start of
+    a sentence (where an n-gram tagger has fewer than n-1 tags of
+    history) are kept separately, so that they are not confused with
+    the shorter contexts of lower-order taggers.
+
+    Only the ``NgramTagger`` and ``UnigramTagger`` instances at the
+    start of the backoff chain are compiled; the compiled tagger backs
+    off to the remaining taggers, if any.  Compiled taggers can be
+    pickled.
+
+    :ivar _table: A dictionary mapping each word to the root of its
+        trie.  A node is a list ``[tag, children, start_tag]``, where
+        ``children`` maps a tag to a node, and ``start_tag`` is the tag
+        to use when the path to the node spans the whole sentence
+        history (or None).
+    """
+    def __init__(self, tagger):
+        """
+        :param tagger: The first tagger of the backoff chain to compile.
+        :type tagger: SequentialBackoffTagger
+        """
+        tables = []
+        for t in tagger._taggers:
+            table = _ngram_table(t)
+            if table is None:
+                break
+            tables.append(table)
+        tail = tagger._taggers[len(tables):]
+        SequentialBackoffTagger.__init__(self, tail[0] if tail else None)
+        self._table = _compile_ngram_chain(tables)
+        self._size = sum(len(table) for (n, table) in tables)
+
+    def choose_tag(self, tokens, index, history):
+        node = self._table.get(tokens[index])
+        if node is None:
+            return None
+        # Follow the history backwards, for as long as the trie does.
+        while True:
+            if index == 0:
+                return node[2] if node[2] is not None else node[0]
+            child = node[1].get(history[index-1])
+            if child is None:
+                return node[0]
+            node = child
+            index -= 1
+
+    def tag(self, tokens):
+        # docs inherited from TaggerI
+        if len(self._taggers) == 2 and isinstance(self.backoff, DefaultTagger):
+            default = self.backoff._tag
+            tags = []
+            for i in range(len(tokens)):
+                tag = self.choose_tag(tokens, i, tags)
+                tags.append(default if tag is None else tag)
+            return list(zip(tokens, tags))
+        return SequentialBackoffTagger.tag(self, tokens)
+
+    def size(self):
+        """
+        :return: The total number of entries in the context-to-tag
+            tables of the compiled taggers.
+        """
+        return self._size
+
+    def __repr__(self):
+        return '<CompiledBackoffTagger: size=%d, backoff=%r>' % (
+            self._size, self.backoff)
+
+def _ngram_table(tagger):
+    """
+    If ``tagger`` is an n-gram tagger, whose context is computed by
+    ``NgramTagger.context()`` or ``UnigramTagger.context()``, return
+    ``(n, table)``, where ``table`` maps ``(tags, word)`` contexts to
+    tags; otherwise, return None.
+    """
+    context = getattr(type(tagger), 'context', None)
+    context = getattr(context, '__func__', context)
+    if context is getattr(UnigramTagger.context, '__func__',
+                          UnigramTagger.context):
+        return 1, dict((((), word), tag) for (word, tag)
+                       in tagger._context_to_tag.items())
+    if context is getattr(NgramTagger.context, '__func__',
+                          NgramTagger.context):
+        return tagger._n, tagger._context_to_tag
+    return None
+
+def _compile_ngram_chain(tables):
+    """
+    Build the trie used by ``CompiledBackoffTagger``, from a list of
+    ``(n, table)`` pairs (see ``_ngram_table()``), in backoff order.
+    """
+    # The contexts (most recent tag first) that occur for each word,
+    # and whether they only occur at the start of a sentence.
+    paths = set()
+    for n, table in tables:
+        for (tags, word), tag in table.items():
+            if tag is not None:
+                paths.add((word, tuple(reversed(tags)), len(tags) < n-1))
+
+    def resolve(word, path, anchored):
+        # The tag chosen by the chain, when the history ends with the
+        # tags on ``path``, and either starts with them (if anchored)
+        # or has no longer context in any table.
+        history = tuple(reversed(path))
+        for n, table in tables:
+            if len(path) >= n-1:
+                tag = table.get((history[len(path)-n+1:], word))
+            elif anchored:
+                tag = table.get((history, word))
+            else:
+                continue
+            if tag is not None:
+                return tag
+        return None
+
+    trie = {}
+    for word, path, anchored in paths:
+        node = trie.get(word)
+        if node is None:
+            node = trie[word] = [resolve(word, (), False), {}, None]
+        for depth in range(len(path)):
+            child = node[1].get(path[depth])
+            if child is None:
+                child = node[1][path[depth]] = [
+                    resolve(word, path[:depth+1], False), {}, None]
+            node = child
+        if anchored:
+            node[2] = resolve(word, path, True)
+    return trie
+
 @python_2_unicode_compatible
 class ClassifierBasedTagger(SequentialBackoffTagger, FeaturesetTaggerI):
     """
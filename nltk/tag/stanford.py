@@ -70,7 +70,14 @@ class StanfordTagger(TaggerI):
         # This function should return list of tuple rather than list of list 
         return sum(self.tag_sents([tokens]), []) 
 
-    def tag_sents(self, sentences):
+    def tag_sents(self, sentences, n_jobs=1, chunksize=100):
+        """
+        Tag each of the given sentences with a single run of the Stanford
+        tagger.  See ``TaggerI.tag_sents()`` for ``n_jobs`` and ``chunksize``.
+        """
+        if n_jobs != 1:
+            return super(StanfordTagger, self).tag_sents(sentences, n_jobs,
+                                                         chunksize)
         encoding = self._encoding
         default_options = ' '.join(_java_options)
         config_java(options=self.java_options, verbose=False)
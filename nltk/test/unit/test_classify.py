@@ -32,12 +32,12 @@ RESULTS = [
     (0.76,  0.24),
 ]
 
-def assert_classifier_correct(algorithm):
+def assert_classifier_correct(algorithm, **kwargs):
     try:
         classifier = classify.MaxentClassifier.train(
-            TRAIN, algorithm, trace=0, max_iter=1000
+            TRAIN, algorithm, trace=0, max_iter=1000, **kwargs
         )
-    except (LookupError, AttributeError) as e:
+    except (LookupError, AttributeError, ImportError) as e:
         raise SkipTest(str(e))
 
     for (px, py), featureset in zip(RESULTS, TEST):
@@ -51,3 +51,104 @@ def test_megam():
 
 def test_tadm():
     assert_classifier_correct('TADM')
+
+def test_lbfgs():
+    assert_classifier_correct('LBFGS')
+
+def test_sparse_iterative_scaling():
+    # Training from a sparse design matrix gives the same weights.
+    for algorithm in ('GIS', 'IIS'):
+        assert_classifier_correct(algorithm, sparse=True)
+        dense = classify.MaxentClassifier.train(
+            TRAIN, algorithm, trace=0, max_iter=20)
+        sparse = classify.MaxentClassifier.train(
+            TRAIN, algorithm, trace=0, max_iter=20, sparse=True)
+        for (w1, w2) in zip(dense.weights(), sparse.weights()):
+            assert w1 == w2 or abs(w1 - w2) < 1e-9, (w1, w2)
+
+def _random_featuresets(seed, n):
+    import random
+    rng = random.Random(seed)
+    labeled_featuresets = []
+    for i in range(n):
+        featureset = dict(('f%d' % rng.randint(0, 9),
+                           rng.choice([0, 1, 2, 'a', None]))
+                          for j in range(rng.randint(1, 6)))
+        label = 'x' if featureset.get('f1') else rng.choice('xyz')
+        labeled_featuresets.append((featureset, label))
+    return labeled_featuresets
+
+def _tree_structure(tree):
+    if tree is None:
+        return None
+    decisions = sorted((repr(fval), _tree_structure(subtree))
+                       for (fval, subtree) in (tree._decisions or {}).items())
+    return (tree._label, tree._fname, decisions,
+            _tree_structure(getattr(tree, '_default', None)))
+
+def test_decision_tree_split_search():
+    # The split search chooses the same stumps as best_stump() and
+    # best_binary_stump(); and parallel training grows the same tree.
+    DecisionTreeClassifier = classify.DecisionTreeClassifier
+    for seed in range(10):
+        train = _random_featuresets(seed, 200)
+        feature_values = {}
+        for featureset, label in train:
+            for fname, fval in featureset.items():
+                feature_values.setdefault(fname, set()).add(fval)
+        # Ties are won by the first feature in the set's iteration
+        # order, so the set is built the way train() builds it.
+        feature_names = set()
+        for featureset, label in train:
+            for fname in featureset:
+                feature_names.add(fname)
+        for binary in (False, True):
+            if binary:
+                expected = DecisionTreeClassifier.best_binary_stump(
+                    feature_names, train, feature_values)
+            else:
+                expected = DecisionTreeClassifier.best_stump(
+                    feature_names, train)
+            tree = DecisionTreeClassifier.train(
+                train, binary=binary, depth_cutoff=1)
+            assert _tree_structure(tree) == _tree_structure(expected)
+
+            tree = DecisionTreeClassifier.train(
+                train, binary=binary, support_cutoff=2)
+            parallel = DecisionTreeClassifier.train(
+                train, binary=binary, support_cutoff=2, n_jobs=2)
+            assert _tree_structure(tree) == _tree_structure(parallel)
+
+def test_sklearn_train_stream():
+    try:
+        from sklearn.naive_bayes import MultinomialNB
+        from sklearn.linear_model import LogisticRegression
+    except ImportError:
+        raise SkipTest('scikit-learn is not installed')
+    from nltk.classify.scikitlearn import SklearnClassifier
+    train = [(dict((k, v) for (k, v) in featureset.items() if v is not None),
+              label) for (featureset, label) in _random_featuresets(0, 300)]
+    test = [featureset for (featureset, label) in train[:50]]
+
+    def probs(classifier):
+        return [[round(pdist.prob(label), 8) for label in 'xyz']
+                for pdist in classifier.prob_classify_many(test)]
+
+    # Naive Bayes supports partial_fit; logistic regression doesn't.
+    for estimator in (MultinomialNB, LogisticRegression):
+        expected = probs(SklearnClassifier(estimator()).train(train))
+        streamed = SklearnClassifier(estimator())
+        streamed.BATCH_SIZE = 7
+        streamed.train_stream(train, batch_size=40)
+        assert probs(streamed) == expected
+
+    hashed = SklearnClassifier(MultinomialNB()).train_stream(
+        iter(train), labels='xyz', n_features=2**12, batch_size=40)
+    assert hashed.classify_many(test) == [pdist.max() for pdist in
+                                          hashed.prob_classify_many(test)]
+    try:
+        SklearnClassifier(MultinomialNB()).train_stream(iter(train))
+    except ValueError:
+        pass
+    else:
+        assert False, 'expected a ValueError'
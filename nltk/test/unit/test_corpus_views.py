@@ -3,8 +3,14 @@
 Corpus View Regression Tests
 """
 from __future__ import absolute_import, unicode_literals
+import os
+import shutil
+import tempfile
+import pickle
 import unittest
 import nltk.data
+from nltk.corpus.reader import (TaggedCorpusReader, PlaintextCorpusReader,
+                                ColumnarCorpusReader, build_columnar_corpus)
 from nltk.corpus.reader.util import (StreamBackedCorpusView,
                                      read_whitespace_block, read_line_block)
 
@@ -43,3 +49,138 @@ class TestCorpusViews(unittest.TestCase):
 
             v = StreamBackedCorpusView(f, read_line_block)
             self.assertEqual(len(v), len(self.linetok.tokenize(file_data)))
+
+
+class TestBlockIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, 'corpus.txt')
+        with open(self.path, 'w') as fp:
+            for i in range(5000):
+                fp.write('line %d of the corpus\n' % i)
+        self.cache = os.path.join(self.root, 'cache')
+        StreamBackedCorpusView.index_dir = self.cache
+
+    def tearDown(self):
+        StreamBackedCorpusView.index_dir = None
+        shutil.rmtree(self.root)
+
+    def test_index_is_saved_and_reused(self):
+        v = StreamBackedCorpusView(self.path, read_whitespace_block)
+        tokens = list(v)
+        self.assertEqual(len(os.listdir(self.cache)), 1)
+
+        v = StreamBackedCorpusView(self.path, read_whitespace_block)
+        # The view knows its length without reading the file.
+        self.assertEqual(v._len, len(tokens))
+        self.assertEqual(v[17003], tokens[17003])
+        self.assertEqual(list(v[-5:]), tokens[-5:])
+        self.assertEqual(list(v), tokens)
+
+    def test_index_depends_on_block_reader(self):
+        list(StreamBackedCorpusView(self.path, read_whitespace_block))
+        v = StreamBackedCorpusView(self.path, read_line_block)
+        self.assertEqual(v._len, None)
+        self.assertEqual(len(v), 5000)
+        self.assertEqual(len(os.listdir(self.cache)), 2)
+
+    def test_index_is_invalidated(self):
+        list(StreamBackedCorpusView(self.path, read_whitespace_block))
+        with open(self.path, 'a') as fp:
+            fp.write('one more line\n')
+        v = StreamBackedCorpusView(self.path, read_whitespace_block)
+        self.assertEqual(v._len, None)
+        self.assertEqual(len(v), 5000 * 5 + 3)
+
+    def test_index_depends_on_view_settings(self):
+        with open(self.path, 'w') as fp:
+            for i in range(1000):
+                fp.write('The/AT cat/NN sat/VBD ./.\n\n')
+        StreamBackedCorpusView.index_dir = None
+        plain = TaggedCorpusReader(self.root, r'corpus\.txt')
+        expected = [plain.words(), plain.sents(), plain.tagged_sents(),
+                    plain.paras()]
+        StreamBackedCorpusView.index_dir = self.cache
+        reader = TaggedCorpusReader(self.root, r'corpus\.txt')
+        for i in range(2):
+            # Each view is created after the previous one saved its
+            # index; the second time, every view reuses its own index.
+            for (method, view_expected) in zip(
+                    [reader.words, reader.sents, reader.tagged_sents,
+                     reader.paras], expected):
+                view = method()
+                self.assertEqual(len(view), len(view_expected))
+                self.assertEqual(list(view), list(view_expected))
+                self.assertEqual(view[-1], view_expected[-1])
+            self.assertEqual(len(os.listdir(self.cache)), 4)
+
+    def test_indexed_views_do_not_hold_files_open(self):
+        if not os.path.isdir('/proc/self/fd'):
+            raise unittest.SkipTest('cannot count open file descriptors')
+        for i in range(200):
+            with open(os.path.join(self.root, 'f%03d.txt' % i), 'w') as fp:
+                fp.write('word %d and more words\n' % i)
+        reader = PlaintextCorpusReader(self.root, r'f\d+\.txt')
+        expected = list(reader.words())
+        self.assertEqual(len(os.listdir(self.cache)), 200)
+        before = len(os.listdir('/proc/self/fd'))
+        # Every view of the concatenation loads its saved index.
+        words = reader.words()
+        self.assertEqual(len(words), len(expected))
+        self.assertTrue(len(os.listdir('/proc/self/fd')) - before < 10)
+        self.assertEqual(list(words), expected)
+
+
+class TestColumnarCorpus(unittest.TestCase):
+
+    tagged_texts = [
+        'The/AT cat/NN sat/VBD ./.\nA/AT dog/NN barked/VBD ./.\n\n'
+        'Caf\xe9/NP opened/VBD ./.',
+        'It/PPS rained/VBD ./.',
+    ]
+
+    def setUp(self):
+        self.src = tempfile.mkdtemp()
+        self.dst = tempfile.mkdtemp()
+        for i, text in enumerate(self.tagged_texts):
+            with open(os.path.join(self.src, 'f%d.pos' % i), 'wb') as fp:
+                fp.write(text.encode('utf8'))
+        self.tagged = TaggedCorpusReader(self.src, r'.*\.pos')
+        self.plain = PlaintextCorpusReader(self.src, r'.*\.pos',
+                                           sent_tokenizer=nltk.LineTokenizer())
+
+    def tearDown(self):
+        shutil.rmtree(self.src)
+        shutil.rmtree(self.dst)
+
+    def assertSameViews(self, columnar, original):
+        self.assertEqual(len(columnar), len(original))
+        self.assertEqual(list(columnar), list(original))
+        for i in range(-len(original), len(original)):
+            self.assertEqual(columnar[i], original[i])
+        self.assertEqual(list(columnar[1:4]), list(original[1:4]))
+
+    def test_tagged(self):
+        reader = build_columnar_corpus(self.tagged, self.dst)
+        self.assertTrue(isinstance(reader, ColumnarCorpusReader))
+        for fileids in (None, 'f0.pos', ['f1.pos']):
+            self.assertSameViews(reader.words(fileids),
+                                 self.tagged.words(fileids))
+            self.assertSameViews(reader.sents(fileids),
+                                 self.tagged.sents(fileids))
+            self.assertSameViews(reader.tagged_words(fileids),
+                                 self.tagged.tagged_words(fileids))
+            self.assertSameViews(reader.tagged_sents(fileids),
+                                 self.tagged.tagged_sents(fileids))
+
+    def test_plaintext(self):
+        reader = build_columnar_corpus(self.plain, self.dst)
+        self.assertSameViews(reader.words(), self.plain.words())
+        self.assertSameViews(reader.sents(), self.plain.sents())
+        self.assertRaises(ValueError, reader.tagged_words)
+
+    def test_pickle(self):
+        reader = build_columnar_corpus(self.tagged, self.dst)
+        view = reader.tagged_sents('f0.pos')
+        self.assertEqual(list(pickle.loads(pickle.dumps(view))), list(view))
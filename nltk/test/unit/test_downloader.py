@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for nltk.downloader, using a local http server as a mirror
+of the data server.
+"""
+from __future__ import absolute_import, unicode_literals
+import os
+import re
+import shutil
+import tempfile
+import threading
+import unittest
+import zipfile
+from hashlib import md5
+
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+from nltk.downloader import Downloader
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serve the files in ``root``, with support for ``Range`` headers
+    (which ``SimpleHTTPRequestHandler`` does not support).
+    """
+    root = None
+    ranges = []
+
+    def do_GET(self):
+        path = os.path.join(self.root, self.path.lstrip('/'))
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        with open(path, 'rb') as fp:
+            data = fp.read()
+        m = re.match(r'bytes=(\d+)-$', self.headers.get('Range') or '')
+        if m:
+            start = int(m.group(1))
+            self.ranges.append((self.path, start))
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes %d-%d/%d' %
+                             (start, len(data)-1, len(data)))
+            data = data[start:]
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestDownloader(unittest.TestCase):
+
+    packages = ['alpha', 'beta', 'gamma', 'delta']
+
+    def setUp(self):
+        self.server_dir = tempfile.mkdtemp()
+        self.download_dir = tempfile.mkdtemp()
+        RangeRequestHandler.root = self.server_dir
+        RangeRequestHandler.ranges = []
+        self.server = HTTPServer(('127.0.0.1', 0), RangeRequestHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.base_url = 'http://127.0.0.1:%d/' % self.server.server_port
+        self.write_index()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.server_dir)
+        shutil.rmtree(self.download_dir)
+
+    def write_index(self):
+        os.mkdir(os.path.join(self.server_dir, 'corpora'))
+        entries = []
+        for pkg in self.packages:
+            filename = os.path.join(self.server_dir, 'corpora', pkg + '.zip')
+            contents = ('%s\n' % pkg * 5000).encode('ascii')
+            with zipfile.ZipFile(filename, 'w') as zf:
+                zf.writestr('%s/README' % pkg, contents)
+            with open(filename, 'rb') as fp:
+                checksum = md5(fp.read()).hexdigest()
+            entries.append(
+                '<package id="%s" url="%scorpora/%s.zip" subdir="corpora" '
+                'size="%d" unzipped_size="%d" checksum="%s" unzip="1" />' %
+                (pkg, self.base_url, pkg, os.path.getsize(filename),
+                 len(contents), checksum))
+        items = ''.join('<item ref="%s" />' % pkg for pkg in self.packages)
+        with open(os.path.join(self.server_dir, 'index.xml'), 'w') as fp:
+            fp.write('<nltk_data><packages>%s</packages><collections>'
+                     '<collection id="all">%s</collection>'
+                     '</collections></nltk_data>' % (''.join(entries), items))
+        self.downloader = Downloader(self.base_url + 'index.xml',
+                                     self.download_dir)
+
+    def zip_contents(self, pkg):
+        with open(os.path.join(self.server_dir, 'corpora',
+                               pkg + '.zip'), 'rb') as fp:
+            return fp.read()
+
+    def assertInstalled(self, pkg):
+        self.downloader.clear_status_cache()
+        self.assertEqual(self.downloader.status(pkg),
+                         Downloader.INSTALLED)
+        self.assertTrue(os.path.isfile(os.path.join(
+            self.download_dir, 'corpora', pkg, 'README')))
+
+    def test_concurrent_download(self):
+        self.assertTrue(self.downloader.download('all', quiet=True,
+                                                 workers=3))
+        for pkg in self.packages:
+            self.assertInstalled(pkg)
+        self.assertEqual(self.downloader.status('all'), Downloader.INSTALLED)
+
+    def test_resume(self):
+        os.mkdir(os.path.join(self.download_dir, 'corpora'))
+        data = self.zip_contents('beta')
+        partpath = os.path.join(self.download_dir, 'corpora', 'beta.zip.part')
+        with open(partpath, 'wb') as fp:
+            fp.write(data[:len(data)//2])
+        self.assertTrue(self.downloader.download('beta', quiet=True))
+        self.assertInstalled('beta')
+        self.assertEqual(RangeRequestHandler.ranges,
+                         [('/corpora/beta.zip', len(data)//2)])
+        self.assertFalse(os.path.exists(partpath))
+
+    def test_corrupt_partial_download(self):
+        os.mkdir(os.path.join(self.download_dir, 'corpora'))
+        partpath = os.path.join(self.download_dir, 'corpora', 'gamma.zip.part')
+        with open(partpath, 'wb') as fp:
+            fp.write(b'garbage')
+        self.assertTrue(self.downloader.download('gamma', quiet=True))
+        self.assertInstalled('gamma')
+
+    def test_checksum_mismatch(self):
+        with open(os.path.join(self.server_dir, 'corpora', 'delta.zip'),
+                  'ab') as fp:
+            fp.write(b'x')
+        self.assertRaises(ValueError, self.downloader.download, 'all',
+                          quiet=True, raise_on_error=True, workers=2)
+        self.assertFalse(os.path.exists(os.path.join(
+            self.download_dir, 'corpora', 'delta.zip')))
+        self.assertFalse(os.path.exists(os.path.join(
+            self.download_dir, 'corpora', 'delta.zip.part')))
@@ -80,6 +80,63 @@ def test_backward_probability():
     assert_array_almost_equal(wikipedia_results, bp, 4)
 
 
+def _random_sequences(symbols, n=12):
+    import random
+    rng = random.Random(0)
+    return [[(rng.choice(symbols), None) for i in range(rng.randint(1, 7))]
+            for j in range(n)]
+
+
+def test_tag_sents_batch():
+    model, states, symbols = hmm._market_hmm_example()
+    seqs = [[symbol for (symbol, tag) in seq]
+            for seq in _random_sequences(symbols)] + [[]]
+    model.BATCH_SIZE = 5
+    assert model.tag_sents(seqs) == [model.tag(seq) for seq in seqs[:-1]] + [[]]
+    assert model.best_paths(seqs[:-1]) == [model.best_path_simple(seq)
+                                           for seq in seqs[:-1]]
+
+
+def test_baum_welch_batch():
+    import numpy as np
+    from numpy.testing import assert_array_almost_equal
+
+    model, states, symbols = hmm._market_hmm_example()
+    seqs = _random_sequences(symbols)
+    trainer = hmm.HiddenMarkovModelTrainer(states, symbols)
+    numbers = dict((symbol, k) for k, symbol in enumerate(symbols))
+    batch = trainer._baum_welch_batch(seqs, model, numbers)
+
+    # Sum the expected counts of each sequence directly.
+    N, M = len(states), len(symbols)
+    X = np.array([[model._transitions[si].prob(sj) for sj in states]
+                  for si in states])
+    O = np.array([[model._outputs[si].prob(k) for k in symbols]
+                  for si in states])
+    logprob = 0
+    A_numer, A_denom = np.zeros((N, N)), np.zeros(N)
+    B_numer, B_denom = np.zeros((N, M)), np.zeros(N)
+    for seq in seqs:
+        alpha = 2**model._forward_probability(seq)
+        beta = 2**model._backward_probability(seq)
+        p = alpha[-1].sum()
+        logprob += np.log2(p)
+        for t, (symbol, tag) in enumerate(seq):
+            gamma = alpha[t] * beta[t] / p
+            B_numer[:, numbers[symbol]] += gamma
+            B_denom += gamma
+            if t < len(seq) - 1:
+                A_denom += gamma
+                next_output = O[:, numbers[seq[t+1][0]]]
+                A_numer += (alpha[t][:, None] * X * next_output *
+                            beta[t+1]) / p
+
+    assert_array_almost_equal(batch[0], logprob)
+    for expected, actual in zip([A_numer, A_denom, B_numer, B_denom],
+                                batch[1:]):
+        assert_array_almost_equal(expected, 2**actual)
+
+
 def setup_module(module):
     from nose import SkipTest
     try:
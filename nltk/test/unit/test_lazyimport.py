@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the lazily loaded top-level ``nltk`` namespace.
+"""
+from __future__ import absolute_import, unicode_literals
+import sys
+import types
+import importlib
+import subprocess
+import unittest
+
+import nltk
+from nltk.lazyimport import export_table
+
+
+class TestLazyNamespace(unittest.TestCase):
+
+    def test_import_is_lazy(self):
+        code = ('import sys, nltk; '
+                'print(int("nltk.parse" in sys.modules)); '
+                'nltk.word_tokenize; '
+                'print(int("nltk.parse" in sys.modules))')
+        out = subprocess.check_output([sys.executable, '-c', code])
+        self.assertEqual(out.split(), [b'0', b'0'])
+
+    def test_export_table_is_current(self):
+        table = export_table(nltk._STAR_IMPORTS)
+        stored = dict((name, module) for module in nltk._STAR_IMPORTS
+                      for name in nltk._LAZY_EXPORTS[module])
+        self.assertEqual(stored, table)
+
+    def test_exported_names(self):
+        for module_name, names in nltk._LAZY_EXPORTS.items():
+            module = importlib.import_module(module_name)
+            for name in names:
+                if name in nltk._SUBMODULES:
+                    continue
+                self.assertTrue(getattr(nltk, name) is getattr(module, name),
+                                '%s.%s' % (module_name, name))
+        self.assertTrue(nltk.download is
+                        importlib.import_module('nltk.downloader').download)
+
+    def test_submodules(self):
+        for name in nltk._SUBMODULES:
+            if name == 'cluster':
+                continue  # requires numpy
+            self.assertTrue(getattr(nltk, name) is
+                            importlib.import_module('nltk.' + name), name)
+        self.assertRaises(AttributeError, getattr, nltk, 'no_such_name')
+        self.assertTrue('word_tokenize' in dir(nltk))
+        self.assertTrue('FreqDist' in nltk.__all__)
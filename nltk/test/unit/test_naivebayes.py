@@ -3,7 +3,9 @@ from __future__ import print_function, unicode_literals
 
 
 import unittest
-from nltk.classify.naivebayes import NaiveBayesClassifier
+from nltk.probability import ELEProbDist
+from nltk.classify.naivebayes import (NaiveBayesClassifier,
+                                      OnlineNaiveBayesClassifier)
 
 
 class NaiveBayesClassifierTest(unittest.TestCase):
@@ -24,3 +26,78 @@ class NaiveBayesClassifierTest(unittest.TestCase):
         result = classifier.prob_classify({'bad': True})
         self.assertTrue(result.prob('positive') < result.prob('negative'))
         self.assertEqual(result.max(), 'negative')
+
+
+class OnlineNaiveBayesClassifierTest(unittest.TestCase):
+
+    def setUp(self):
+        import random
+        rng = random.Random(0)
+        self.toks = []
+        for i in range(200):
+            label = rng.choice('abc')
+            featureset = dict(('f%d' % rng.randint(0, 9), rng.randint(0, 2))
+                              for j in range(4))
+            featureset['g'] = label if rng.random() < 0.7 else 'a'
+            self.toks.append((featureset, label))
+
+    def assertSameClassifier(self, online, batch):
+        self.assertEqual(sorted(online.labels()), sorted(batch.labels()))
+        self.assertEqual(set(online._feature_probdist),
+                         set(batch._feature_probdist))
+        for featureset, label in self.toks:
+            p1 = online.prob_classify(featureset)
+            p2 = batch.prob_classify(featureset)
+            for label in batch.labels():
+                self.assertAlmostEqual(p1.prob(label), p2.prob(label))
+
+    def test_update(self):
+        online = OnlineNaiveBayesClassifier()
+        for i in range(0, len(self.toks), 30):
+            online.update(self.toks[i:i+30])
+            self.assertSameClassifier(
+                online, NaiveBayesClassifier.train(self.toks[:i+30]))
+
+    def test_forget(self):
+        online = OnlineNaiveBayesClassifier.train(self.toks[:150])
+        online.forget(self.toks[:50]).update(self.toks[150:])
+        self.assertSameClassifier(
+            online, NaiveBayesClassifier.train(self.toks[50:]))
+        self.assertRaises(ValueError, online.forget, [({'g': 'c'}, 'd')])
+
+    def test_failed_forget_leaves_classifier_unchanged(self):
+        online = OnlineNaiveBayesClassifier.train(self.toks)
+        # The last token of each batch is one more than was trained on.
+        for batch in [self.toks[:10] + [({'g': 'c'}, 'd')],
+                      self.toks + self.toks[:1]]:
+            self.assertRaises(ValueError, online.forget, batch)
+            self.assertEqual(online._label_freqdist.N(), len(self.toks))
+            self.assertSameClassifier(
+                online, NaiveBayesClassifier.train(self.toks))
+
+    def test_merge(self):
+        import pickle
+        shards = [OnlineNaiveBayesClassifier.train(self.toks[i:i+70])
+                  for i in range(0, len(self.toks), 70)]
+        shards = [pickle.loads(pickle.dumps(shard)) for shard in shards]
+        online = shards[0].merge(shards[1]).merge(shards[2])
+        self.assertSameClassifier(
+            online, NaiveBayesClassifier.train(self.toks))
+
+    def test_prob_classify_many(self):
+        from nltk.probability import MLEProbDist
+        test = [featureset for (featureset, label) in self.toks[:50]]
+        test += [{'f1': 7, 'g': 'c'}, {'h': 1}, {}, {'f2': 1, 'h': 0}]
+        for estimator in (ELEProbDist, MLEProbDist):
+            online = OnlineNaiveBayesClassifier.train(self.toks[:100],
+                                                      estimator)
+            for i in range(2):
+                pdists = online.prob_classify_many(test)
+                for featureset, pdist in zip(test, pdists):
+                    expected = online.prob_classify(featureset)
+                    for label in online.labels():
+                        self.assertAlmostEqual(pdist.prob(label),
+                                               expected.prob(label))
+                self.assertEqual(online.classify_many(test),
+                                 [online.classify(fs) for fs in test])
+                online.update(self.toks[100:])
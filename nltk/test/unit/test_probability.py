@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for nltk.probability.
+"""
+from __future__ import absolute_import, unicode_literals
+import os
+import shutil
+import tempfile
+import unittest
+
+from nltk.corpus.reader import PlaintextCorpusReader
+from nltk.probability import (FreqDist, ConditionalFreqDist, count_ngrams,
+                              merge_counts, SimpleGoodTuringProbDist,
+                              WittenBellProbDist, IncrementalFreqDist)
+from nltk.util import ngrams
+
+
+class TestCountNgrams(unittest.TestCase):
+
+    # Files of different lengths, including files that are shorter than
+    # the ngram order, so that some ngrams span several files.
+    texts = [
+        'the cat sat on the mat .',
+        'a',
+        'dog',
+        'the dog sat on the cat . the end',
+        'b c',
+        'the mat sat on the dog .',
+    ]
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        for i, text in enumerate(self.texts):
+            with open(os.path.join(self.root, 'f%d.txt' % i), 'w') as fp:
+                fp.write(text)
+        self.reader = PlaintextCorpusReader(self.root, r'.*\.txt')
+        self.words = list(self.reader.words())
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_serial_equivalence(self):
+        for n in (1, 2, 3, 4):
+            expected = FreqDist(ngrams(self.words, n))
+            for processes in (1, 2):
+                self.assertEqual(
+                    count_ngrams(self.reader, n, processes=processes),
+                    expected)
+
+    def test_padding(self):
+        kwargs = dict(pad_left=True, pad_right=True,
+                      left_pad_symbol='<s>', right_pad_symbol='</s>')
+        expected = FreqDist(ngrams(self.words, 3, **kwargs))
+        self.assertEqual(count_ngrams(self.reader, 3, processes=2, **kwargs),
+                         expected)
+
+    def test_conditional(self):
+        expected = ConditionalFreqDist((ngram[:-1], ngram[-1])
+                                       for ngram in ngrams(self.words, 3))
+        result = count_ngrams(self.reader, 3, processes=2, conditional=True)
+        self.assertEqual(result, expected)
+
+    def test_merge_counts(self):
+        a, b, c = FreqDist('abb'), FreqDist('bc'), FreqDist('cad')
+        left = merge_counts(merge_counts(a.copy(), b), c)
+        right = merge_counts(a.copy(), merge_counts(b.copy(), c))
+        self.assertEqual(left, right)
+        self.assertEqual(left, FreqDist('abbbccad'))
+
+
+class TestFreqDistNrCache(unittest.TestCase):
+
+    def assertTablesCorrect(self, fdist):
+        r_Nr = {0: 0}
+        for count in dict.values(fdist):
+            r_Nr[count] = r_Nr.get(count, 0) + 1
+        self.assertEqual(dict(fdist.r_Nr()), r_Nr)
+        self.assertEqual(fdist.N(), sum(dict.values(fdist)))
+
+    def test_updates(self):
+        fdist = IncrementalFreqDist('abracadabra')
+        self.assertTablesCorrect(fdist)
+        fdist['a'] += 1
+        fdist['z'] = 3
+        fdist.update('xyz')
+        fdist.update({'b': 2})
+        self.assertTablesCorrect(fdist)
+        del fdist['c']
+        fdist.pop('d')
+        fdist.popitem()
+        fdist.subtract('aa')
+        self.assertTablesCorrect(fdist)
+        fdist += FreqDist('rrq')
+        self.assertTrue(isinstance(fdist, IncrementalFreqDist))
+        self.assertTablesCorrect(fdist)
+        fdist.clear()
+        self.assertTablesCorrect(fdist)
+
+    def test_estimators_refresh(self):
+        fdist = IncrementalFreqDist('abracadabra' * 3 + 'the quick brown fox')
+        sgt = SimpleGoodTuringProbDist(fdist)
+        wb = WittenBellProbDist(fdist, 40)
+        sgt.prob('a'), wb.prob('a')
+
+        fdist.update('jumps over the lazy dog')
+        fdist['a'] -= 5
+        expected_sgt = SimpleGoodTuringProbDist(fdist.copy())
+        expected_wb = WittenBellProbDist(fdist.copy(), 40)
+        for sample in list(fdist) + ['unseen']:
+            self.assertAlmostEqual(sgt.prob(sample), expected_sgt.prob(sample))
+            self.assertAlmostEqual(wb.prob(sample), expected_wb.prob(sample))
+
+    def test_estimators_refresh_past_bins(self):
+        fdist = IncrementalFreqDist('abracadabra')
+        sgt = SimpleGoodTuringProbDist(fdist, 7)
+        wb = WittenBellProbDist(fdist, 7)
+        fdist['x'] += 1
+        self.assertTrue(0 < wb.prob('unseen') < 1)
+        self.assertTrue(0 < sgt.prob('unseen') < 1)
+        for sample in 'yz':
+            # The vocabulary reaches, and then passes, the bins.
+            fdist[sample] += 1
+            self.assertRaises(ValueError, wb.prob, 'unseen')
+            self.assertRaises(ValueError, sgt.prob, 'unseen')
+        fdist.pop('z')
+        self.assertRaises(ValueError, WittenBellProbDist, fdist, 7)
+
+
+class TestBatchMethods(unittest.TestCase):
+
+    def test_numpy_is_imported_lazily(self):
+        import sys
+        from nltk.probability import MLEProbDist
+        probdist = MLEProbDist(FreqDist('abracadabra'))
+        numpy = sys.modules.get('numpy')
+        # Importing a module whose sys.modules entry is None fails.
+        sys.modules['numpy'] = None
+        try:
+            self.assertEqual(probdist.prob('a'), 5 / 11.)
+            self.assertRaises(ImportError, probdist.prob_many, ['a', 'b'])
+        finally:
+            if numpy is None:
+                del sys.modules['numpy']
+            else:
+                sys.modules['numpy'] = numpy
@@ -12,6 +12,124 @@ def test_basic():
                       ('.', '.')]
 
 
+def test_compiled_perceptron():
+    import random
+    from nltk.tag.perceptron import AveragedPerceptron, PerceptronTagger
+
+    rng = random.Random(0)
+    tags = ['NN', 'VB', 'JJ', 'DT', 'IN']
+    words = ['w%d' % i for i in range(200)]
+    def sent():
+        return [(rng.choice(words), rng.choice(tags))
+                for i in range(rng.randint(1, 12))]
+
+    tagger = PerceptronTagger(load=False)
+    tagger.train([sent() for i in range(300)], nr_iter=2)
+    test = [[word for (word, tag) in sent()] for i in range(100)] + [[]]
+    expected = [tagger.tag(tokens) for tokens in test]
+    tagger.compile()
+    assert [tagger.tag(tokens) for tokens in test] == expected
+    assert tagger.tag_sents(iter(test)) == expected
+
+    # Ties are broken in favour of the alphabetically greatest label.
+    model = AveragedPerceptron()
+    model.classes = set(['A', 'B', 'C'])
+    model.weights = {'f': {'A': 1.0, 'B': 1.0}, 'g': {'C': 0.5}}
+    dense = model.compile()
+    for features in [{'f': 1}, {'g': 1}, {'f': 1, 'g': 2}, {'h': 1}, {}]:
+        assert dense.predict(features) == model.predict(features)
+
+
+def test_tag_sents_parallel():
+    from nltk.tag import DefaultTagger, UnigramTagger, BigramTagger
+
+    train = [[('the', 'DT'), ('dog', 'NN'), ('barks', 'VBZ')],
+             [('a', 'DT'), ('dog', 'NN'), ('saw', 'VBD'), ('the', 'DT'),
+              ('saw', 'NN')]]
+    tagger = BigramTagger(train, backoff=UnigramTagger(
+        train, backoff=DefaultTagger('NN')))
+    sents = [['the', 'saw'], ['a', 'dog', 'barks'], [], ['cat']] * 25
+    expected = [tagger.tag(sent) for sent in sents]
+    assert tagger.tag_sents(iter(sents), n_jobs=2, chunksize=7) == expected
+    assert list(tagger.tag_stream(sents, chunksize=7)) == expected
+
+    # Sentences are read lazily, one chunk at a time.
+    consumed = []
+    def generate():
+        for sent in sents:
+            consumed.append(sent)
+            yield sent
+    stream = tagger.tag_stream(generate(), chunksize=7)
+    assert next(stream) == expected[0]
+    assert len(consumed) == 7
+    stream.close()
+
+
+def test_tag_sents_parallel_override():
+    """
+    Subclasses that override tag_sents() still accept n_jobs and
+    chunksize, and convert each sentence only once.
+    """
+    import multiprocessing
+    import sys
+    from nltk.classify.senna import Senna
+    from nltk.tag.senna import SennaTagger
+
+    class EchoSenna(Senna):
+        def tag_sents(self, sentences):
+            return [[{'word': word, 'pos': word.upper()} for word in sent]
+                    for sent in sentences]
+
+    # SennaTagger.tag_sents() gets its annotations from EchoSenna
+    # instead of running the Senna executable.
+    class EchoSennaTagger(SennaTagger, EchoSenna):
+        def __init__(self):
+            pass
+
+    tagger = EchoSennaTagger()
+    sents = [['the', 'saw'], ['a', 'dog', 'barks'], [], ['cat']] * 25
+    expected = [[(word, word.upper()) for word in sent] for sent in sents]
+    assert tagger.tag_sents(sents) == expected
+
+    # A local class can't be pickled, so only forked workers can use it.
+    try:
+        start_method = multiprocessing.get_start_method()
+    except AttributeError:
+        start_method = 'spawn' if sys.platform == 'win32' else 'fork'
+    if start_method == 'fork':
+        assert tagger.tag_sents(sents, n_jobs=2, chunksize=7) == expected
+
+
+def test_compiled_backoff_tagger():
+    import pickle
+    import random
+    from nltk.tag import (DefaultTagger, UnigramTagger, BigramTagger,
+                          TrigramTagger, AffixTagger)
+
+    rng = random.Random(0)
+    tags = ['NN', 'VB', 'JJ', 'DT']
+    words = ['w%d' % i for i in range(30)]
+    def sent():
+        return [(rng.choice(words), rng.choice(tags))
+                for i in range(rng.randint(1, 8))]
+    train = [sent() for i in range(200)]
+    test = [[word for (word, tag) in sent()] for i in range(300)] + [[]]
+
+    chains = [
+        TrigramTagger(train, backoff=BigramTagger(train, backoff=UnigramTagger(
+            train, backoff=DefaultTagger('NN')))),
+        # Lower-order taggers first, and no default tagger.
+        UnigramTagger(train[:20], backoff=TrigramTagger(train)),
+        # An uncompilable tagger in the middle of the chain.
+        BigramTagger(train, backoff=AffixTagger(train, backoff=UnigramTagger(
+            train))),
+    ]
+    for tagger in chains:
+        compiled = pickle.loads(pickle.dumps(tagger.compile()))
+        for tokens in test:
+            assert compiled.tag(tokens) == tagger.tag(tokens)
+
+
 def setup_module(module):
     from nose import SkipTest
     try:
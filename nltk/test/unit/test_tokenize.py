@@ -7,6 +7,7 @@ See also nltk/test/tokenize.doctest
 from __future__ import unicode_literals
 from nltk.tokenize import TweetTokenizer
 import unittest
+from nose import SkipTest
 
 class TestTokenize(unittest.TestCase):
 
@@ -21,3 +22,300 @@ class TestTokenize(unittest.TestCase):
         expected = [':', "Let's", 'test', 'these', 'words', ':', 'resumé',
                     'España', 'München', 'français']
         self.assertEqual(tokens, expected)
+
+    def test_tweet_tokenize_many(self):
+        """
+        Test that TweetTokenizer.tokenize_many() gives the same tokens as
+        tokenize(), including for tokens that contain whitespace.
+        """
+        tweets = ["@remy: This is waaaaayyyy too much for you!!!!!!",
+                  "Call me at +1 (555) 123-4567 or 555 1234 . . . &lt;3",
+                  "RT @Bob: SO HAPPY :D &amp; :-P http://t.co/AbC",
+                  "Wait...... WHAT?!&nbsp;&#8230;&bogus; x@y.com #NLTK",
+                  b"Price: &pound;100 \xe2\x80\x94 DEAL!!!!",
+                  ""]
+        for preserve_case in (True, False):
+            for reduce_len in (True, False):
+                for strip_handles in (True, False):
+                    tokenizer = TweetTokenizer(preserve_case, reduce_len,
+                                               strip_handles)
+                    expected = [tokenizer.tokenize(t) for t in tweets]
+                    # The second time, the tokens come from the caches.
+                    for i in range(2):
+                        self.assertEqual(
+                            list(tokenizer.tokenize_many(tweets)), expected)
+
+
+def punkt_text(n_sents, seed=0):
+    """
+    Return a random text whose sentences contain abbreviations,
+    initials, numbers and ellipses, for training and testing Punkt.
+    """
+    import random
+    rng = random.Random(seed)
+    words = ['the', 'a', 'cat', 'dog', 'saw', 'Bach', 'played', 'in',
+             'Paris', 'music', 'and', 'then', 'left', 'with', 'Smith']
+    extras = ['Dr.', 'Mr.', 'etc.', 'J. S.', 'No. 5', 'e.g.', '3.14', 'U.S.',
+              'i.e.', 'Prof.', '...', '(see above)', '"quoted"']
+    sents = []
+    for i in range(n_sents):
+        sent = [rng.choice(words) for j in range(rng.randint(3, 12))]
+        for j in range(rng.randint(0, 2)):
+            sent.insert(rng.randint(0, len(sent)), rng.choice(extras))
+        sent[0] = sent[0][0].upper() + sent[0][1:]
+        sents.append(' '.join(sent) + rng.choice(['.', '.', '?', '!', '."']))
+    text = ''
+    for sent in sents:
+        text += sent + rng.choice([' ', '  ', '\n', '\n\n'])
+    return text
+
+
+class TestPunkt(unittest.TestCase):
+
+    def setUp(self):
+        from nltk.tokenize.punkt import PunktTrainer
+        self.text = punkt_text(2000)
+        self.params = PunktTrainer(self.text).get_params()
+
+    def test_compact_parameters(self):
+        import io
+        import os
+        import pickle
+        import tempfile
+        from nltk.data import load
+        from nltk.tokenize.punkt import (PunktSentenceTokenizer,
+                                         CompactPunktParameters)
+        stream = io.BytesIO()
+        self.params.dump(stream)
+        handle, path = tempfile.mkstemp(suffix='.punkt')
+        os.write(handle, stream.getvalue())
+        os.close(handle)
+        try:
+            with open(path, 'rb') as fp:
+                mapped = CompactPunktParameters.open(fp)
+            for compact in (CompactPunktParameters(stream.getvalue()), mapped,
+                            pickle.loads(pickle.dumps(mapped))):
+                self.assertEqual(set(compact.abbrev_types),
+                                 self.params.abbrev_types)
+                self.assertEqual(set(compact.collocations),
+                                 self.params.collocations)
+                self.assertEqual(set(compact.sent_starters),
+                                 self.params.sent_starters)
+                self.assertEqual(
+                    dict(compact.ortho_context.items()),
+                    dict((typ, flags) for (typ, flags)
+                         in self.params.ortho_context.items() if flags))
+                self.assertEqual(compact.ortho_context['not a type'], 0)
+                self.assertFalse(('not', 'a collocation') in
+                                 compact.collocations)
+                # Lookups are cached, up to CACHE_SIZE keys at a time.
+                compact.abbrev_types.CACHE_SIZE = 5
+                for typ in sorted(self.params.abbrev_types)[:20] + ['x'] * 3:
+                    self.assertTrue((typ in compact.abbrev_types) ==
+                                    (typ in self.params.abbrev_types))
+                    self.assertTrue(len(compact.abbrev_types._cache) <= 5)
+            expected = PunktSentenceTokenizer(self.params).tokenize(self.text)
+            loaded = load('file:' + path, cache=False)
+            self.assertEqual(loaded.tokenize(self.text), expected)
+        finally:
+            os.remove(path)
+        self.assertRaises(ValueError, CompactPunktParameters, b'x' * 64)
+
+    def test_span_tokenize(self):
+        import random
+        from nltk.tokenize.punkt import PunktSentenceTokenizer
+        tokenizer = PunktSentenceTokenizer(self.params)
+        def slices_from_text(text, realign_boundaries):
+            slices = tokenizer._slices_from_text(text)
+            if realign_boundaries:
+                slices = tokenizer._realign_boundaries(text, slices)
+            return [(sl.start, sl.stop) for sl in slices]
+        texts = ['', '.', 'Hi. ', '. . .\n. x', 'x.) y', self.text]
+        rng = random.Random(0)
+        for i in range(200):
+            chars = list(punkt_text(rng.randint(1, 20), seed=i))
+            for j in range(rng.randint(0, 10)):
+                chars.insert(rng.randint(0, len(chars)),
+                             rng.choice('.?!)"\n -;,(\''))
+            texts.append(''.join(chars))
+        for text in texts:
+            for realign_boundaries in (True, False):
+                self.assertEqual(
+                    tokenizer.span_tokenize(text, realign_boundaries),
+                    slices_from_text(text, realign_boundaries))
+
+
+class TestTreebankWordTokenizer(unittest.TestCase):
+
+    def assertSameTokens(self, tokenizer, text):
+        tokens = tokenizer.tokenize(text)
+        self.assertEqual(tokens, tokenizer._rewrite(text).split())
+        spans = tokenizer.span_tokenize(text)
+        self.assertEqual(len(spans), len(tokens))
+        for (token, (start, end)) in zip(tokens, spans):
+            if token in ('``', "''") and text[start:end] == '"':
+                continue
+            self.assertEqual(text[start:end], token)
+
+    def test_treebank_sample(self):
+        from nltk.tokenize import TreebankWordTokenizer
+        from nltk.corpus import treebank, treebank_raw
+        tokenizer = TreebankWordTokenizer()
+        texts = []
+        try:
+            texts.extend(treebank_raw.raw(fileid)
+                         for fileid in treebank_raw.fileids())
+        except LookupError:
+            pass
+        try:
+            texts.extend(' '.join(sent) for sent in treebank.sents())
+        except LookupError:
+            pass
+        if not texts:
+            raise SkipTest('the Penn Treebank sample is not installed')
+        for text in texts:
+            self.assertSameTokens(tokenizer, text)
+            for line in text.split('\n'):
+                self.assertSameTokens(tokenizer, line)
+
+    def test_whitespace_context(self):
+        from nltk.tokenize import TreebankWordTokenizer
+        tokenizer = TreebankWordTokenizer()
+        for text in ['', ' ', '"Hi," she said.', ' "a" \t"b"\n"c"',
+                     "dogs' toys\n'tis wanna\twanna,", 'x:\n', 'x,\n\n',
+                     'end.)"  \n', '...  cannot!  "gonna" (x) [y]--z']:
+            self.assertSameTokens(tokenizer, text)
+
+
+class TestPunktStream(unittest.TestCase):
+
+    def test_tokenize_stream(self):
+        import io
+        import random
+        from nltk.tokenize.punkt import PunktTrainer, PunktSentenceTokenizer
+        tokenizer = PunktSentenceTokenizer(
+            PunktTrainer(punkt_text(2000)).get_params())
+        rng = random.Random(0)
+        for i in range(300):
+            chars = list(punkt_text(rng.randint(0, 12), seed=i))
+            for j in range(rng.randint(0, 10)):
+                chars.insert(rng.randint(0, len(chars)),
+                             rng.choice('.?!)"\n -;,(\''))
+            text = ''.join(chars)
+            cuts = sorted(rng.randint(0, len(text))
+                          for j in range(rng.randint(0, 8)))
+            chunks = [text[start:end] for (start, end)
+                      in zip([0] + cuts, cuts + [len(text)])]
+            for realign_boundaries in (True, False):
+                self.assertEqual(
+                    list(tokenizer.tokenize_stream(chunks,
+                                                   realign_boundaries)),
+                    tokenizer.tokenize(text, realign_boundaries))
+        text = punkt_text(50)
+        self.assertEqual(list(tokenizer.tokenize_stream(iter(text))),
+                         tokenizer.tokenize(text))
+        tokenizer.BLOCK_SIZE = 100
+        self.assertEqual(list(tokenizer.tokenize_stream(io.StringIO(text))),
+                         tokenizer.tokenize(text))
+
+    def test_tokenize_stream_long_sentence(self):
+        """
+        Test that a long stretch of text without a sentence break takes
+        about as long to tokenize from a stream as from a string.
+        """
+        import time
+        from nltk.tokenize.punkt import PunktSentenceTokenizer
+        tokenizer = PunktSentenceTokenizer()
+        lines = ['line %d has no sentence break\n' % i for i in range(40000)]
+        text = ''.join(lines)
+        start = time.time()
+        expected = tokenizer.tokenize(text)
+        whole = time.time() - start
+        start = time.time()
+        self.assertEqual(list(tokenizer.tokenize_stream(iter(lines))),
+                         expected)
+        self.assertTrue(time.time() - start < 10 * whole + 0.5)
+
+
+class TestMWETokenizer(unittest.TestCase):
+
+    def test_compact_trie(self):
+        import io
+        import os
+        import pickle
+        import random
+        import tempfile
+        from nltk.tokenize import MWETokenizer
+        from nltk.util import CompactTrie
+        rng = random.Random(0)
+        vocab = ['w%d' % i for i in range(20)]
+        mwes = set(tuple(rng.choice(vocab) for i in range(rng.randint(1, 4)))
+                   for j in range(100))
+        compact = CompactTrie(mwes)
+        self.assertEqual(list(compact), sorted(mwes))
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            with open(path, 'wb') as fp:
+                compact.dump(fp)
+            with open(path, 'rb') as fp:
+                mapped = CompactTrie.open(fp)
+            tokenizers = [MWETokenizer(mwes), MWETokenizer(compact),
+                          MWETokenizer(mapped),
+                          MWETokenizer(pickle.loads(pickle.dumps(compact)))]
+            for i in range(50):
+                text = [rng.choice(vocab + ['x']) for j in range(30)]
+                spans = [(start, end) for start in range(len(text))
+                         for end in range(start + 1, len(text) + 1)
+                         if tuple(text[start:end]) in mwes]
+                tokens = tokenizers[0].tokenize(text)
+                for tokenizer in tokenizers:
+                    self.assertEqual(tokenizer.tokenize(text), tokens)
+                    self.assertEqual(
+                        tokenizer.mwe_spans(text, all_matches=True), spans)
+                    self.assertEqual(compact.find_all(text), spans)
+                    self.assertEqual(compact.find_longest(text),
+                                     tokenizer.mwe_spans(text))
+        finally:
+            os.remove(path)
+        self.assertRaises(ValueError, CompactTrie, buf=b'x' * 64)
+        self.assertRaises(TypeError, tokenizers[1].add_mwe, ('w1', 'w2'))
+
+
+class TestTextTiling(unittest.TestCase):
+
+    def test_tokenize_stream(self):
+        """
+        Test that TextTilingTokenizer finds the same sections in a stream
+        as in the whole text, and that they start where the topic changes.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise SkipTest("numpy is required for TextTiling")
+        import io
+        import random
+        from nltk.tokenize import TextTilingTokenizer
+        rng = random.Random(0)
+        topics = [['cat', 'dog', 'pet', 'fur', 'tail', 'paw', 'vet', 'leash'],
+                  ['ship', 'sea', 'sail', 'port', 'wave', 'crew', 'mast'],
+                  ['tree', 'leaf', 'root', 'bark', 'branch', 'seed', 'forest']]
+        text, changes = '', []
+        for i in range(40):
+            if i and i % 8 == 0:
+                # Sections start with the paragraph break before them.
+                changes.append(len(text) - 2)
+            words = [rng.choice(topics[i // 8 % 3] + ['the', 'a', 'and'])
+                     for j in range(rng.randint(40, 80))]
+            text += ' '.join(words) + '.\n\n'
+        tokenizer = TextTilingTokenizer(stopwords=['the', 'a', 'and'])
+        tokenizer.BLOCK_SIZE, tokenizer.BATCH_SIZE = 100, 7
+        sections = tokenizer.tokenize(text)
+        self.assertEqual(''.join(sections), text)
+        starts = [len(''.join(sections[:i])) for i in range(len(sections))]
+        self.assertTrue(set(changes) <= set(starts))
+        self.assertEqual(
+            list(tokenizer.tokenize_stream(io.StringIO(text))), sections)
+        self.assertEqual([text[start:end] for (start, end) in
+                          tokenizer.span_tokenize_stream(text.splitlines(True))],
+                         sections)
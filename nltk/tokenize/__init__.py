@@ -86,9 +86,27 @@ def sent_tokenize(text, language='english'):
     :param text: text to split into sentences
     :param language: the model name in the Punkt corpus
     """
-    tokenizer = load('tokenizers/punkt/{0}.pickle'.format(language))
+    tokenizer = load(_punkt_resource(language))
     return tokenizer.tokenize(text)
 
+# The resource that contains the Punkt model for each language.
+_punkt_resources = {}
+def _punkt_resource(language):
+    """
+    Return the name of the Punkt model for *language*: the compact
+    ``.punkt`` model if it is installed (see
+    ``PunktParameters.dump()``), or else the pickled model.
+    """
+    if language not in _punkt_resources:
+        from nltk.data import find
+        resource = 'tokenizers/punkt/{0}.punkt'.format(language)
+        try:
+            find(resource)
+        except LookupError:
+            resource = 'tokenizers/punkt/{0}.pickle'.format(language)
+        _punkt_resources[language] = resource
+    return _punkt_resources[language]
+
 # Standard word tokenizer.
 _treebank_word_tokenize = TreebankWordTokenizer().tokenize
 def word_tokenize(text, language='english'):
@@ -105,3 +123,30 @@ def word_tokenize(text, language='english'):
     return [token for sent in sent_tokenize(text, language)
             for token in _treebank_word_tokenize(sent)]
 
+# Streaming sentence and word tokenizers.
+def sent_tokenize_stream(stream, language='english'):
+    """
+    Generate the sentences of the text that is read from *stream*,
+    using NLTK's recommended sentence tokenizer (see ``sent_tokenize()``),
+    without reading the whole text into memory.
+
+    :param stream: a file object opened in text mode, or an iterator of
+        strings (such as the lines of a file)
+    :param language: the model name in the Punkt corpus
+    """
+    tokenizer = load(_punkt_resource(language))
+    return tokenizer.tokenize_stream(stream)
+
+def word_tokenize_stream(stream, language='english'):
+    """
+    Generate the tokens of the text that is read from *stream*,
+    using NLTK's recommended word tokenizer (see ``word_tokenize()``),
+    without reading the whole text into memory.
+
+    :param stream: a file object opened in text mode, or an iterator of
+        strings (such as the lines of a file)
+    :param language: the model name in the Punkt corpus
+    """
+    for sent in sent_tokenize_stream(stream, language):
+        for token in _treebank_word_tokenize(sent):
+            yield token
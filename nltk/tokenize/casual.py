@@ -186,6 +186,18 @@ EMOTICON_RE = re.compile(EMOTICONS, re.VERBOSE | re.I | re.UNICODE)
 # These are for regularizing HTML entities to Unicode:
 ENT_RE = re.compile(r'&(#?(x?))([^&;\s]+);')
 
+# These are for normalizing the text before it is tokenized:
+HANDLES_RE = re.compile(r"(^|(?<=[^\w.-]))@[A-Za-z_]+\w+")
+LENGTHENING_RE = re.compile(r"(.)\1{2,}")
+LENGTHENING_HANG_RE = re.compile(r"(.)\1{2,}", re.DOTALL)
+
+# These are for tokenizing whitespace-delimited chunks of text one at a
+# time.  The only tokens that can contain whitespace are phone numbers and
+# spaced-out ellipses, and texts that might contain them are tokenized
+# whole:
+CHUNK_RE = re.compile(r"\S+", re.UNICODE)
+SPACED_TOKEN_RE = re.compile(r"\d[\-.)]*\s[\-\s.)]*\(?\d|\.\s+\.", re.UNICODE)
+
 
 ######################################################################
 # Functions for converting html entities
@@ -278,6 +290,10 @@ class TweetTokenizer:
         [':', 'This', 'is', 'waaayyy', 'too', 'much', 'for', 'you', '!', '!', '!']
     """
 
+    # The maximum number of distinct HTML entities, and of distinct
+    # tokens, whose normalized forms are remembered by tokenize_many().
+    CACHE_SIZE = 100000
+
     def __init__(self, preserve_case=True, reduce_len=False, strip_handles=False):
         self.preserve_case = preserve_case
         self.reduce_len = reduce_len
@@ -308,6 +324,89 @@ class TweetTokenizer:
                               x.lower()), words))
         return words
 
+    def tokenize_many(self, texts):
+        """
+        Generate the list of tokens of each of ``texts``, which may be
+        any iterable (such as a file of tweets, one per line).  This gives
+        the same tokens as ``tokenize()`` does for each text, but it
+        remembers how HTML entities are decoded, and the (normalized)
+        tokens of each whitespace-delimited chunk of text, so that the
+        tokenizing regex only runs on chunks that it has not seen before.
+
+            >>> tknzr = TweetTokenizer(preserve_case=False, reduce_len=True)
+            >>> tweets = ['SOOOO happy &amp; proud :D', '&lt;3 NLTK!!!!!!']
+            >>> for tokens in tknzr.tokenize_many(tweets):
+            ...     print(tokens)
+            ['sooo', 'happy', '&', 'proud', ':D']
+            ['<3', 'nltk', '!', '!', '!']
+
+        :param texts: iter(str)
+        :rtype: iter(list(str))
+        """
+        cache_size = self.CACHE_SIZE
+        entities = self._cache('entities')
+        chunks = self._cache((self.preserve_case, self.reduce_len))
+
+        def convert_entity(match):
+            entity = match.group()
+            value = entities.get(entity)
+            if value is None:
+                if len(entities) >= cache_size:
+                    entities.clear()
+                value = entities[entity] = _replace_html_entities(entity)
+            return value
+
+        # Shortening never changes which characters are whitespace, so it
+        # can be done one chunk at a time; and when lengthening is reduced,
+        # HANG_RE can only still shorten runs of newlines, so both are
+        # done by a single regex.
+        if self.reduce_len:
+            shorten = LENGTHENING_HANG_RE.sub
+        else:
+            shorten = HANG_RE.sub
+        preserve_case = self.preserve_case
+
+        def tokenize_chunk(text):
+            words = WORD_RE.findall(shorten(r'\1\1\1', text))
+            if not preserve_case:
+                words = [x if EMOTICON_RE.search(x) else x.lower()
+                         for x in words]
+            return words
+
+        strip_handles = self.strip_handles
+        for text in texts:
+            text = _str_to_unicode(text)
+            # Entities can decode to whitespace, and removing a handle can
+            # bring the chunks on either side of it together, so these are
+            # done to the whole text.
+            if '&' in text:
+                text = ENT_RE.sub(convert_entity, text)
+            if strip_handles and '@' in text:
+                text = HANDLES_RE.sub('', text)
+            if SPACED_TOKEN_RE.search(text):
+                yield tokenize_chunk(text)
+                continue
+            words = []
+            for chunk in CHUNK_RE.findall(text):
+                tokens = chunks.get(chunk)
+                if tokens is None:
+                    if len(chunks) >= cache_size:
+                        chunks.clear()
+                    tokens = chunks[chunk] = tuple(tokenize_chunk(chunk))
+                words.extend(tokens)
+            yield words
+
+    def _cache(self, name):
+        """
+        Return the dictionary called ``name`` that ``tokenize_many()``
+        remembers normalized text in.
+        """
+        try:
+            caches = self._caches
+        except AttributeError:
+            caches = self._caches = {}
+        return caches.setdefault(name, {})
+
 ######################################################################
 # Normalization Functions
 ######################################################################
@@ -317,15 +416,13 @@ def reduce_lengthening(text):
     Replace repeated character sequences of length 3 or greater with sequences
     of length 3.
     """
-    pattern = re.compile(r"(.)\1{2,}")
-    return pattern.sub(r"\1\1\1", text)
+    return LENGTHENING_RE.sub(r"\1\1\1", text)
 
 def remove_handles(text):
     """
     Remove Twitter username handles from text.
     """
-    pattern = re.compile(r"(^|(?<=[^\w.-]))@[A-Za-z_]+\w+")
-    return pattern.sub('', text)
+    return HANDLES_RE.sub('', text)
 
 ######################################################################
 # Tokenization Function
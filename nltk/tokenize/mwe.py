@@ -27,8 +27,17 @@ of MWEs:
     >>> tokenizer.tokenize('In a little or a little bit or a lot in spite of'.split())
     ['In', 'a_little', 'or', 'a_little_bit', 'or', 'a_lot', 'in_spite_of']
 
+For large lexicons, such as gazetteers, the MWEs can be given as a
+``CompactTrie``, which takes far less memory than the default ``Trie``,
+and can be saved to a file and memory-mapped:
+
+    >>> from nltk.util import CompactTrie
+    >>> tokenizer = MWETokenizer(CompactTrie([('a', 'little'), ('a', 'lot')]))
+    >>> tokenizer.tokenize('a little or a lot'.split())
+    ['a_little', 'or', 'a_lot']
+
 """
-from nltk.util import Trie
+from nltk.util import Trie, CompactTrie
 
 from nltk.tokenize.api import TokenizerI
 
@@ -42,17 +51,19 @@ class MWETokenizer(TokenizerI):
         """Initialize the multi-word tokenizer with a list of expressions and a
         separator
 
-        :type mwes: list(list(str))
+        :type mwes: list(list(str)) or CompactTrie
         :param mwes: A sequence of multi-word expressions to be merged, where
-            each MWE is a sequence of strings.
+            each MWE is a sequence of strings; or a ``CompactTrie`` of them,
+            to which no MWEs can be added.
         :type separator: str
         :param separator: String that should be inserted between words in a multi-word
             expression token. (Default is '_')
 
         """
-        if not mwes:
-            mwes = []
-        self._mwes = Trie(mwes)
+        if isinstance(mwes, CompactTrie):
+            self._mwes = mwes
+        else:
+            self._mwes = Trie(mwes or [])
         self._separator = separator
 
     def add_mwe(self, mwe):
@@ -63,6 +74,8 @@ class MWETokenizer(TokenizerI):
 
         :param mwe: The multi-word expression we're adding into the word trie
         :type mwe: tuple(str) or list(str)
+        :raise TypeError: If the tokenizer was created with a
+            ``CompactTrie``, which cannot be changed.
 
         :Example:
 
@@ -74,6 +87,9 @@ class MWETokenizer(TokenizerI):
         {'a': {'x': {True: None}, 'b': {True: None, 'c': {True: None}}}}
 
         """
+        if isinstance(self._mwes, CompactTrie):
+            raise TypeError('Cannot add an MWE to a tokenizer whose MWEs are '
+                            'stored in a CompactTrie')
         self._mwes.insert(mwe)
 
     def tokenize(self, text):
@@ -91,29 +107,36 @@ class MWETokenizer(TokenizerI):
         ['An', "hors+d'oeuvre", 'tonight,', 'sir?']
         
         """
-        i = 0
-        n = len(text)
         result = []
+        i = 0
+        for (start, end) in self.mwe_spans(text):
+            result.extend(text[i:start])
+            result.append(self._separator.join(text[start:end]))
+            i = end
+        result.extend(text[i:])
+        return result
 
-        while i < n:
-            if text[i] in self._mwes:
-                # possible MWE match
-                j = i
-                trie = self._mwes
-                while j < n and text[j] in trie:
-                    trie = trie[text[j]]
-                    j = j + 1
-                else:
-                    if Trie.LEAF in trie:
-                        # success!
-                        result.append(self._separator.join(text[i:j]))
-                        i = j
-                    else:
-                        # no match, so backtrack
-                        result.append(text[i])
-                        i += 1
-            else:
-                result.append(text[i])
-                i += 1
+    def mwe_spans(self, text, all_matches=False):
+        """
+        Return the ``(start, end)`` spans of the multi-word expressions in
+        ``text``.  By default, these are the spans that ``tokenize()``
+        merges: at each position, the longest MWE that starts there, if
+        any, after which the search continues from its end.
 
-        return result
+        :param text: A list containing tokenized text
+        :type text: list(str)
+        :param all_matches: If true, return the spans of all occurrences
+            of MWEs, including overlapping ones.
+        :rtype: list(tuple(int, int))
+
+        >>> tokenizer = MWETokenizer([('new', 'york'), ('york', 'city'),
+        ...                           ('new', 'york', 'city', 'hall')])
+        >>> text = 'new york city'.split()
+        >>> tokenizer.mwe_spans(text)
+        [(0, 2)]
+        >>> tokenizer.mwe_spans(text, all_matches=True)
+        [(0, 2), (1, 3)]
+        """
+        if all_matches:
+            return self._mwes.find_all(text)
+        return self._mwes.find_longest(text)
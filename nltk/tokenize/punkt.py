@@ -107,11 +107,13 @@ from __future__ import print_function, unicode_literals, division
 
 import re
 import math
+import struct
 from collections import defaultdict
 
 from nltk.compat import unicode_repr, python_2_unicode_compatible, string_types
 from nltk.probability import FreqDist
 from nltk.tokenize.api import TokenizerI
+from nltk.util import CompactStringTable, encode_string_table, open_buffer
 
 ######################################################################
 #{ Orthographic Context Constants
@@ -313,6 +315,33 @@ def _pair_iter(it):
         prev = el
     yield (prev, None)
 
+def _read_blocks(stream, size):
+    """
+    Yields the contents of the given file object, in blocks of up to
+    ``size`` characters.
+    """
+    while True:
+        block = stream.read(size)
+        if not block:
+            return
+        yield block
+
+def _last_complete_word(text):
+    """
+    Returns the start of the last whitespace-delimited word of the given
+    text that is followed by whitespace, or 0 if there is none.  A
+    period context that ends before it cannot be changed by appending
+    more text.
+    """
+    end = len(text)
+    while end and not text[end-1].isspace():
+        end -= 1
+    while end and text[end-1].isspace():
+        end -= 1
+    while end and not text[end-1].isspace():
+        end -= 1
+    return end
+
 ######################################################################
 #{ Punkt Parameters
 ######################################################################
@@ -370,6 +399,113 @@ class PunktParameters(object):
         if c & _ORTHO_UNK_LC:
             yield 'UNK-LC'
 
+    def dump(self, stream):
+        """
+        Write these parameters to the binary file ``stream``, in the
+        compact format that is read by ``CompactPunktParameters``.
+        """
+        tables = [
+            encode_string_table(self.abbrev_types),
+            encode_string_table(_PAIR_SEP.join(pair) for pair in self.collocations),
+            encode_string_table(self.sent_starters),
+            encode_string_table((typ, flags) for (typ, flags)
+                          in self.ortho_context.items() if flags),
+        ]
+        offset = _HEADER.size
+        offsets = []
+        for table in tables:
+            offsets.append(offset)
+            offset += len(table)
+        stream.write(_HEADER.pack(_MAGIC, _VERSION, len(tables), *offsets))
+        for table in tables:
+            stream.write(table)
+
+######################################################################
+#{ Compact Punkt Parameters
+######################################################################
+
+# The compact format of Punkt parameters is a header, followed by four
+# string tables (abbrev_types, collocations, sent_starters and
+# ortho_context) in the format of ``nltk.util.CompactStringTable``; all
+# integers are little-endian unsigned 32-bit integers.  The header holds
+# a magic string, the format version, the number of tables, and the
+# offset of each table.  A collocation is stored as the two types,
+# separated by a NUL.
+
+_MAGIC = b'NLTKPNKT'
+_VERSION = 1
+_HEADER = struct.Struct(str('<8sII4I'))
+_PAIR_SEP = '\x00'
+
+class CompactPairTable(CompactStringTable):
+    """
+    A ``CompactStringTable`` whose strings are pairs of strings.
+    """
+    def _key(self, key):
+        return _PAIR_SEP.join(key).encode('utf-8')
+
+    def __iter__(self):
+        return (tuple(self._string(i).split(_PAIR_SEP))
+                for i in range(self._n))
+
+class CompactPunktParameters(PunktParameters):
+    """
+    Punkt parameters that are read directly from a buffer (such as a
+    memory-mapped file) in the compact format that is written by
+    ``PunktParameters.dump()``.  Their sets are queried without being
+    unpickled or otherwise decoded, so loading them takes constant
+    time.  They cannot be modified.
+
+        >>> from io import BytesIO
+        >>> from nltk.tokenize.punkt import (PunktParameters,
+        ...     CompactPunktParameters)
+        >>> params = PunktParameters()
+        >>> params.abbrev_types.update(['dr', 'etc'])
+        >>> params.collocations.add(('s.', 'bach'))
+        >>> params.add_ortho_context('the', 1)
+        >>> stream = BytesIO()
+        >>> params.dump(stream)
+        >>> compact = CompactPunktParameters(stream.getvalue())
+        >>> 'dr' in compact.abbrev_types, 'mr' in compact.abbrev_types
+        (True, False)
+        >>> ('s.', 'bach') in compact.collocations
+        True
+        >>> compact.ortho_context['the'], compact.ortho_context['a']
+        (1, 0)
+    """
+    def __init__(self, buf):
+        """
+        :param buf: The compact parameters, as a byte string or other
+            buffer (e.g., an ``mmap``).
+        """
+        if len(buf) < _HEADER.size:
+            raise ValueError('Not a compact Punkt parameters file')
+        header = _HEADER.unpack_from(buf, 0)
+        magic, version, n_tables = header[:3]
+        if magic != _MAGIC:
+            raise ValueError('Not a compact Punkt parameters file')
+        if version != _VERSION:
+            raise ValueError('Unsupported compact Punkt parameters '
+                             'version: %d' % version)
+        offsets = header[3:]
+        self._buf = buf
+        self.abbrev_types = CompactStringTable(buf, offsets[0])
+        self.collocations = CompactPairTable(buf, offsets[1])
+        self.sent_starters = CompactStringTable(buf, offsets[2])
+        self.ortho_context = CompactStringTable(buf, offsets[3])
+
+    @classmethod
+    def open(cls, stream):
+        """
+        Return the compact parameters that are stored in the binary file
+        ``stream``.  If it is a file on disk, then it is memory-mapped;
+        otherwise, it is read into memory.
+        """
+        return cls(open_buffer(stream, _MAGIC))
+
+    def __reduce__(self):
+        return (self.__class__, (self._buf[:],))
+
 ######################################################################
 #{ PunktToken
 ######################################################################
@@ -509,6 +645,22 @@ class PunktToken(object):
             res += '<S>'
         return res
 
+
+class _CandidateToken(PunktToken):
+    """
+    A ``PunktToken`` with a cheaper constructor, which is used by
+    ``PunktSentenceTokenizer.span_tokenize()`` for the tokens around a
+    candidate sentence break.
+    """
+    __slots__ = ()
+
+    def __init__(self, tok):
+        self.tok = tok
+        self.type = self._get_type(tok)
+        self.period_final = tok.endswith('.')
+        self.parastart = self.linestart = None
+        self.sentbreak = self.abbr = self.ellipsis = None
+
 ######################################################################
 #{ Punkt base class
 ######################################################################
@@ -1258,11 +1410,126 @@ class PunktSentenceTokenizer(PunktBaseClass,TokenizerI):
         """
         Given a text, returns a list of the (start, end) spans of sentences
         in the text.
+
+        Only the contexts matched by the language's
+        ``period_context_re()`` are tokenized, and only the tokens that
+        may end a sentence are annotated.
         """
-        slices = self._slices_from_text(text)
+        if self._Token is not PunktToken:
+            # A custom token class may change any of the heuristics.
+            slices = self._slices_from_text(text)
+            if realign_boundaries:
+                slices = self._realign_boundaries(text, slices)
+            return [(sl.start, sl.stop) for sl in slices]
+
+        spans = []
+        last_break = 0
+        contains_sentbreak = self._context_contains_sentbreak
+        for match in self._lang_vars.period_context_re().finditer(text):
+            if contains_sentbreak(match.group() + match.group('after_tok')):
+                spans.append((last_break, match.end()))
+                if match.group('next_tok'):
+                    # next sentence starts after whitespace
+                    last_break = match.start('next_tok')
+                else:
+                    # next sentence starts at following punctuation
+                    last_break = match.end()
+        spans.append((last_break, len(text)))
         if realign_boundaries:
-            slices = self._realign_boundaries(text, slices)
-        return [(sl.start, sl.stop) for sl in slices]
+            spans = self._realign_spans(text, spans)
+        return spans
+
+    def tokenize_stream(self, stream, realign_boundaries=True):
+        """
+        Given a file object opened in text mode, or an iterator of strings
+        (such as the lines of a file), generates the sentences of the text
+        that it contains.  The sentences are the same as those returned by
+        ``tokenize()`` for the whole text, but the text is read
+        incrementally, and only the text of the sentences that have not
+        yet been completed is kept in memory.
+        """
+        if hasattr(stream, 'read'):
+            stream = _read_blocks(stream, self.BLOCK_SIZE)
+        stream = iter(stream)
+        if self._Token is PunktToken:
+            contains_sentbreak = self._context_contains_sentbreak
+        else:
+            contains_sentbreak = self.text_contains_sentbreak
+        period_context_re = self._lang_vars.period_context_re()
+        realignment_re = self._lang_vars.re_boundary_realignment
+
+        text = ''       # the text that has been scanned but not yet yielded
+        chunks = []     # the text that has been read but not yet scanned
+        unscanned = 0   # the total length of chunks
+        offset = 0      # the position of text in the stream
+        scan = 0        # where to look for the next period context in text
+        last_break = 0  # where the current sentence starts in the stream
+        pending = []    # sentence spans that have not yet been yielded
+        realign = 0
+        done = False
+        while not done:
+            try:
+                chunk = next(stream)
+            except StopIteration:
+                done = True
+            else:
+                chunks.append(chunk)
+                unscanned += len(chunk)
+                # Appending to text copies it, so while a long sentence
+                # is unfinished, wait until as much new text has been
+                # read; this keeps the total time linear.
+                if unscanned < len(text):
+                    continue
+            text += ''.join(chunks)
+            chunks = []
+            unscanned = 0
+            limit = len(text) if done else _last_complete_word(text)
+
+            # Only decide on the period contexts which more text would
+            # not change.
+            for match in period_context_re.finditer(text, scan):
+                if match.end() > limit:
+                    break
+                scan = match.end()
+                if contains_sentbreak(match.group() + match.group('after_tok')):
+                    pending.append((last_break, offset + match.end()))
+                    if match.group('next_tok'):
+                        # next sentence starts after whitespace
+                        last_break = offset + match.start('next_tok')
+                    else:
+                        # next sentence starts at following punctuation
+                        last_break = offset + match.end()
+            # No period context can start before limit any more.
+            scan = max(scan, limit)
+            if done:
+                pending.append((last_break, offset + len(text)))
+
+            if not realign_boundaries:
+                for (start, end) in pending:
+                    yield text[start-offset:end-offset]
+                pending = []
+            # Realigning a sentence needs the span of the next one.
+            while len(pending) > 1 or (done and pending):
+                start, end = pending.pop(0)
+                start += realign
+                if pending:
+                    next_start, next_end = pending[0]
+                    m = realignment_re.match(text, next_start - offset,
+                                             next_end - offset)
+                    if m:
+                        yield text[start-offset:next_start-offset +
+                                   len(m.group(0).rstrip())]
+                        realign = m.end() - (next_start - offset)
+                        continue
+                    realign = 0
+                if end > start:
+                    yield text[start-offset:end-offset]
+
+            keep = min(pending[0][0] if pending else last_break,
+                       offset + scan)
+            text = text[keep-offset:]
+            scan -= keep - offset
+            offset = keep
 
     def sentences_from_text(self, text, realign_boundaries=True):
         """
@@ -1317,6 +1584,63 @@ class PunktSentenceTokenizer(PunktBaseClass,TokenizerI):
                 if text[sl1]:
                     yield sl1
 
+    def _realign_spans(self, text, spans):
+        """
+        Like ``_realign_boundaries()``, but for a list of (start, end)
+        spans, and without copying the sentences out of ``text``.
+        """
+        match = self._lang_vars.re_boundary_realignment.match
+        realigned = []
+        realign = 0
+        last = len(spans) - 1
+        for i, (start, end) in enumerate(spans):
+            start += realign
+            if i == last:
+                if end > start:
+                    realigned.append((start, end))
+                continue
+
+            next_start, next_end = spans[i+1]
+            m = match(text, next_start, next_end)
+            if m:
+                realigned.append((start, next_start +
+                                  len(m.group(0).rstrip())))
+                realign = m.end() - next_start
+            else:
+                realign = 0
+                if end > start:
+                    realigned.append((start, end))
+        return realigned
+
+    def _context_contains_sentbreak(self, context):
+        """
+        Returns True if the given period context includes a sentence
+        break.  This gives the same result as ``text_contains_sentbreak()``,
+        but only the tokens that can be sentence breaks, and the tokens
+        that follow them, are annotated.
+        """
+        if '\n' in context:
+            words = [word for line in context.split('\n')
+                     for word in self._lang_vars.word_tokenize(line)]
+        else:
+            words = self._lang_vars.word_tokenize(context)
+        sent_end_chars = self._lang_vars.sent_end_chars
+        for i in range(len(words) - 1):
+            word = words[i]
+            if not word.endswith('.'):
+                if word in sent_end_chars:
+                    # The second pass only reconsiders period-final tokens.
+                    return True
+                continue
+            aug_tok1 = _CandidateToken(word)
+            aug_tok2 = _CandidateToken(words[i+1])
+            self._first_pass_annotation(aug_tok1)
+            self._first_pass_annotation(aug_tok2)
+            self._second_pass_annotation(aug_tok1, aug_tok2)
+            if aug_tok1.sentbreak:
+                return True
+        return False
+
     def text_contains_sentbreak(self, text):
         """
         Returns True if the given text includes a sentence break.
@@ -1447,6 +1771,10 @@ class PunktSentenceTokenizer(PunktBaseClass,TokenizerI):
 
     PUNCTUATION = tuple(';:,.!?')
 
+    BLOCK_SIZE = 65536
+    """The number of characters that ``tokenize_stream()`` reads from a
+    file object at a time."""
+
     #////////////////////////////////////////////////////////////
     #{ Annotation Procedures
     #////////////////////////////////////////////////////////////
@@ -7,7 +7,10 @@
 # For license information, see LICENSE.TXT
 
 import re
-import math
+import array
+import bisect
+import string
+import itertools
 
 try:
     import numpy
@@ -20,6 +23,12 @@ BLOCK_COMPARISON, VOCABULARY_INTRODUCTION = 0, 1
 LC, HC = 0, 1
 DEFAULT_SMOOTHING = [0]
 
+# Punctuation is removed from the lowercased text before it is divided
+# into words; and the words of the original text end at whitespace.
+_NOPUNCT = re.compile("[^a-z\-\' \n\t]")
+_WORD = re.compile("[a-z]+")
+_WORD_END = re.compile("[^ \t\n][ \t\n]")
+
 
 class TextTilingTokenizer(TokenizerI):
     """Tokenize a document into topical sections using the TextTiling algorithm.
@@ -81,206 +90,265 @@ class TextTilingTokenizer(TokenizerI):
         self.__dict__.update(locals())
         del self.__dict__['self']
 
+    # The number of characters that tokenize_stream() and
+    # span_tokenize_stream() read from a file object at a time.
+    BLOCK_SIZE = 65536
+
+    # The number of gaps whose block comparison scores are computed at
+    # once.  Only the pseudosentences of the blocks around these gaps are
+    # kept in memory.
+    BATCH_SIZE = 256
+
     def tokenize(self, text):
         """Return a tokenized copy of *text*, where each "token" represents
         a separate topic."""
 
-        lowercase_text = text.lower()
-        paragraph_breaks = self._mark_paragraph_breaks(text)
-        text_length = len(lowercase_text)
-
-        # Tokenization step starts here
-
-        # Remove punctuation
-        nopunct_text = ''.join(c for c in lowercase_text
-                               if re.match("[a-z\-\' \n\t]", c))
-        nopunct_par_breaks = self._mark_paragraph_breaks(nopunct_text)
-
-        tokseqs = self._divide_to_tokensequences(nopunct_text)
-
-        # The morphological stemming step mentioned in the TextTile
-        # paper is not implemented.  A comment in the original C
-        # implementation states that it offers no benefit to the
-        # process. It might be interesting to test the existing
-        # stemmers though.
-        #words = _stem_words(words)
-
-        # Filter stopwords
-        for ts in tokseqs:
-            ts.wrdindex_list = [wi for wi in ts.wrdindex_list
-                                if wi[0] not in self.stopwords]
+        (gap_scores, smooth_scores, depth_scores, segment_boundaries,
+         normalized_boundaries, text_length) = self._segment([text])
 
-        token_table = self._create_token_table(tokseqs, nopunct_par_breaks)
-        # End of the Tokenization step
-
-        # Lexical score determination
-        if self.similarity_method == BLOCK_COMPARISON:
-            gap_scores = self._block_comparison(tokseqs, token_table)
-        elif self.similarity_method == VOCABULARY_INTRODUCTION:
+        if self.demo_mode:
+            return (gap_scores.tolist(), smooth_scores.tolist(),
+                    depth_scores.tolist(), segment_boundaries.tolist())
+        return [text[start:end] for (start, end)
+                in _segment_spans(normalized_boundaries, text_length)]
+
+    def span_tokenize_stream(self, stream):
+        """
+        Given a file object opened in text mode, or an iterator of strings
+        (such as the lines of a file), generates the ``(start, end)``
+        character offsets of the topical sections of the text that it
+        contains.  The sections are the same as those returned by
+        ``tokenize()`` for the whole text, but the text is read
+        incrementally, and besides a few numbers for each pseudosentence
+        and paragraph, only the words of the pseudosentences around the
+        gaps that are being scored are kept in memory.
+        """
+        if hasattr(stream, 'read'):
+            read, size = stream.read, self.BLOCK_SIZE
+            stream = iter(lambda: read(size), '')
+        result = self._segment(stream)
+        for span in _segment_spans(*result[4:]):
+            yield span
+
+    def tokenize_stream(self, stream):
+        """
+        Given a seekable file object opened in text mode, generates the
+        topical sections of the text that it contains, as found by
+        ``span_tokenize_stream()``.  The text is read once to find the
+        sections, and once more to generate them.
+        """
+        position = stream.tell()
+        spans = list(self.span_tokenize_stream(stream))
+        stream.seek(position)
+        for (start, end) in spans:
+            yield stream.read(end - start)
+
+    def _segment(self, blocks):
+        """
+        Segment the text that is given by the iterable *blocks* of strings,
+        and return its gap scores, smoothed gap scores, depth scores and
+        segment boundaries (as ``tokenize()`` does in demo mode), and the
+        boundaries normalized to its paragraph breaks, and its length.
+        """
+        if self.similarity_method == VOCABULARY_INTRODUCTION:
             raise NotImplementedError("Vocabulary introduction not implemented")
 
+        w, k = self.w, self.k
+        stopwords = set(self.stopwords)
+        vocabulary = {}
+        paragraph_breaks = _ParagraphBreakFinder()
+        nopunct_par_breaks = _ParagraphBreakFinder()
+
+        text_length = 0
+        last_char = ''      # the last character of the text read so far
+        word_count = 0      # the number of whitespace-delimited words
+        gap_positions = array.array('l')  # where each gap is in the text
+        partial_word = ''   # a word that may continue in the next block
+        tokseq = []         # the words of the current pseudosentence
+        tokseq_length = 0   # its length, including stopwords
+        tokseqs = []        # the pseudosentences around the next gaps
+        first_tokseq = 0    # the number of the first of those
+        gap_scores = array.array('d')
+
+        # The last "block" is None, to mark the end of the text.
+        for block in itertools.chain(blocks, [None]):
+            at_end = block is None
+            if at_end:
+                block = ''
+            paragraph_breaks.feed(block)
+
+            # A gap between pseudosentences is placed in the text after
+            # the same number of whitespace-delimited words as there are
+            # words before it, and then moved to the closest paragraph
+            # break.  Only every w-th word end is needed to place the gaps.
+            offset = text_length - len(last_char)
+            ends = [match.end() for match in
+                    _WORD_END.finditer(last_char + block)]
+            skip = -word_count % w
+            for (i, end) in enumerate(ends[skip::w]):
+                count = word_count + skip + i * w + 1
+                if count == w + 1:
+                    # The first two gaps are placed a character apart.
+                    gap_positions.extend([offset + end, offset + end + 1])
+                elif count > w + 1:
+                    gap_positions.append(offset + end)
+            word_count += len(ends)
+            text_length += len(block)
+            last_char = block[-1:] or last_char
+
+            # Tokenization: remove punctuation, then divide the words into
+            # pseudosentences.  The morphological stemming step mentioned
+            # in the TextTile paper is not implemented.  A comment in the
+            # original C implementation states that it offers no benefit
+            # to the process.
+            nopunct_block = _NOPUNCT.sub('', block.lower())
+            nopunct_par_breaks.feed(nopunct_block)
+            nopunct_block = partial_word + nopunct_block
+            if at_end:
+                cut = len(nopunct_block)
+            else:
+                cut = len(nopunct_block.rstrip(string.ascii_lowercase))
+            partial_word = nopunct_block[cut:]
+            for word in _WORD.findall(nopunct_block, 0, cut):
+                if word not in stopwords:
+                    tokseq.append(vocabulary.setdefault(word, len(vocabulary)))
+                tokseq_length += 1
+                if tokseq_length == w:
+                    tokseqs.append(tokseq)
+                    tokseq, tokseq_length = [], 0
+
+            # Score the gaps whose blocks are complete, and forget the
+            # pseudosentences that no gap that is left needs.
+            num_tokseqs = first_tokseq + len(tokseqs)
+            while num_tokseqs - k - len(gap_scores) >= self.BATCH_SIZE:
+                start = len(gap_scores)
+                gap_scores.extend(self._block_comparison(
+                    tokseqs, first_tokseq, start, start + self.BATCH_SIZE,
+                    num_tokseqs))
+            forget = len(gap_scores) - k + 1 - first_tokseq
+            if forget > 0:
+                del tokseqs[:forget]
+                first_tokseq += forget
+
+        if tokseq_length:
+            tokseqs.append(tokseq)
+        if len(nopunct_par_breaks.close()) == 1:
+            raise ValueError(
+                "No paragraph breaks were found(text too short perhaps?)")
+        num_tokseqs = first_tokseq + len(tokseqs)
+        for start in range(len(gap_scores), num_tokseqs - 1, self.BATCH_SIZE):
+            gap_scores.extend(self._block_comparison(
+                tokseqs, first_tokseq, start,
+                min(start + self.BATCH_SIZE, num_tokseqs - 1), num_tokseqs))
+        # End of the Tokenization step and Lexical score determination
+
+        gap_scores = numpy.array(gap_scores)
         if self.smoothing_method == DEFAULT_SMOOTHING:
             smooth_scores = self._smooth_scores(gap_scores)
-        # End of Lexical score Determination
 
         # Boundary identification
         depth_scores = self._depth_scores(smooth_scores)
         segment_boundaries = self._identify_boundaries(depth_scores)
 
-        normalized_boundaries = self._normalize_boundaries(text,
-                                                           segment_boundaries,
-                                                           paragraph_breaks)
+        paragraph_breaks = paragraph_breaks.close()
+        normalized_boundaries = []
+        for gap in numpy.flatnonzero(segment_boundaries):
+            # Gaps that the text ends before are not placed.
+            if gap >= len(gap_positions):
+                break
+            position = gap_positions[gap]
+            if position < text_length:
+                # find closest paragraph break (the first, if two are)
+                i = bisect.bisect_left(paragraph_breaks, position)
+                if (i == len(paragraph_breaks) or position-paragraph_breaks[i-1]
+                                                  <= paragraph_breaks[i]-position):
+                    i -= 1
+                if paragraph_breaks[i] not in normalized_boundaries[-1:]:
+                    normalized_boundaries.append(paragraph_breaks[i])
         # End of Boundary Identification
-        segmented_text = []
-        prevb = 0
-
-        for b in normalized_boundaries:
-            if b == 0:
-                continue
-            segmented_text.append(text[prevb:b])
-            prevb = b
-
-        if prevb < text_length: # append any text that may be remaining
-            segmented_text.append(text[prevb:])
-
-        if not segmented_text:
-            segmented_text = [text]
-
-        if self.demo_mode:
-            return gap_scores, smooth_scores, depth_scores, segment_boundaries
-        return segmented_text
-
-    def _block_comparison(self, tokseqs, token_table):
-        "Implements the block comparison method"
-        def blk_frq(tok, block):
-            ts_occs = filter(lambda o: o[0] in block,
-                             token_table[tok].ts_occurences)
-            freq = sum([tsocc[1] for tsocc in ts_occs])
-            return freq
-
-        gap_scores = []
-        numgaps = len(tokseqs)-1
-
-        for curr_gap in range(numgaps):
-            score_dividend, score_divisor_b1, score_divisor_b2 = 0.0, 0.0, 0.0
-            score = 0.0
-            #adjust window size for boundary conditions
-            if curr_gap < self.k-1:
-                window_size = curr_gap + 1
-            elif curr_gap > numgaps-self.k:
-                window_size = numgaps - curr_gap
-            else:
-                window_size = self.k
-
-            b1 = [ts.index
-                  for ts in tokseqs[curr_gap-window_size+1 : curr_gap+1]]
-            b2 = [ts.index
-                  for ts in tokseqs[curr_gap+1 : curr_gap+window_size+1]]
-
-            for t in token_table:
-                score_dividend += blk_frq(t, b1)*blk_frq(t, b2)
-                score_divisor_b1 += blk_frq(t, b1)**2
-                score_divisor_b2 += blk_frq(t, b2)**2
-            try:
-                score = score_dividend/math.sqrt(score_divisor_b1*
-                                                 score_divisor_b2)
-            except ZeroDivisionError:
-                pass # score += 0.0
 
-            gap_scores.append(score)
-
-        return gap_scores
+        return (gap_scores, smooth_scores, depth_scores, segment_boundaries,
+                normalized_boundaries, text_length)
+
+    def _block_comparison(self, tokseqs, first, start, end, num_tokseqs):
+        """
+        Implements the block comparison method.  Returns the scores of the
+        gaps from *start* to *end*, between pseudosentences of a text with
+        at least *num_tokseqs* of them, given as lists of word ids;
+        *tokseqs* holds those from number *first* on.
+        """
+        k = self.k
+        numgaps = num_tokseqs - 1
+        gaps = numpy.arange(start, end)
+        #adjust window size for boundary conditions
+        window_sizes = numpy.where(gaps < k-1, gaps + 1,
+                                   numpy.where(gaps > numgaps-k,
+                                               numgaps - gaps, k))
+        b1_starts = gaps - window_sizes + 1
+        b2_ends = numpy.minimum(gaps + window_sizes + 1, num_tokseqs)
+        lo, hi = b1_starts[0], b2_ends.max()
+        window = tokseqs[lo-first : hi-first]
+        n = len(window)
+
+        # The word counts of the pseudosentences, as a sparse matrix: the
+        # row and column of each count, sorted by column (word id).
+        lengths = [len(ts) for ts in window]
+        word_ids = numpy.fromiter(itertools.chain.from_iterable(window),
+                                  numpy.int64, sum(lengths))
+        keys, counts = numpy.unique(
+            word_ids * n + numpy.repeat(numpy.arange(n), lengths),
+            return_counts=True)
+        cols, rows = keys // n, keys % n
+        counts = counts.astype(float)
+
+        # The dot products of the pairs of pseudosentences that are at
+        # most 2k-1 apart, i.e. that can be in the blocks of one gap.  A
+        # word has at most one count per row, so the counts of a word in
+        # two such rows are less than 2k apart.
+        index, weights = [rows * (n+1)], [counts * counts]
+        for d in range(1, 2*k):
+            near = (cols[d:] == cols[:-d]) & (rows[d:] - rows[:-d] < 2*k)
+            i, j = rows[:-d][near], rows[d:][near]
+            products = (counts[:-d] * counts[d:])[near]
+            index += [i*n + j, j*n + i]
+            weights += [products, products]
+        products = numpy.bincount(numpy.concatenate(index),
+                                  weights=numpy.concatenate(weights),
+                                  minlength=n*n).reshape(n, n)
+        # The sum of the products of the pseudosentences in any two
+        # blocks is then the difference of four cumulative sums.
+        sums = numpy.zeros((n+1, n+1))
+        sums[1:, 1:] = products.cumsum(0).cumsum(1)
+        def block_sum(r1, r2, c1, c2):
+            return sums[r2, c2] - sums[r1, c2] - sums[r2, c1] + sums[r1, c1]
+
+        b1, b2, b2_end = b1_starts - lo, gaps + 1 - lo, b2_ends - lo
+        score_dividend = block_sum(b1, b2, b2, b2_end)
+        score_divisor = (block_sum(b1, b2, b1, b2) *
+                         block_sum(b2, b2_end, b2, b2_end))
+        gap_scores = numpy.zeros(len(gaps))
+        nonzero = score_divisor != 0
+        gap_scores[nonzero] = (score_dividend[nonzero] /
+                               numpy.sqrt(score_divisor[nonzero]))
+        return gap_scores.tolist()
 
     def _smooth_scores(self, gap_scores):
         "Wraps the smooth function from the SciPy Cookbook"
-        return list(smooth(numpy.array(gap_scores[:]),
-                           window_len = self.smoothing_width+1))
+        return smooth(numpy.array(gap_scores[:]),
+                      window_len = self.smoothing_width+1)
 
     def _mark_paragraph_breaks(self, text):
         """Identifies indented text or line breaks as the beginning of
         paragraphs"""
-
-        MIN_PARAGRAPH = 100
-        pattern = re.compile("[ \t\r\f\v]*\n[ \t\r\f\v]*\n[ \t\r\f\v]*")
-        matches = pattern.finditer(text)
-
-        last_break = 0
-        pbreaks = [0]
-        for pb in matches:
-            if pb.start()-last_break < MIN_PARAGRAPH:
-                continue
-            else:
-                pbreaks.append(pb.start())
-                last_break = pb.start()
-
-        return pbreaks
-
-    def _divide_to_tokensequences(self, text):
-        "Divides the text into pseudosentences of fixed size"
-        w = self.w
-        wrdindex_list = []
-        matches = re.finditer("\w+", text)
-        for match in matches:
-            wrdindex_list.append((match.group(), match.start()))
-        return [TokenSequence(i/w, wrdindex_list[i:i+w])
-                for i in range(0, len(wrdindex_list), w)]
-
-    def _create_token_table(self, token_sequences, par_breaks):
-        "Creates a table of TokenTableFields"
-        token_table = {}
-        current_par = 0
-        current_tok_seq = 0
-        pb_iter = par_breaks.__iter__()
-        current_par_break = next(pb_iter)
-        if current_par_break == 0:
-            try:
-                current_par_break = next(pb_iter) #skip break at 0
-            except StopIteration:
-                raise ValueError(
-                    "No paragraph breaks were found(text too short perhaps?)"
-                    )
-        for ts in token_sequences:
-            for word, index in ts.wrdindex_list:
-                try:
-                    while index > current_par_break:
-                        current_par_break = next(pb_iter)
-                        current_par += 1
-                except StopIteration:
-                    #hit bottom
-                    pass
-
-                if word in token_table:
-                    token_table[word].total_count += 1
-
-                    if token_table[word].last_par != current_par:
-                        token_table[word].last_par = current_par
-                        token_table[word].par_count += 1
-
-                    if token_table[word].last_tok_seq != current_tok_seq:
-                        token_table[word].last_tok_seq = current_tok_seq
-                        token_table[word]\
-                                .ts_occurences.append([current_tok_seq,1])
-                    else:
-                        token_table[word].ts_occurences[-1][1] += 1
-                else: #new word
-                    token_table[word] = TokenTableField(first_pos=index,
-                                                        ts_occurences= \
-                                                          [[current_tok_seq,1]],
-                                                        total_count=1,
-                                                        par_count=1,
-                                                        last_par=current_par,
-                                                        last_tok_seq= \
-                                                          current_tok_seq)
-
-            current_tok_seq += 1
-
-        return token_table
+        finder = _ParagraphBreakFinder()
+        finder.feed(text)
+        return list(finder.close())
 
     def _identify_boundaries(self, depth_scores):
         """Identifies boundaries at the peaks of similarity score
         differences"""
 
-        boundaries = [0 for x in depth_scores]
+        boundaries = numpy.zeros(len(depth_scores), int)
 
         avg = sum(depth_scores)/len(depth_scores)
         stdev = numpy.std(depth_scores)
@@ -291,79 +359,95 @@ class TextTilingTokenizer(TokenizerI):
         else:
             cutoff = avg-stdev/2.0
 
-        depth_tuples = sorted(zip(depth_scores, range(len(depth_scores))))
-        depth_tuples.reverse()
-        hp = list(filter(lambda x:x[0]>cutoff, depth_tuples))
+        #the gaps by decreasing depth (and position, for equal depths)
+        depth_order = numpy.lexsort((numpy.arange(len(depth_scores)),
+                                     depth_scores))[::-1]
+        hp = depth_order[depth_scores[depth_order] > cutoff]
 
-        for dt in hp:
-            boundaries[dt[1]] = 1
-            for dt2 in hp: #undo if there is a boundary close already
-                if dt[1] != dt2[1] and abs(dt2[1]-dt[1]) < 4 \
-                       and boundaries[dt2[1]] == 1:
-                    boundaries[dt[1]] = 0
+        for gap in hp:
+            #skip if there is a boundary close already
+            if not boundaries[max(gap-3, 0):gap+4].any():
+                boundaries[gap] = 1
         return boundaries
 
     def _depth_scores(self, scores):
         """Calculates the depth of each gap, i.e. the average difference
         between the left and right peaks and the gap's score"""
 
-        depth_scores = [0 for x in scores]
+        depth_scores = numpy.zeros(len(scores))
         #clip boundaries: this holds on the rule of thumb(my thumb)
         #that a section shouldn't be smaller than at least 2
         #pseudosentences for small texts and around 5 for larger ones.
 
-        clip = min(max(len(scores)/10, 2), 5)
-        index = clip
-
-        for gapscore in scores[clip:-clip]:
-            lpeak = gapscore
-            for score in scores[index::-1]:
-                if score >= lpeak:
-                    lpeak = score
-                else:
-                    break
-            rpeak = gapscore
-            for score in scores[index:]:
-                if score >= rpeak:
-                    rpeak = score
-                else:
-                    break
-            depth_scores[index] = lpeak + rpeak - 2 * gapscore
-            index += 1
-
+        clip = min(max(len(scores)//10, 2), 5)
+        if len(scores) <= 2*clip:
+            return depth_scores
+
+        #the left peak of a gap is the score of the closest gap to its
+        #left (or itself) with a lower score to the left of it, and
+        #likewise to the right
+        index = numpy.arange(len(scores))
+        rises = numpy.r_[True, scores[:-1] < scores[1:]]
+        lpeaks = scores[numpy.maximum.accumulate(numpy.where(rises, index, 0))]
+        falls = numpy.r_[scores[:-1] > scores[1:], True]
+        rpeaks = scores[::-1][numpy.maximum.accumulate(
+            numpy.where(falls[::-1], index, 0))][::-1]
+
+        depth_scores[clip:-clip] = (lpeaks + rpeaks - 2 * scores)[clip:-clip]
         return depth_scores
 
-    def _normalize_boundaries(self, text, boundaries, paragraph_breaks):
-        """Normalize the boundaries identified to the original text's
-        paragraph breaks"""
-
-        norm_boundaries = []
-        char_count, word_count, gaps_seen = 0, 0, 0
-        seen_word = False
-
-        for char in text:
-            char_count += 1
-            if char in " \t\n" and seen_word:
-                seen_word = False
-                word_count += 1
-            if char not in " \t\n" and not seen_word:
-                seen_word=True
-            if gaps_seen < len(boundaries) and word_count > \
-                                               (max(gaps_seen*self.w, self.w)):
-                if boundaries[gaps_seen] == 1:
-                    #find closest paragraph break
-                    best_fit = len(text)
-                    for br in paragraph_breaks:
-                        if best_fit > abs(br-char_count):
-                            best_fit = abs(br-char_count)
-                            bestbr = br
-                        else:
-                            break
-                    if bestbr not in norm_boundaries: #avoid duplicates
-                        norm_boundaries.append(bestbr)
-                gaps_seen += 1
-
-        return norm_boundaries
+
+def _segment_spans(boundaries, text_length):
+    """
+    Return the ``(start, end)`` offsets of the segments of a text of the
+    given length that start at the given normalized boundaries.
+    """
+    spans = []
+    prevb = 0
+    for b in boundaries:
+        if b == 0:
+            continue
+        spans.append((prevb, b))
+        prevb = b
+    if prevb < text_length or not spans: # append any text that may be remaining
+        spans.append((prevb, text_length))
+    return spans
+
+
+class _ParagraphBreakFinder(object):
+    """
+    Finds the paragraph breaks of a text that is given to it a block at
+    a time, as ``TextTilingTokenizer._mark_paragraph_breaks()`` does.
+    """
+
+    MIN_PARAGRAPH = 100
+    _PATTERN = re.compile("[ \t\r\f\v]*\n[ \t\r\f\v]*\n[ \t\r\f\v]*")
+
+    def __init__(self):
+        self._breaks = array.array('l', [0])
+        self._text = ''     # trailing whitespace that may be part of a break
+        self._offset = 0
+
+    def feed(self, block):
+        text = self._text + block
+        # Only the trailing whitespace could be part of a break that
+        # continues in the next block.
+        end = len(text.rstrip(" \t\r\f\v\n"))
+        self._find(text, end)
+        self._text = text[end:]
+        self._offset += end
+
+    def close(self):
+        """Return the positions of the breaks in the whole text."""
+        self._find(self._text, len(self._text))
+        self._text = ''
+        return self._breaks
+
+    def _find(self, text, end):
+        for pb in self._PATTERN.finditer(text, 0, end):
+            start = self._offset + pb.start()
+            if start - self._breaks[-1] >= self.MIN_PARAGRAPH:
+                self._breaks.append(start)
 
 
 class TokenTableField(object):
@@ -93,7 +93,107 @@ class TreebankWordTokenizer(TokenizerI):
     CONTRACTIONS4 = [re.compile(r"(?i)\b(whad)(dd)(ya)\b"),
                      re.compile(r"(?i)\b(wha)(t)(cha)\b")]
 
+    # The maximum number of whitespace-delimited chunks whose tokens
+    # are remembered by tokenize() and span_tokenize().
+    CACHE_SIZE = 100000
+
+    _CHUNK = re.compile(r'\S+')
+
     def tokenize(self, text):
+        tokens = []
+        for (start, chunk_tokens, offsets) in self._chunks(text):
+            tokens.extend(chunk_tokens)
+        return tokens
+
+    def span_tokenize(self, text):
+        """
+        Return the (start, end) offsets of the tokens in ``text``.  The
+        opening and closing quote tokens that replace a double quote are
+        aligned with the double quote.
+
+            >>> from nltk.tokenize import TreebankWordTokenizer
+            >>> s = 'He said, "Don\\'t go."'
+            >>> spans = TreebankWordTokenizer().span_tokenize(s)
+            >>> [s[start:end] for (start, end) in spans]
+            ['He', 'said', ',', '"', 'Do', "n't", 'go', '.', '"']
+        """
+        spans = []
+        for (start, chunk_tokens, offsets) in self._chunks(text):
+            spans.extend((start + s, start + e) for (s, e) in offsets)
+        return spans
+
+    def _chunks(self, text):
+        """
+        Generate a ``(start, tokens, offsets)`` tuple for each
+        whitespace-delimited chunk of ``text``, in a single pass over it.
+
+        The rewrite rules only ever insert spaces and replace double
+        quotes, and never look further than one character beyond a chunk,
+        which is always the original whitespace (or the start or end of
+        the text).  So the tokens of a chunk depend only on the chunk, on
+        the characters just before and after it, and on whether it is the
+        last chunk; and they are cached on those.
+        """
+        last = None
+        for match in self._CHUNK.finditer(text):
+            if last is not None:
+                start, end = last.span()
+                yield (start,) + self._cached_chunk_tokens(
+                    text[start-1] if start else '', last.group(), text[end])
+            last = match
+        if last is not None:
+            # The rules that apply at the end of the text depend on all of
+            # the whitespace that follows the last chunk.
+            start, end = last.span()
+            yield (start,) + self._cached_chunk_tokens(
+                text[start-1] if start else '', last.group(), text[end:],
+                True)
+
+    def _cached_chunk_tokens(self, *key):
+        try:
+            cache = self._cache
+        except AttributeError:
+            cache = self._cache = {}
+        value = cache.get(key)
+        if value is None:
+            if len(cache) >= self.CACHE_SIZE:
+                cache.clear()
+            value = cache[key] = self._chunk_tokens(*key)
+        return value
+
+    def _chunk_tokens(self, before, chunk, after, final=False):
+        """
+        Tokenize ``chunk`` by rewriting it in a context like its own, and
+        return a tuple of its tokens and a tuple of their ``(start, end)``
+        offsets in ``chunk``.
+        """
+        if before:
+            before = 'x' + (' ' if before == ' ' else '\n')
+        if not final:
+            after = (' ' if after == ' ' else '\n') + 'x'
+        tokens = self._rewrite(before + chunk + after).split()
+        if before:
+            tokens = tokens[1:]
+        if not final:
+            tokens = tokens[:-1]
+        offsets = []
+        pos = 0
+        for token in tokens:
+            if chunk.startswith(token, pos):
+                offsets.append((pos, pos + len(token)))
+                pos += len(token)
+            else:
+                # A double quote, which was rewritten as `` or ''.
+                assert chunk[pos] == '"' and token in ('``', "''")
+                offsets.append((pos, pos + 1))
+                pos += 1
+        return tuple(tokens), tuple(offsets)
+
+    def _rewrite(self, text):
+        """
+        Apply the rewrite rules to ``text``, which leaves a space between
+        every pair of tokens.
+        """
         for regexp, substitution in self.STARTING_QUOTES:
             text = regexp.sub(substitution, text)
 
@@ -119,6 +219,6 @@ class TreebankWordTokenizer(TokenizerI):
         # for regexp in self.CONTRACTIONS4:
         #     text = regexp.sub(r' \1 \2 \3 ', text)
 
-        return text.split()
+        return text
 
 
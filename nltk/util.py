@@ -13,6 +13,9 @@ import textwrap
 import pydoc
 import bisect
 import os
+import mmap
+import struct
+import zlib
 
 from itertools import islice, chain, combinations
 from pprint import pprint
@@ -1309,6 +1312,82 @@ class Trie(defaultdict):
             # mark the string is complete
             self[Trie.LEAF] = None
 
+    def prefixes(self, sequence, start=0):
+        """
+        Generate the end of each string in this trie that is a prefix of
+        ``sequence[start:]``, shortest first.
+
+        :Example:
+
+        >>> from nltk.util import Trie
+        >>> trie = Trie(["a", "abc", "b"])
+        >>> list(trie.prefixes("abcd")), trie.longest_prefix("abcd", 1)
+        ([1, 3], 2)
+        """
+        trie = self
+        for end in range(start, len(sequence)):
+            if Trie.LEAF in trie:
+                yield end
+            if sequence[end] not in trie:
+                return
+            trie = trie[sequence[end]]
+        if Trie.LEAF in trie:
+            yield len(sequence)
+
+    def longest_prefix(self, sequence, start=0):
+        """
+        Return the end of the longest string in this trie that is a
+        prefix of ``sequence[start:]``, or None if there is none.
+        """
+        longest = None
+        for longest in self.prefixes(sequence, start):
+            pass
+        return longest
+
+    def find_all(self, sequence):
+        """
+        Return the ``(start, end)`` spans of every occurrence of a string
+        of this trie in ``sequence``, including overlapping ones.
+        """
+        return [(start, end) for start in range(len(sequence))
+                for end in self.prefixes(sequence, start) if end > start]
+
+    def find_longest(self, sequence):
+        """
+        Return the ``(start, end)`` spans of the non-overlapping
+        occurrences of strings of this trie in ``sequence``, choosing
+        the longest string at the leftmost position first.
+        """
+        spans = []
+        start = 0
+        while start < len(sequence):
+            end = self.longest_prefix(sequence, start)
+            if end is not None and end > start:
+                spans.append((start, end))
+                start = end
+            else:
+                start += 1
+        return spans
+
+    def sequences(self, prefix=()):
+        """
+        Generate the strings in this trie, as tuples, each preceded by
+        ``prefix``.
+        """
+        for key, trie in self.items():
+            if key is Trie.LEAF:
+                yield prefix
+            else:
+                for sequence in trie.sequences(prefix + (key,)):
+                    yield sequence
+
+    def compact(self):
+        """
+        Return a ``CompactTrie`` of the strings in this trie, which takes
+        far less memory and can be memory-mapped.
+        """
+        return CompactTrie(self.sequences())
+
     def __str__(self):
         return str(self.as_dict())
 
@@ -1361,3 +1440,506 @@ class Trie(defaultdict):
             return d
         
         return _default_to_regular(self)
+
+######################################################################
+# Compact String Tables
+######################################################################
+
+# A compact string table is a read-only set of strings, or mapping from
+# strings to integers, that can be queried directly in a buffer (such as
+# a memory-mapped file).  All integers are little-endian unsigned 32-bit
+# integers.  A table holds:
+#
+#   - the number of strings (n), the number of hash slots (a power of
+#     two, at least 2n), and a flag that is 1 if strings have values;
+#   - the offsets of the n strings in the string data, plus its length;
+#   - the value of each string, if the flag is 1;
+#   - the hash slots: each holds the number of the string whose (UTF-8
+#     encoded) CRC-32 hash is the slot number, modulo the number of
+#     slots, or the first empty slot after it; or 0xFFFFFFFF if empty;
+#   - the string data: the UTF-8 encoded strings, in sorted order.
+
+_EMPTY_SLOT = 0xFFFFFFFF
+
+def encode_string_table(entries):
+    """
+    Return the compact encoding of a table of strings, given either
+    the strings, or ``(string, value)`` pairs.
+    """
+    entries = sorted((entry.encode('utf-8'), None) if
+                     isinstance(entry, string_types) else
+                     (entry[0].encode('utf-8'), entry[1])
+                     for entry in entries)
+    has_values = bool(entries) and entries[0][1] is not None
+    slots = 1
+    while slots < 2 * len(entries):
+        slots *= 2
+
+    index = [_EMPTY_SLOT] * slots
+    offsets = [0]
+    for i, (key, value) in enumerate(entries):
+        offsets.append(offsets[-1] + len(key))
+        slot = (zlib.crc32(key) & 0xFFFFFFFF) % slots
+        while index[slot] != _EMPTY_SLOT:
+            slot = (slot + 1) % slots
+        index[slot] = i
+
+    ints = [len(entries), slots, int(has_values)] + offsets
+    if has_values:
+        ints += [value for (key, value) in entries]
+    ints += index
+    data = b''.join(key for (key, value) in entries)
+    data += b'\0' * (-len(data) % 4)
+    return struct.pack(str('<%dI' % len(ints)), *ints) + data
+
+class CompactStringTable(object):
+    """
+    A read-only set of strings (or, if the table has values, a
+    mapping from strings to integers) that is stored in a buffer in the
+    format written by ``encode_string_table()``, and is queried without
+    decoding it.
+
+    Each lookup hashes the key and reads the table with ``struct``,
+    which is slower than looking it up in a ``set`` or ``dict``; so the
+    results of up to ``CACHE_SIZE`` lookups are remembered.  The cache
+    is cleared when it is full, which bounds its memory use; but when
+    the keys are very varied, most lookups still read the table, so a
+    ``CompactStringTable`` saves memory and loading time rather than
+    lookup time.
+
+        >>> from nltk.util import CompactStringTable, encode_string_table
+        >>> table = CompactStringTable(encode_string_table(['b', 'a']), 0)
+        >>> 'a' in table, 'c' in table, list(table)
+        (True, False, ['a', 'b'])
+    """
+    # The maximum number of keys whose lookup results are remembered.
+    CACHE_SIZE = 100000
+
+    def __init__(self, buf, offset):
+        self._buf = buf
+        self._cache = {}
+        self._n, self._slots, has_values = struct.unpack_from(
+            str('<3I'), buf, offset)
+        self._offsets = offset + 12
+        self._values = self._offsets + 4 * (self._n + 1)
+        self._index = self._values + 4 * self._n * has_values
+        self._data = self._index + 4 * self._slots
+        if not has_values:
+            self._values = None
+
+    def _key(self, key):
+        return key.encode('utf-8')
+
+    def _find(self, key):
+        """Return the number of the string ``key``, or -1."""
+        cache = self._cache
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            return -1
+        if len(cache) >= self.CACHE_SIZE:
+            cache.clear()
+        i = cache[key] = self._lookup(key)
+        return i
+
+    def _lookup(self, key):
+        try:
+            key = self._key(key)
+        except (AttributeError, TypeError, UnicodeError):
+            return -1
+        buf = self._buf
+        slot = (zlib.crc32(key) & 0xFFFFFFFF) % self._slots
+        while True:
+            i, = struct.unpack_from(str('<I'), buf, self._index + 4 * slot)
+            if i == _EMPTY_SLOT:
+                return -1
+            start, end = struct.unpack_from(str('<2I'), buf,
+                                            self._offsets + 4 * i)
+            if buf[self._data + start:self._data + end] == key:
+                return i
+            slot = (slot + 1) % self._slots
+
+    def _string(self, i):
+        start, end = struct.unpack_from(str('<2I'), self._buf,
+                                        self._offsets + 4 * i)
+        return self._buf[self._data + start:self._data + end].decode('utf-8')
+
+    def __contains__(self, key):
+        try:
+            return self._cache[key] >= 0
+        except (KeyError, TypeError):
+            return self._find(key) >= 0
+
+    def __getitem__(self, key):
+        """
+        Return the value of ``key``, or 0 if it is not in the table.
+        """
+        i = self._find(key)
+        if i < 0 or self._values is None:
+            return 0
+        return struct.unpack_from(str('<I'), self._buf, self._values + 4 * i)[0]
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        return (self._string(i) for i in range(self._n))
+
+    def items(self):
+        return ((key, self[key]) for key in self)
+
+def open_buffer(stream, magic):
+    """
+    Return the contents of the binary file ``stream``, which should
+    start with the byte string ``magic``.  If it is a file on disk, then
+    it is memory-mapped; otherwise, it is read into memory.
+    """
+    try:
+        buf = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, IOError, OSError, ValueError):
+        return stream.read()
+    # A compressed stream's fileno() is that of the compressed file.
+    if buf[:len(magic)] != magic:
+        buf.close()
+        return stream.read()
+    return buf
+
+######################################################################
+# Compact Trie
+######################################################################
+
+# The compact format of a trie is a header, followed by a compact string
+# table of its symbols, and the two arrays of a double-array trie; all
+# integers are little-endian unsigned 32-bit integers.  The header holds
+# a magic string, the format version, a flag that is 1 if the trie's
+# entries are strings (rather than tuples of strings), the number of
+# entries, the number of cells in each array, the radix, and the offset
+# of the symbol table and of each array.
+#
+# Symbol number i of the symbol table has the number c = i+1, which is
+# written as two digits in the radix r (about the square root of the
+# number of symbols): c // r + 1, and then c % r + 1.  This keeps the
+# transitions of every state within r cells of each other, so that
+# states with many transitions can be packed densely.  Label 0 marks
+# the end of an entry.  The root is cell 0.  The transition from the
+# state in cell s on label d leads to cell t = base[s] + d, if check[t]
+# is s; and the state in cell s ends an entry if check[base[s]] is s.
+
+_TRIE_MAGIC = b'NLTKTRIE'
+_TRIE_VERSION = 2
+_TRIE_HEADER = struct.Struct(str('<8s8I'))
+
+_TRIE_MAX_TRIES = 50
+"""The number of bases at which the builder tries to place a state with
+   many transitions, before it places the state after all used cells."""
+
+def _uint32_array(buf, offset, n):
+    """
+    Return the array of ``n`` little-endian unsigned 32-bit integers at
+    ``offset`` in ``buf``, without copying it if possible.
+    """
+    import sys
+    data = memoryview(buf)[offset:offset + 4 * n]
+    if sys.byteorder == 'little' and hasattr(data, 'cast'):
+        return data.cast('B').cast('I')
+    from array import array
+    result = array(str('I'), data.tobytes())
+    if sys.byteorder != 'little':
+        result.byteswap()
+    return result
+
+def _encode_trie(entries):
+    """
+    Return the compact encoding of a trie of the given sequences.
+    """
+    entries = set(entry if isinstance(entry, string_types) else tuple(entry)
+                  for entry in entries)
+    strings = all(isinstance(entry, string_types) for entry in entries)
+    symbols = sorted(set(chain.from_iterable(entries)))
+    radix = int(len(symbols) ** 0.5) + 1
+    label = dict((symbol, ((i + 1) // radix + 1, (i + 1) % radix + 1))
+                 for (i, symbol) in enumerate(symbols))
+    # Entries that share a prefix are contiguous, and shorter entries
+    # come before their extensions.
+    entries = sorted(tuple(chain.from_iterable(label[symbol]
+                                               for symbol in entry))
+                     for entry in entries)
+
+    base = [0]
+    check = [_EMPTY_SLOT]
+    used = bytearray(b'\x01')
+    next_check = 0
+    # Each state is (cell, depth, first entry, end of entries).
+    queue = deque([(0, 0, 0, len(entries))])
+    while queue:
+        state, depth, lo, hi = queue.popleft()
+        if lo == hi:
+            continue
+        # Find the labels of the state's transitions, and the range of
+        # entries below each of them.
+        children = []
+        i = lo
+        if len(entries[i]) == depth:
+            children.append((0, i, i + 1))
+            i += 1
+        while i < hi:
+            c = entries[i][depth]
+            j = i + 1
+            while j < hi and entries[j][depth] == c:
+                j += 1
+            children.append((c, i, j))
+            i = j
+        # Find the first base at which all of the transitions are free.
+        # The search skips the cells before next_check, which earlier
+        # searches found to be nearly all in use, so that states are
+        # not tested against the same dense cells over and over again.
+        # A state with many transitions rarely fits among used cells,
+        # so after a few tries it is placed after them instead.
+        first = children[0][0]
+        offsets = [c - first for (c, i, j) in children[1:]]
+        start = max(first, next_check)
+        size = len(used)
+        cell = used.find(b'\x00', start)
+        tries = 0
+        scanned = start
+        while cell >= 0:
+            tries += 1
+            scanned = cell
+            for offset in offsets:
+                if cell + offset < size and used[cell + offset]:
+                    break
+            else:
+                break
+            if tries == _TRIE_MAX_TRIES and len(offsets) >= 8:
+                cell = -1
+                break
+            cell = used.find(b'\x00', cell + 1)
+        if cell < 0:
+            cell = max(size, start)
+        if 20 * tries <= scanned - start + 1:
+            # At least 95% of the cells that were passed over are used.
+            next_check = scanned
+        b = cell - first
+        last = b + children[-1][0]
+        if last >= len(used):
+            grow = last + 1 - len(used)
+            used.extend(b'\x00' * grow)
+            base.extend([0] * grow)
+            check.extend([_EMPTY_SLOT] * grow)
+        base[state] = b
+        for (c, i, j) in children:
+            used[b + c] = 1
+            check[b + c] = state
+            if c:
+                queue.append((b + c, depth + 1, i, j))
+
+    table = encode_string_table(symbols)
+    offset = _TRIE_HEADER.size
+    header = _TRIE_HEADER.pack(_TRIE_MAGIC, _TRIE_VERSION, int(strings),
+                               len(entries), len(base), radix, offset,
+                               offset + len(table),
+                               offset + len(table) + 4 * len(base))
+    return header + table + struct.pack(str('<%dI' % (2 * len(base))),
+                                        *(base + check))
+
+
+class CompactTrie(object):
+    """
+    An immutable trie of strings, or of sequences of strings (such as
+    the multi-word expressions of ``MWETokenizer``), which is stored in
+    two integer arrays (a double-array trie) and a compact table of the
+    symbols.  It takes far less memory than a ``Trie``, and it can be
+    written to a file and memory-mapped, so that loading it takes
+    constant time.
+
+        >>> from nltk.util import CompactTrie
+        >>> trie = CompactTrie([('new', 'york'), ('new', 'york', 'city'),
+        ...                     ('york',)])
+        >>> ('new', 'york') in trie, ('new',) in trie
+        (True, False)
+        >>> text = 'in new york city'.split()
+        >>> trie.longest_prefix(text, 1)
+        4
+        >>> list(trie.prefixes(text, 1))
+        [3, 4]
+        >>> trie.find_all(text)
+        [(1, 3), (1, 4), (2, 3)]
+        >>> trie.find_longest(text)
+        [(1, 4)]
+    """
+    def __init__(self, strings=None, buf=None):
+        """
+        :param strings: The strings, or sequences of strings, to store.
+        :param buf: The compact encoding of a trie, as a byte string or
+            other buffer (e.g., an ``mmap``), if ``strings`` is not given.
+        """
+        if buf is None:
+            buf = _encode_trie(strings or [])
+        if len(buf) < _TRIE_HEADER.size:
+            raise ValueError('Not a compact trie')
+        (magic, version, strings, n, cells, radix, symbols,
+         base, check) = _TRIE_HEADER.unpack_from(buf, 0)
+        if magic != _TRIE_MAGIC:
+            raise ValueError('Not a compact trie')
+        if version != _TRIE_VERSION:
+            raise ValueError('Unsupported compact trie version: %d' % version)
+        self._buf = buf
+        self._strings = bool(strings)
+        self._n = n
+        self._cells = cells
+        self._radix = radix
+        self._symbols = CompactStringTable(buf, symbols)
+        self._base = _uint32_array(buf, base, cells)
+        self._check = _uint32_array(buf, check, cells)
+
+    @classmethod
+    def open(cls, stream):
+        """
+        Return the trie that is stored in the binary file ``stream`` (as
+        written by ``dump()``).  If it is a file on disk, then it is
+        memory-mapped; otherwise, it is read into memory.
+        """
+        return cls(buf=open_buffer(stream, _TRIE_MAGIC))
+
+    def dump(self, stream):
+        """Write this trie to the binary file ``stream``."""
+        stream.write(self._buf[:])
+
+    def __reduce__(self):
+        return (self.__class__, (None, self._buf[:]))
+
+    def _labels(self, sequence):
+        """
+        Return the label of each symbol of ``sequence``, or 0 for symbols
+        that are not in this trie.
+        """
+        labels = {}
+        find = self._symbols._find
+        for symbol in set(sequence):
+            labels[symbol] = find(symbol) + 1
+        return [labels[symbol] for symbol in sequence]
+
+    def _prefixes(self, labels, start):
+        """
+        Generate the end of each entry that is a prefix of the symbols
+        with the given ``labels``, from ``start``.
+        """
+        base, check, cells = self._base, self._check, self._cells
+        radix = self._radix
+        state = 0
+        for end in range(start, len(labels)):
+            b = base[state]
+            if b < cells and check[b] == state:
+                yield end
+            c = labels[end]
+            if not c:
+                return
+            t = b + c // radix + 1
+            if t >= cells or check[t] != state:
+                return
+            state = base[t] + c % radix + 1
+            if state >= cells or check[state] != t:
+                return
+        b = base[state]
+        if b < cells and check[b] == state:
+            yield len(labels)
+
+    def __contains__(self, sequence):
+        labels = self._labels(sequence)
+        return len(labels) in self._prefixes(labels, 0)
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        """Generate the entries of this trie, in sorted order."""
+        symbols = list(self._symbols)
+        base, check = self._base, self._check
+        # Find the transitions from each state, in one pass over the cells.
+        children = defaultdict(list)
+        for t in range(self._cells):
+            if check[t] != _EMPTY_SLOT:
+                children[check[t]].append(t)
+        radix = self._radix
+        stack = [(0, ())]
+        while stack:
+            state, prefix = stack.pop()
+            b = base[state]
+            for t in reversed(children[state]):
+                if t == b:
+                    yield ''.join(prefix) if self._strings else prefix
+                    continue
+                # t is the state after the first digit of a symbol.
+                for u in reversed(children[t]):
+                    c = (t - b - 1) * radix + u - base[t] - 1
+                    stack.append((u, prefix + (symbols[c-1],)))
+
+    def prefixes(self, sequence, start=0):
+        """
+        Generate the end of each entry of this trie that is a prefix of
+        ``sequence[start:]``, shortest first.
+        """
+        base, check, cells = self._base, self._check, self._cells
+        radix = self._radix
+        find = self._symbols._find
+        state = 0
+        for end in range(start, len(sequence)):
+            b = base[state]
+            if b < cells and check[b] == state:
+                yield end
+            c = find(sequence[end]) + 1
+            if not c:
+                return
+            t = b + c // radix + 1
+            if t >= cells or check[t] != state:
+                return
+            state = base[t] + c % radix + 1
+            if state >= cells or check[state] != t:
+                return
+        b = base[state]
+        if b < cells and check[b] == state:
+            yield len(sequence)
+
+    def longest_prefix(self, sequence, start=0):
+        """
+        Return the end of the longest entry of this trie that is a
+        prefix of ``sequence[start:]``, or None if there is none.
+        """
+        longest = None
+        for longest in self.prefixes(sequence, start):
+            pass
+        return longest
+
+    def find_all(self, sequence):
+        """
+        Return the ``(start, end)`` spans of every occurrence of an
+        entry of this trie in ``sequence``, including overlapping ones.
+        """
+        labels = self._labels(sequence)
+        return [(start, end) for start in range(len(labels))
+                for end in self._prefixes(labels, start) if end > start]
+
+    def find_longest(self, sequence):
+        """
+        Return the ``(start, end)`` spans of the non-overlapping
+        occurrences of entries of this trie in ``sequence``, choosing
+        the longest entry at the leftmost position first.
+        """
+        labels = self._labels(sequence)
+        spans = []
+        start = 0
+        while start < len(labels):
+            end = None
+            for end in self._prefixes(labels, start):
+                pass
+            if end is not None and end > start:
+                spans.append((start, end))
+                start = end
+            else:
+                start += 1
+        return spans
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+#
+# Natural Language Toolkit: Import Time Benchmark
+#
+# Copyright (C) 2001-2015 NLTK Project
+# URL: <http://nltk.org/>
+# For license information, see LICENSE.TXT
+
+"""
+This command-line tool reports how long it takes to import ``nltk``
+and each of its submodules.  Every import is timed in a fresh Python
+interpreter, so the times include the cost of importing the modules
+that each submodule depends on (but not the cost of starting Python).
+
+    python tools/import_benchmark.py [-n REPEAT] [MODULE ...]
+
+With ``--exports``, it instead prints the table of lazily imported
+names that is used by ``nltk/__init__.py``, so that the table can be
+regenerated after names are added to or removed from a subpackage.
+"""
+from __future__ import print_function, division
+
+import os
+import sys
+import subprocess
+import textwrap
+from optparse import OptionParser
+
+######################################################################
+# Timing
+######################################################################
+
+TIMER = ('import time; t = time.time(); import %s; '
+         'print(time.time() - t)')
+
+def import_time(module, repeat=3, python=sys.executable):
+    """
+    Return the smallest of ``repeat`` measurements of the time taken to
+    import ``module`` in a fresh interpreter.
+    """
+    times = []
+    for i in range(repeat):
+        out = subprocess.check_output([python, '-c', TIMER % module])
+        times.append(float(out.decode('ascii').split()[-1]))
+    return min(times)
+
+def submodules():
+    """Return the names of nltk's top-level submodules."""
+    import nltk
+    root = os.path.dirname(nltk.__file__)
+    names = []
+    for name in sorted(os.listdir(root)):
+        path = os.path.join(root, name)
+        if name.endswith('.py') and name != '__init__.py':
+            names.append(name[:-3])
+        elif os.path.exists(os.path.join(path, '__init__.py')):
+            names.append(name)
+    return ['nltk.' + name for name in names]
+
+def benchmark(modules, repeat=3):
+    base = import_time('nltk', repeat)
+    print('%-32s %8.3fs' % ('nltk', base))
+    print('-' * 42)
+    for module in modules:
+        try:
+            t = import_time(module, repeat)
+        except subprocess.CalledProcessError:
+            print('%-32s %9s' % (module, 'failed'))
+        else:
+            print('%-32s %8.3fs' % (module, t))
+
+######################################################################
+# Lazy Export Table
+######################################################################
+
+def print_exports():
+    import nltk
+    from nltk.lazyimport import export_table
+    table = export_table(nltk._STAR_IMPORTS)
+    by_module = {}
+    for name, module in table.items():
+        by_module.setdefault(module, []).append(name)
+    print('_LAZY_EXPORTS = {')
+    for module in nltk._STAR_IMPORTS:
+        names = ', '.join(repr(str(name))
+                          for name in sorted(by_module.get(module, [])))
+        print("    '%s': [" % module)
+        print(textwrap.fill(names, 79, initial_indent=' '*8,
+                            subsequent_indent=' '*8))
+        print('    ],')
+    print('}')
+
+if __name__ == '__main__':
+    parser = OptionParser(usage='%prog [options] [module ...]')
+    parser.add_option('-n', '--repeat', type='int', default=3,
+                      help='number of measurements per module')
+    parser.add_option('--exports', action='store_true',
+                      help='print the lazy export table for nltk/__init__.py')
+    options, args = parser.parse_args()
+    if options.exports:
+        print_exports()
+    else:
+        benchmark(args or submodules(), options.repeat)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+#
+# Natural Language Toolkit: Punkt Model Converter
+#
+# Copyright (C) 2001-2015 NLTK Project
+# URL: <http://nltk.org/>
+# For license information, see LICENSE.TXT
+
+"""
+This command-line tool converts pickled Punkt sentence tokenizers
+(such as ``tokenizers/punkt/english.pickle``) to the compact binary
+``.punkt`` format, which ``sent_tokenize()`` loads in preference to
+the pickles.  Each converted model is written next to its pickle (or
+next to the ``PY3`` directory of pickles for Python 3), unless an
+output directory is given.
+
+    python tools/punkt_convert.py [-o DIR] MODEL.pickle ...
+
+With no arguments, every pickle in the installed ``tokenizers/punkt``
+directories is converted.
+"""
+from __future__ import print_function, division
+
+import os
+import glob
+import pickle
+from optparse import OptionParser
+
+def convert(path, outdir=None):
+    """
+    Convert the pickled Punkt tokenizer at ``path``, and return the
+    name of the ``.punkt`` file that was written.
+    """
+    with open(path, 'rb') as fp:
+        tokenizer = pickle.load(fp)
+    if outdir is None:
+        # Compact models are shared by Python 2 and 3, so the models that
+        # were pickled for Python 3 are converted to the parent directory.
+        outdir = os.path.dirname(path)
+        if os.path.basename(outdir) == 'PY3':
+            outdir = os.path.dirname(outdir)
+    base = os.path.splitext(os.path.basename(path))[0] + '.punkt'
+    outpath = os.path.join(outdir, base)
+    with open(outpath, 'wb') as out:
+        tokenizer._params.dump(out)
+    return outpath
+
+def installed_models():
+    """Return the pickled Punkt models that this version of Python reads."""
+    import nltk.data
+    from nltk.compat import PY3
+    paths = []
+    for root in nltk.data.path:
+        paths.extend(sorted(glob.glob(os.path.join(
+            root, 'tokenizers', 'punkt', 'PY3' if PY3 else '', '*.pickle'))))
+    return paths
+
+if __name__ == '__main__':
+    parser = OptionParser(usage='%prog [options] [model.pickle ...]')
+    parser.add_option('-o', '--outdir',
+                      help='directory to write the converted models to')
+    options, args = parser.parse_args()
+    for path in args or installed_models():
+        outpath = convert(path, options.outdir)
+        print('%s -> %s (%d bytes, was %d)' %
+              (path, outpath, os.path.getsize(outpath),
+               os.path.getsize(path)))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+#
+# Natural Language Toolkit: Tagging Throughput Benchmark
+#
+# Copyright (C) 2001-2015 NLTK Project
+# URL: <http://nltk.org/>
+# For license information, see LICENSE.TXT
+
+"""
+This command-line tool reports the throughput, in tokens per second,
+of several taggers when they tag a corpus with ``tag_sents()``, using
+one or more worker processes.  The taggers are trained on the first
+90% of the tagged sentences of a corpus (by default, the Penn Treebank
+sample), and tag the rest, repeated until there are ``--sents``
+sentences.
+
+    python tools/tag_benchmark.py [-c CORPUS] [-s SENTS] [-j JOBS ...]
+"""
+from __future__ import print_function, division
+
+import time
+from itertools import cycle, islice
+from optparse import OptionParser
+
+######################################################################
+# Taggers
+######################################################################
+
+def backoff_tagger(train):
+    from nltk.tag import (DefaultTagger, UnigramTagger, BigramTagger,
+                          TrigramTagger)
+    tagger = DefaultTagger('NN')
+    for cls in (UnigramTagger, BigramTagger, TrigramTagger):
+        tagger = cls(train, backoff=tagger)
+    return tagger
+
+def hmm_tagger(train):
+    from nltk.tag import HiddenMarkovModelTagger
+    return HiddenMarkovModelTagger.train(train)
+
+def perceptron_tagger(train, compiled=False):
+    from nltk.tag.perceptron import PerceptronTagger
+    tagger = PerceptronTagger(load=False, compiled=compiled)
+    tagger.train(list(train))
+    return tagger
+
+TAGGERS = [
+    ('backoff', backoff_tagger),
+    ('hmm', hmm_tagger),
+    ('perceptron', perceptron_tagger),
+    ('perceptron-compiled',
+     lambda train: perceptron_tagger(train, compiled=True)),
+]
+
+######################################################################
+# Timing
+######################################################################
+
+def throughput(tagger, sents, n_jobs, chunksize):
+    """Return the number of tokens per second that ``tagger`` tags."""
+    start = time.time()
+    tagged = tagger.tag_sents(iter(sents), n_jobs=n_jobs,
+                              chunksize=chunksize)
+    elapsed = time.time() - start
+    return sum(len(sent) for sent in tagged) / elapsed
+
+def benchmark(corpus, n_sents, jobs, chunksize, names):
+    import nltk.corpus
+    tagged_sents = list(getattr(nltk.corpus, corpus).tagged_sents())
+    split = len(tagged_sents) * 9 // 10
+    train = tagged_sents[:split]
+    test = [[word for (word, tag) in sent] for sent in tagged_sents[split:]]
+    test = list(islice(cycle(test), n_sents))
+    print('%d training sentences, %d test sentences (%d tokens)' %
+          (len(train), len(test), sum(len(sent) for sent in test)))
+    print()
+    print('%-20s' % 'tagger' +
+          ''.join('%12s' % ('%d job%s' % (j, 's'[j==1:])) for j in jobs))
+    print('-' * (20 + 12 * len(jobs)))
+    for name, train_tagger in TAGGERS:
+        if names and name not in names:
+            continue
+        tagger = train_tagger(train)
+        print('%-20s' % name + ''.join(
+            '%12.0f' % throughput(tagger, test, n_jobs, chunksize)
+            for n_jobs in jobs))
+
+if __name__ == '__main__':
+    parser = OptionParser(usage='%prog [options] [tagger ...]')
+    parser.add_option('-c', '--corpus', default='treebank',
+                      help='tagged corpus to train and test on')
+    parser.add_option('-s', '--sents', type='int', default=20000,
+                      help='number of sentences to tag')
+    parser.add_option('-j', '--jobs', default='1,2,4',
+                      help='comma-separated numbers of worker processes')
+    parser.add_option('-k', '--chunksize', type='int', default=100,
+                      help='sentences per task sent to a worker')
+    options, args = parser.parse_args()
+    benchmark(options.corpus, options.sents,
+              [int(j) for j in options.jobs.split(',')],
+              options.chunksize, args)
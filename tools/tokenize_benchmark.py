@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+#
+# Natural Language Toolkit: Tokenizer Throughput Benchmark
+#
+# Copyright (C) 2001-2015 NLTK Project
+# URL: <http://nltk.org/>
+# For license information, see LICENSE.TXT
+
+"""
+This command-line tool compares the throughput, in characters per
+second, of the fast paths of several tokenizers with the code paths
+that they replace, and checks that both give the same output.  The
+text is the raw text of a plaintext corpus (by default, the Project
+Gutenberg selections) or of a file, repeated until it has at least
+``--chars`` characters.  The tweet benchmarks tokenize each line as a
+tweet; ``--tweets`` generates a file of random tweets to use for them.
+
+    python tools/tokenize_benchmark.py [-c CORPUS | -f FILE] [-n CHARS]
+                                       [benchmark ...]
+    python tools/tokenize_benchmark.py --tweets N FILE
+"""
+from __future__ import print_function, division
+
+import io
+import time
+from optparse import OptionParser
+
+######################################################################
+# Benchmarks
+######################################################################
+
+# Each benchmark takes the text, and returns a pair of functions of the
+# text: the current code path and the one that it replaces.
+
+def punkt_spans(text):
+    from nltk.tokenize.punkt import PunktTrainer, PunktSentenceTokenizer
+    params = PunktTrainer(text[:1000000]).get_params()
+    tokenizer = PunktSentenceTokenizer(params)
+    def slices_from_text(text):
+        slices = tokenizer._realign_boundaries(
+            text, tokenizer._slices_from_text(text))
+        return [(sl.start, sl.stop) for sl in slices]
+    return tokenizer.span_tokenize, slices_from_text
+
+def treebank_words(text):
+    from nltk.tokenize import TreebankWordTokenizer
+    tokenizer = TreebankWordTokenizer()
+    def tokenize(text):
+        return [tokenizer.tokenize(line) for line in text.split('\n')]
+    def rewrite(text):
+        return [tokenizer._rewrite(line).split() for line in text.split('\n')]
+    return tokenize, rewrite
+
+def tweet_tokens(text, **options):
+    from nltk.tokenize import TweetTokenizer
+    tokenizer = TweetTokenizer(**options)
+    def tokenize_many(text):
+        return list(tokenizer.tokenize_many(text.split('\n')))
+    def tokenize(text):
+        return [tokenizer.tokenize(line) for line in text.split('\n')]
+    return tokenize_many, tokenize
+
+def tweet_normalized(text):
+    return tweet_tokens(text, preserve_case=False, reduce_len=True,
+                        strip_handles=True)
+
+BENCHMARKS = [
+    ('punkt-spans', punkt_spans),
+    ('treebank-words', treebank_words),
+    ('tweet-tokens', tweet_tokens),
+    ('tweet-normalized', tweet_normalized),
+]
+
+######################################################################
+# Random Tweets
+######################################################################
+
+def random_tweets(n_tweets, seed=0):
+    """
+    Generate ``n_tweets`` random tweets, which contain handles,
+    hashtags, URLs, emoticons, HTML entities and lengthened words.
+    """
+    import random
+    rng = random.Random(seed)
+    words = ['the', 'I', 'love', 'this', 'so', 'Much', 'today', 'LOL',
+             'omg', 'New', 'York', 'game', "can't", 'wait', 'for', 'it',
+             'happy', 'birthday', 'to', 'you', 'NLTK', 'is', 'great']
+    extras = ['@nltk_org', '@Bob', '#python', '#NLP', ':-)', ':D', ';P',
+              '<3', ':(', 'http://t.co/abc123', 'sooooo', 'YAAAAAY',
+              '&amp;', '&lt;3', '&quot;yes&quot;', '&#8230;', '!!!!!!',
+              '...', '12:30', '$5.99', 'wow!!', '-_-', 'x@y.com']
+    for i in range(n_tweets):
+        tweet = [rng.choice(words) for j in range(rng.randint(3, 15))]
+        for j in range(rng.randint(0, 4)):
+            tweet.insert(rng.randint(0, len(tweet)), rng.choice(extras))
+        yield ' '.join(tweet)
+
+######################################################################
+# Timing
+######################################################################
+
+def throughput(func, text):
+    """
+    Return the number of characters per second that ``func``
+    processes, and its output.
+    """
+    start = time.time()
+    output = func(text)
+    return len(text) / (time.time() - start), output
+
+def benchmark(text, names):
+    print('%d characters' % len(text))
+    print()
+    print('%-20s%12s%12s%10s%8s' % ('benchmark', 'fast', 'old',
+                                    'speedup', 'same'))
+    print('-' * 62)
+    for name, setup in BENCHMARKS:
+        if names and name not in names:
+            continue
+        fast, old = setup(text)
+        fast_rate, fast_output = throughput(fast, text)
+        old_rate, old_output = throughput(old, text)
+        print('%-20s%12.0f%12.0f%9.1fx%8s' %
+              (name, fast_rate, old_rate, fast_rate / old_rate,
+               fast_output == old_output))
+
+if __name__ == '__main__':
+    parser = OptionParser(usage='%prog [options] [benchmark ...]')
+    parser.add_option('--tweets', type='int',
+                      help='write this many random tweets to the file '
+                      'given as the argument, and exit')
+    parser.add_option('-c', '--corpus', default='gutenberg',
+                      help='plaintext corpus to tokenize')
+    parser.add_option('-f', '--file',
+                      help='UTF-8 text file to tokenize instead of a corpus')
+    parser.add_option('-n', '--chars', type='int', default=5000000,
+                      help='minimum number of characters to tokenize')
+    options, args = parser.parse_args()
+    if options.tweets:
+        with io.open(args[0], 'w', encoding='utf8') as out:
+            for tweet in random_tweets(options.tweets):
+                out.write(tweet + '\n')
+        raise SystemExit
+    if options.file:
+        with io.open(options.file, encoding='utf8') as fp:
+            text = fp.read()
+    else:
+        import nltk.corpus
+        text = getattr(nltk.corpus, options.corpus).raw()
+    text = '\n\n'.join([text] * (1 + options.chars // max(len(text), 1)))
+    benchmark(text, args)